@@ -0,0 +1,204 @@
+"""
+End-to-end benchmark for the experiment runner.
+
+Runs synthetic sync, async and async-generator agents, each calling a chain of
+``--spans`` nested ``@fluxloop.trace`` spans, through ``ExperimentRunner`` with
+the collector disabled, and reports per style:
+
+- ``single_turn``: wall time per run and FluxLoop's own overhead per run (every
+  runner phase except the agent call, see ``fluxloop_cli.phase_timer``)
+- ``multi_turn``: the same for ``--turns`` turn conversations driven by the
+  ``mock`` supervisor, plus the loop cost per turn
+
+Compare two reports with ``sdk/benchmarks/compare.py``.
+
+Usage:
+    python benchmarks/runner.py [--runs 50] [--spans 5] [--turns 4] [--output report.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fluxloop import reset_config
+from fluxloop.buffer import EventBuffer
+from fluxloop.schemas import (
+    ExperimentConfig,
+    MultiTurnConfig,
+    MultiTurnSupervisorConfig,
+    RunnerConfig,
+)
+
+from fluxloop_cli.runner import ExperimentRunner
+
+AGENT_MODULE = '''
+import fluxloop
+
+SPANS = {spans}
+
+
+def _chain(depth):
+    def leaf(text):
+        return text
+
+    func = leaf
+    for level in range(depth):
+        def step(text, _inner=func):
+            return _inner(text)
+        func = fluxloop.trace(name=f"span_{{level}}")(step)
+    return func
+
+
+def _async_chain(depth):
+    async def leaf(text):
+        return text
+
+    func = leaf
+    for level in range(depth):
+        async def step(text, _inner=func):
+            return await _inner(text)
+        func = fluxloop.trace(name=f"span_{{level}}")(step)
+    return func
+
+
+_sync = _chain(SPANS)
+_async = _async_chain(SPANS)
+
+
+def run_sync(input, **kwargs):
+    return "Echo: " + _sync(input)
+
+
+async def run_async(input, **kwargs):
+    return "Echo: " + await _async(input)
+
+
+async def run_async_gen(input, **kwargs):
+    for chunk in ("Echo: ", input):
+        yield await _async(chunk)
+'''
+
+STYLES = {"sync": "run_sync", "async": "run_async", "async_gen": "run_async_gen"}
+
+
+def _config(
+    workdir: Path, function_name: str, runs: int, turns: Optional[int]
+) -> ExperimentConfig:
+    multi_turn = MultiTurnConfig()
+    if turns:
+        multi_turn = MultiTurnConfig(
+            enabled=True,
+            max_turns=turns,
+            supervisor=MultiTurnSupervisorConfig(
+                provider="mock",
+                metadata={
+                    "scripted_questions": [f"Follow up {index}" for index in range(turns - 1)]
+                },
+            ),
+        )
+    config = ExperimentConfig(
+        name="runner-benchmark",
+        iterations=runs,
+        base_inputs=[],
+        inputs_file="inputs.yaml",
+        runner=RunnerConfig(
+            module_path="bench_agents",
+            function_name=function_name,
+            python_path=[str(workdir)],
+        ),
+        multi_turn=multi_turn,
+        output_directory=str(workdir / "experiments"),
+    )
+    config.set_source_dir(workdir)
+    return config
+
+
+def _run(workdir: Path, function_name: str, runs: int, turns: Optional[int]) -> Dict[str, Any]:
+    runner = ExperimentRunner(_config(workdir, function_name, runs, turns), no_collector=True)
+    started = time.perf_counter()
+    # The runner reports saved artifacts on stdout; keep stdout for the JSON report.
+    with contextlib.redirect_stdout(sys.stderr):
+        summary = asyncio.run(runner.run_experiment())
+    wall_ms = (time.perf_counter() - started) * 1000
+    total = max(1, summary["total_runs"])
+    overhead = summary["runner_profile"]["overhead_ms"]
+    result = {
+        "runs": summary["total_runs"],
+        "failed": summary["failed"],
+        "wall_ms_per_run": round(wall_ms / total, 3),
+        "p95_run_ms": round(summary["p95_duration_ms"] or 0.0, 3),
+        "overhead_ms_per_run": round(overhead / total, 3),
+        "phases_ms": summary["runner_profile"]["phases_ms"],
+    }
+    if turns:
+        calls = summary["runner_profile"]["calls"].get("agent", 0)
+        result["turns"] = calls
+        result["loop_ms_per_turn"] = round(overhead / max(1, calls), 3)
+    return result
+
+
+def git_commit(cwd: Optional[Path] = None) -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=cwd or Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--spans", type=int, default=5)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {"single_turn": {}, "multi_turn": {}}
+    with tempfile.TemporaryDirectory(prefix="fluxloop-bench-") as tmp:
+        workdir = Path(tmp)
+        (workdir / "bench_agents.py").write_text(
+            AGENT_MODULE.format(spans=args.spans), encoding="utf-8"
+        )
+        (workdir / "inputs.yaml").write_text('inputs:\n  - input: "Hello"\n', encoding="utf-8")
+        try:
+            for style, function_name in STYLES.items():
+                results["single_turn"][style] = _run(workdir, function_name, args.runs, None)
+                results["multi_turn"][style] = _run(
+                    workdir, function_name, args.runs, max(2, args.turns)
+                )
+        finally:
+            # Drain the buffer before the offline store directory is removed.
+            EventBuffer.get_instance().shutdown()
+            reset_config()
+
+    report = {
+        "benchmark": "cli_runner",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "params": {"runs": args.runs, "spans": args.spans, "turns": args.turns},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
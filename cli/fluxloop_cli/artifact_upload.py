@@ -0,0 +1,454 @@
+"""
+Concurrent artifact upload for `fluxloop sync upload`.
+
+Artifacts are presigned in batches through the sync API and then streamed from
+disk to their presigned URLs by a bounded pool of workers sharing one
+keep-alive HTTP client. Batches are presigned lazily, as the workers catch up,
+and a URL rejected as expired is presigned again before the upload is retried.
+An optional per-experiment manifest records the content hash and storage URL of
+every uploaded artifact so unchanged files are skipped and interrupted uploads
+resume where they stopped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    FIRST_EXCEPTION,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+
+import httpx
+
+from .compression import (
+    COMPRESSIBLE_CONTENT_TYPES,
+    MIN_COMPRESS_BYTES,
+    EncodingNegotiator,
+    choose_encoding,
+    compress_file,
+    parse_accept_encoding,
+)
+
+MANIFEST_VERSION = 1
+DEFAULT_UPLOAD_CONCURRENCY = 8
+DEFAULT_PRESIGN_BATCH_SIZE = 50
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+PRESIGN_ENDPOINT = "/api/storage/presign"
+PRESIGN_BATCH_ENDPOINT = "/api/storage/presign/batch"
+
+# Status codes indicating the server has no batch presign endpoint.
+BATCH_UNSUPPORTED_STATUSES = (404, 405, 501)
+
+# Storage status for an expired (or otherwise rejected) presigned URL.
+PRESIGN_EXPIRED_STATUSES = (403,)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ArtifactUpload:
+    """A local file to upload as an artifact of a run."""
+
+    run_id: str
+    artifact_type: str
+    path: Path
+    content_type: str = "application/octet-stream"
+
+    def presign_request(self, project_id: Optional[str]) -> Dict[str, Any]:
+        return {
+            "project_id": project_id,
+            "run_id": self.run_id,
+            "artifact_type": self.artifact_type,
+            "filename": self.path.name,
+            "content_type": self.content_type,
+        }
+
+    @property
+    def manifest_key(self) -> str:
+        return f"{self.run_id}:{self.artifact_type}:{self.path.name}"
+
+
+def iter_file_chunks(
+    path: Path,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    digest: Optional["hashlib._Hash"] = None,
+) -> Iterator[bytes]:
+    """Yield a file's bytes in fixed-size chunks, optionally feeding ``digest``."""
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            if digest is not None:
+                digest.update(chunk)
+            yield chunk
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    for _ in iter_file_chunks(path, digest=digest):
+        pass
+    return digest.hexdigest()
+
+
+class UploadManifest:
+    """Append-only record of artifacts uploaded for one experiment.
+
+    Each line is a JSON entry keyed by run, artifact type and file name; the last
+    entry for a key wins. Entries are appended as soon as an artifact finishes,
+    so an interrupted upload keeps everything that already succeeded.
+    """
+
+    def __init__(self, path: Path, *, project_id: Optional[str] = None) -> None:
+        self.path = path
+        self.project_id = project_id
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn write from an interrupted run
+                if not isinstance(entry, dict) or entry.get("version") != MANIFEST_VERSION:
+                    continue
+                if entry.get("project_id") != self.project_id:
+                    continue
+                key = entry.get("key")
+                if key and entry.get("storage_url") and entry.get("sha256"):
+                    self._entries[key] = entry
+
+    def lookup(self, artifact: ArtifactUpload) -> Optional[str]:
+        """Return the stored URL if ``artifact`` is unchanged since its last upload."""
+        entry = self._entries.get(artifact.manifest_key)
+        if entry is None:
+            return None
+        stat = artifact.path.stat()
+        if entry.get("size") != stat.st_size:
+            return None
+        storage_url: str = entry["storage_url"]
+        if entry.get("mtime_ns") == stat.st_mtime_ns:
+            return storage_url
+        # Touched but possibly identical: compare content before re-uploading.
+        sha256 = file_sha256(artifact.path)
+        if sha256 != entry["sha256"]:
+            return None
+        self.record(artifact, sha256, storage_url)
+        return storage_url
+
+    def record(self, artifact: ArtifactUpload, sha256: str, storage_url: str) -> None:
+        stat = artifact.path.stat()
+        entry: Dict[str, Any] = {
+            "version": MANIFEST_VERSION,
+            "key": artifact.manifest_key,
+            "project_id": self.project_id,
+            "sha256": sha256,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "storage_url": storage_url,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._entries[entry["key"]] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+
+
+def _artifact_payload(artifact: ArtifactUpload, storage_url: str) -> Dict[str, Any]:
+    return {
+        "run_id": artifact.run_id,
+        "type": artifact.artifact_type,
+        "storage_url": storage_url,
+    }
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+class _BatchPresignUnsupported(Exception):
+    """Raised when the server has no batch presign endpoint."""
+
+
+class ArtifactUploader:
+    """Presign and upload artifacts with a bounded number of requests in flight."""
+
+    def __init__(
+        self,
+        *,
+        api_url: str,
+        api_key: str,
+        project_id: Optional[str],
+        concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+        presign_batch_size: int = DEFAULT_PRESIGN_BATCH_SIZE,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        timeout_seconds: float = 60.0,
+        upload_timeout_seconds: float = 120.0,
+        manifest: Optional[UploadManifest] = None,
+        negotiator: Optional[EncodingNegotiator] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+    ) -> None:
+        self.api_url = api_url.rstrip("/")
+        self.api_key = api_key
+        self.project_id = project_id
+        self.concurrency = max(1, concurrency)
+        self.presign_batch_size = max(1, presign_batch_size)
+        self.max_retries = max(0, max_retries)
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self.upload_timeout_seconds = upload_timeout_seconds
+        self.manifest = manifest
+        self.negotiator = negotiator or EncodingNegotiator("none")
+        self._transport = transport
+        self._batch_presign = self.presign_batch_size > 1
+        self.uploaded = 0
+        self.skipped = 0
+
+    def upload_all(self, artifacts: List[ArtifactUpload]) -> List[Dict[str, Any]]:
+        """Upload existing files and return artifact payloads in input order.
+
+        Missing files are skipped. The first failure cancels outstanding work and
+        is re-raised.
+        """
+        pending = [artifact for artifact in artifacts if artifact.path.exists()]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pending)
+
+        to_upload: List[Tuple[int, ArtifactUpload]] = []
+        for index, artifact in enumerate(pending):
+            storage_url = self.manifest.lookup(artifact) if self.manifest else None
+            if storage_url:
+                results[index] = _artifact_payload(artifact, storage_url)
+                self.skipped += 1
+            else:
+                to_upload.append((index, artifact))
+        if not to_upload:
+            return [result for result in results if result is not None]
+
+        limits = httpx.Limits(
+            max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+        )
+        with httpx.Client(
+            timeout=self.timeout_seconds, limits=limits, transport=self._transport
+        ) as client, ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures: List["Future[None]"] = []
+            in_flight: Set["Future[None]"] = set()
+            for start in range(0, len(to_upload), self.presign_batch_size):
+                # Presign the next batch only once the queued uploads are about to
+                # start, so presigned URLs do not expire while waiting for a worker.
+                while len(in_flight) > self.concurrency:
+                    in_flight = wait(in_flight, return_when=FIRST_COMPLETED).not_done
+                if any(f.done() and f.exception() is not None for f in futures):
+                    break
+                batch = to_upload[start : start + self.presign_batch_size]
+                presigned = self._presign(client, [artifact for _, artifact in batch])
+                for (index, artifact), presign in zip(batch, presigned):
+                    future = executor.submit(
+                        self._upload_one, client, index, artifact, presign, results
+                    )
+                    futures.append(future)
+                    in_flight.add(future)
+
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+            self.uploaded += sum(
+                1 for future in done if not future.cancelled() and future.exception() is None
+            )
+            for future in futures:
+                if future in done and future.exception() is not None:
+                    raise future.exception()  # type: ignore[misc]
+
+        return [result for result in results if result is not None]
+
+    # ------------------------------------------------------------------
+    # Presign
+    # ------------------------------------------------------------------
+
+    def _presign(
+        self, client: httpx.Client, batch: List[ArtifactUpload]
+    ) -> List[Dict[str, Any]]:
+        if self._batch_presign and len(batch) > 1:
+            try:
+                return self._presign_batch(client, batch)
+            except _BatchPresignUnsupported:
+                self._batch_presign = False
+        return [self._presign_one(client, artifact) for artifact in batch]
+
+    def _presign_batch(
+        self, client: httpx.Client, batch: List[ArtifactUpload]
+    ) -> List[Dict[str, Any]]:
+        def _request() -> httpx.Response:
+            resp = client.post(
+                f"{self.api_url}{PRESIGN_BATCH_ENDPOINT}",
+                json={"items": [artifact.presign_request(self.project_id) for artifact in batch]},
+                headers=self._auth_headers(),
+            )
+            if resp.status_code in BATCH_UNSUPPORTED_STATUSES:
+                raise _BatchPresignUnsupported(PRESIGN_BATCH_ENDPOINT)
+            resp.raise_for_status()
+            self.negotiator.observe(resp)
+            return resp
+
+        items = self._with_retry(_request).json().get("items") or []
+        if len(items) != len(batch):
+            raise ValueError(
+                f"Batch presign returned {len(items)} items for {len(batch)} artifacts"
+            )
+        return items
+
+    def _presign_one(self, client: httpx.Client, artifact: ArtifactUpload) -> Dict[str, Any]:
+        def _request() -> httpx.Response:
+            resp = client.post(
+                f"{self.api_url}{PRESIGN_ENDPOINT}",
+                json=artifact.presign_request(self.project_id),
+                headers=self._auth_headers(),
+            )
+            resp.raise_for_status()
+            self.negotiator.observe(resp)
+            return resp
+
+        presign: Dict[str, Any] = self._with_retry(_request).json()
+        return presign
+
+    # ------------------------------------------------------------------
+    # Upload
+    # ------------------------------------------------------------------
+
+    def _upload_one(
+        self,
+        client: httpx.Client,
+        index: int,
+        artifact: ArtifactUpload,
+        presign: Dict[str, Any],
+        results: List[Optional[Dict[str, Any]]],
+    ) -> None:
+        try:
+            sha256 = self._put(client, artifact, presign)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code not in PRESIGN_EXPIRED_STATUSES:
+                raise
+            # The URL may have expired before this upload started: presign again once.
+            presign = self._presign_one(client, artifact)
+            sha256 = self._put(client, artifact, presign)
+        self._finish(index, artifact, presign, results, sha256)
+
+    def _put(
+        self, client: httpx.Client, artifact: ArtifactUpload, presign: Dict[str, Any]
+    ) -> str:
+        """Upload ``artifact`` to its presigned URL and return its SHA-256."""
+        # Presigned storage URLs reject chunked bodies, so send an explicit length.
+        headers = dict(presign.get("headers") or {})
+        encoding = self._storage_encoding(artifact, presign)
+        if encoding is not None:
+            return self._upload_compressed(client, artifact, presign, headers, encoding)
+
+        headers["Content-Length"] = str(artifact.path.stat().st_size)
+        digest = hashlib.sha256()
+
+        def _request() -> httpx.Response:
+            nonlocal digest
+            # Hash while streaming so each artifact is read from disk only once.
+            digest = hashlib.sha256()
+            resp = client.put(
+                presign["upload_url"],
+                content=iter_file_chunks(artifact.path, digest=digest),
+                headers=headers,
+                timeout=self.upload_timeout_seconds,
+            )
+            resp.raise_for_status()
+            return resp
+
+        self._with_retry(_request)
+        return digest.hexdigest()
+
+    def _upload_compressed(
+        self,
+        client: httpx.Client,
+        artifact: ArtifactUpload,
+        presign: Dict[str, Any],
+        headers: Dict[str, str],
+        encoding: str,
+    ) -> str:
+        digest = hashlib.sha256()
+        with compress_file(artifact.path, encoding, digest=digest) as staged:
+            staged.seek(0, 2)
+            headers["Content-Length"] = str(staged.tell())
+            headers["Content-Encoding"] = encoding
+
+            def _request() -> httpx.Response:
+                staged.seek(0)
+                resp = client.put(
+                    presign["upload_url"],
+                    content=iter(lambda: staged.read(UPLOAD_CHUNK_SIZE), b""),
+                    headers=headers,
+                    timeout=self.upload_timeout_seconds,
+                )
+                resp.raise_for_status()
+                return resp
+
+            self._with_retry(_request)
+        return digest.hexdigest()
+
+    def _storage_encoding(
+        self, artifact: ArtifactUpload, presign: Dict[str, Any]
+    ) -> Optional[str]:
+        """Compress only text artifacts whose presigned target accepts an encoding."""
+        if artifact.content_type not in COMPRESSIBLE_CONTENT_TYPES:
+            return None
+        if artifact.path.stat().st_size < MIN_COMPRESS_BYTES:
+            return None
+        advertised = parse_accept_encoding(presign.get("accept_encoding"))
+        return choose_encoding(self.negotiator.mode, advertised)
+
+    def _finish(
+        self,
+        index: int,
+        artifact: ArtifactUpload,
+        presign: Dict[str, Any],
+        results: List[Optional[Dict[str, Any]]],
+        sha256: str,
+    ) -> None:
+        storage_url = presign["storage_url"]
+        if self.manifest is not None:
+            self.manifest.record(artifact, sha256, storage_url)
+        results[index] = _artifact_payload(artifact, storage_url)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _auth_headers(self) -> Dict[str, str]:
+        # Never attached to the shared client: presigned storage URLs must not
+        # receive the API key.
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def _with_retry(self, request: Callable[[], T]) -> T:
+        attempt = 0
+        while True:
+            try:
+                return request()
+            except Exception as exc:
+                if not _is_retryable(exc) or attempt >= self.max_retries:
+                    raise
+            attempt += 1
+            time.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
@@ -1,24 +1,11 @@
-"""CLI commands."""
+"""CLI commands.
 
-from . import (
-    apikeys,
-    auth,
-    bundles,
-    config,
-    context,
-    criteria,
-    generate,
-    init,
-    inputs,
-    local_context,
-    personas,
-    projects,
-    run,
-    scenarios,
-    status,
-    sync,
-    test,
-)
+Command modules are imported on attribute access so that importing one command
+does not load every other command's dependencies.
+"""
+
+import importlib
+from typing import Any
 
 __all__ = [
     "apikeys",
@@ -39,3 +26,9 @@ __all__ = [
     "sync",
     "test",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,7 +10,7 @@ from rich.console import Console
 from dotenv import dotenv_values
 
 from ..config_loader import load_experiment_config
-from ..input_generator import GenerationSettings, generate_inputs
+from ..input_generator import GenerationSettings, generate_inputs, progress_path_for
 from ..llm_generator import DEFAULT_STRATEGIES
 from ..validators import parse_variation_strategies
 from ..constants import DEFAULT_CONFIG_PATH, DEFAULT_ROOT_DIR_NAME
@@ -65,6 +65,11 @@ def inputs(
         "--overwrite",
         help="Allow overwriting an existing output file",
     ),
+    resume: bool = typer.Option(
+        True,
+        "--resume/--no-resume",
+        help="Reuse inputs saved by an interrupted run instead of regenerating them",
+    ),
     mode: Optional[InputGenerationMode] = typer.Option(
         None,
         "--mode",
@@ -189,12 +194,19 @@ def inputs(
             "[yellow]Warning:[/yellow] LLM mode requested but no API key provided."
         )
 
+    # Inputs are appended here as they complete so an interrupted run can resume.
+    progress_path = progress_path_for(resolved_output)
+    if resume and progress_path.exists() and not dry_run:
+        console.print(f"♻️  Resuming from partial progress: [cyan]{progress_path}[/cyan]")
+
     settings = GenerationSettings(
         limit=limit,
         dry_run=dry_run,
         mode=mode,
         strategies=strategies,
         llm_api_key_override=llm_api_key,
+        progress_path=progress_path,
+        resume=resume,
     )
 
     try:
@@ -207,18 +219,19 @@ def inputs(
 
     if dry_run:
         console.print("\n[yellow]Dry run mode - no file written[/yellow]")
-        console.print(f"Planned inputs: {len(result.entries)}")
+        console.print(f"Planned inputs: {result.total_entries}")
         return
 
     resolved_output.parent.mkdir(parents=True, exist_ok=True)
-    resolved_output.write_text(result.to_yaml(), encoding="utf-8")
+    result.write_yaml(resolved_output)
+    progress_path.unlink(missing_ok=True)
 
     strategies_used = result.metadata.get("strategies") or [s.value for s in DEFAULT_STRATEGIES]
 
     console.print(
         "\n[bold green]Generation complete![/bold green]"
         f"\n📝 Inputs written to: [cyan]{resolved_output}[/cyan]"
-        f"\n✨ Total inputs: [green]{len(result.entries)}[/green]"
+        f"\n✨ Total inputs: [green]{result.total_entries}[/green]"
         f"\n🧠 Mode: [magenta]{result.metadata.get('generation_mode', 'deterministic')}[/magenta]"
         f"\n🎯 Strategies: [cyan]{', '.join(strategy for strategy in strategies_used)}[/cyan]"
     )
@@ -20,8 +20,6 @@ from ..context_manager import (
     get_context_file_path,
     load_project_connection,
 )
-from ..http_client import create_authenticated_client
-from ..api_utils import handle_api_error, resolve_api_url
 
 app = typer.Typer(help="Manage local working context (scenario selection)")
 console = Console()
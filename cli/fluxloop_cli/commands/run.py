@@ -13,6 +13,8 @@ from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
 from rich.table import Table
 
+from ..phase_timer import print_phase_report
+from ..profiling import PROFILE_MODES
 from ..runner import ExperimentRunner
 from ..config_loader import load_experiment_config
 from ..constants import DEFAULT_CONFIG_PATH, DEFAULT_ROOT_DIR_NAME
@@ -123,6 +125,22 @@ def experiment(
         "-y",
         help="Skip confirmation prompt and run immediately",
     ),
+    profile_runner: bool = typer.Option(
+        False,
+        "--profile-runner",
+        help="Print time spent in each runner phase (agent vs FluxLoop overhead)",
+    ),
+    profile: Optional[str] = typer.Option(
+        None,
+        "--profile",
+        help="Profile agent runs: cprofile (.pstats) or sampling (collapsed stacks)",
+    ),
+    profile_every: int = typer.Option(
+        1,
+        "--profile-every",
+        min=1,
+        help="Profile only every Nth run",
+    ),
 ):
     """
     Run an experiment based on configuration file.
@@ -199,15 +217,24 @@ def experiment(
         if supervisor_api_key:
             mt.supervisor.api_key = supervisor_api_key
     
+    if profile and profile not in PROFILE_MODES:
+        raise typer.BadParameter(
+            f"Unknown profile mode '{profile}'. Choose one of: {', '.join(PROFILE_MODES)}"
+        )
+
     # Load inputs to ensure accurate counts before showing the summary
     try:
-        runner = ExperimentRunner(config, no_collector=no_collector)
-        loaded_inputs = asyncio.run(runner._load_inputs())  # type: ignore[attr-defined]
+        runner = ExperimentRunner(
+            config,
+            no_collector=no_collector,
+            profile=profile,
+            profile_every=profile_every,
+        )
+        asyncio.run(runner._open_inputs())
     except Exception as e:
         console.print(f"[red]Error preparing inputs:[/red] {e}")
         raise typer.Exit(1)
 
-    config.set_resolved_input_count(len(loaded_inputs))
     total_runs = config.estimate_total_runs()
     
     summary = Table(title="Experiment Summary", show_header=False)
@@ -397,6 +424,17 @@ def experiment(
         )
 
     _display_results(results)
+    profile_info = results.get("profile") or {}
+    if profile_info.get("path"):
+        console.print(
+            f"🔥 Profile ({profile_info['mode']}, {profile_info['runs_profiled']} runs): "
+            f"[cyan]{Path(results['output_dir']) / profile_info['path']}[/cyan]"
+        )
+    if profile_runner and results.get("runner_profile"):
+        console.print()
+        print_phase_report(
+            results["runner_profile"], results.get("duration_seconds"), console
+        )
 
 
 @app.command()
@@ -485,6 +523,9 @@ def _display_results(results: dict):
     
     avg_duration = results.get("avg_duration_ms", 0)
     table.add_row("Avg Duration", f"{avg_duration:.0f}ms")
+    p95_duration = results.get("p95_duration_ms")
+    if p95_duration is not None:
+        table.add_row("P95 Duration", f"{p95_duration:.0f}ms")
     
     console.print(table)
     
@@ -7,8 +7,10 @@ from __future__ import annotations
 import json
 import os
 import time
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 from uuid import UUID, uuid4
 
 import httpx
@@ -16,17 +18,32 @@ import typer
 import yaml
 from rich.console import Console
 
+from ..artifact_upload import (
+    DEFAULT_UPLOAD_CONCURRENCY,
+    ArtifactUpload,
+    ArtifactUploader,
+    UploadManifest,
+)
+from ..compression import EncodingNegotiator
 from ..config_loader import load_experiment_config
 from ..constants import DEFAULT_CONFIG_PATH, FLUXLOOP_DIR_NAME, SCENARIOS_DIR_NAME
 from ..context_manager import get_current_web_project_id, get_current_scenario
 from ..environment import load_env_chain
+from ..input_loader import InputSource, resolve_cache_dir
 from ..project_paths import resolve_config_path
-from ..turns import load_turns, summarize_turns, utc_now_iso
+from ..turn_streamer import DEFAULT_TURNS_ENDPOINT, build_turn_payload, turn_idempotency_key
+from ..payload_chunks import iter_chunks, with_last_flag
+from ..run_precreator import DEFAULT_PRECREATE_CHUNK_SIZE, RunPrecreator
+from ..turns import iter_turn_records, summarize_turns
 
 
 app = typer.Typer(help="Sync bundle inputs and upload run results.")
 console = Console()
 
+# Upper bounds for one /api/sync/upload request; larger uploads are chunked.
+UPLOAD_CHUNK_MAX_BYTES = 4 * 1024 * 1024
+UPLOAD_CHUNK_MAX_ITEMS = 1000
+
 
 def _get_effective_scenario(scenario: Optional[str]) -> Optional[str]:
     """Get scenario from argument or current context.
@@ -131,16 +148,32 @@ def _post_with_retry(
     max_retries: int = 3,
     backoff_seconds: float = 1.0,
     timeout_seconds: float = 10.0,
+    negotiator: Optional[EncodingNegotiator] = None,
 ) -> httpx.Response:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if negotiator else b""
     attempt = 0
     while True:
         try:
-            resp = client.post(
-                endpoint,
-                json=payload,
-                headers=headers,
-                timeout=timeout_seconds,
-            )
+            if negotiator is None:
+                resp = client.post(
+                    endpoint,
+                    json=payload,
+                    headers=headers,
+                    timeout=timeout_seconds,
+                )
+            else:
+                content, body_headers = negotiator.encode_json(body)
+                resp = client.post(
+                    endpoint,
+                    content=content,
+                    headers={**headers, **body_headers},
+                    timeout=timeout_seconds,
+                )
+                if resp.status_code == 415 and "Content-Encoding" in body_headers:
+                    # Server refused the encoded body: resend uncompressed.
+                    negotiator.reject()
+                    continue
+                negotiator.observe(resp)
             resp.raise_for_status()
             return resp
         except Exception:
@@ -150,7 +183,7 @@ def _post_with_retry(
             time.sleep(backoff_seconds * (2 ** (attempt - 1)))
 
 
-def precreate_runs(
+def start_precreate_runs(
     *,
     runs: List[Dict[str, Any]],
     experiment_id: str,
@@ -159,10 +192,14 @@ def precreate_runs(
     api_url: Optional[str] = None,
     api_key: Optional[str] = None,
     bundle_version_id: Optional[str] = None,
+    chunk_size: int = DEFAULT_PRECREATE_CHUNK_SIZE,
     quiet: bool = False,
-) -> Optional[str]:
+) -> RunPrecreator:
     """
-    Precreate runs via /api/sync/upload so streaming can reference existing runs.
+    Precreate the first chunk of runs and keep registering the rest in the background.
+
+    Call ``wait_for(run_id)`` on the returned precreator before a run starts
+    streaming, and ``close()`` before the final upload.
     """
     _load_env(scenario, base_dir)
     api_url = _resolve_api_url(api_url)
@@ -174,42 +211,91 @@ def precreate_runs(
     if not bundle_version_id:
         raise typer.BadParameter("bundle_version_id is required. Run sync pull first.")
 
-    payload = {
-        "bundle_version_id": bundle_version_id,
-        "run_batch": {
-            "experiment_id": experiment_id,
-            "execution_target": "local",
-            "status": "running",
-        },
-        "runs": runs,
-        "run_results": [],
-        "artifacts": [],
-        "upload_meta": {"mode": "precreate"},
-    }
-
-    with httpx.Client(base_url=api_url, timeout=30.0) as client:
-        resp = _post_with_retry(
-            client,
-            "/api/sync/upload",
-            payload=payload,
-            headers={"Authorization": f"Bearer {api_key}"},
-            max_retries=3,
-            backoff_seconds=1.0,
-            timeout_seconds=30.0,
-        )
-        upload_result = resp.json()
+    precreator: RunPrecreator
+
+    def _post_chunk(index: int, chunk: List[Dict[str, Any]]) -> Optional[str]:
+        upload_meta: Dict[str, Any] = {"mode": "precreate"}
+        if precreator.chunk_count > 1:
+            upload_meta.update({"chunk_index": index, "chunk_count": precreator.chunk_count})
+        payload = {
+            "bundle_version_id": bundle_version_id,
+            "run_batch": {
+                "experiment_id": experiment_id,
+                "execution_target": "local",
+                "status": "running",
+            },
+            "runs": chunk,
+            "run_results": [],
+            "artifacts": [],
+            "upload_meta": upload_meta,
+        }
+        with httpx.Client(base_url=api_url, timeout=30.0) as client:
+            resp = _post_with_retry(
+                client,
+                "/api/sync/upload",
+                payload=payload,
+                headers={"Authorization": f"Bearer {api_key}"},
+                max_retries=3,
+                backoff_seconds=1.0,
+                timeout_seconds=30.0,
+            )
+            return resp.json().get("run_batch_id")
 
-    run_batch_id = upload_result.get("run_batch_id")
+    precreator = RunPrecreator(runs, post_chunk=_post_chunk, chunk_size=chunk_size, quiet=quiet)
+    run_batch_id = precreator.start()
     if run_batch_id:
         sync_state["last_run_batch_id"] = run_batch_id
         sync_state["last_experiment_id"] = experiment_id
         _write_sync_state(scenario_root, sync_state)
 
     if not quiet:
+        pending = (
+            f", {precreator.chunk_count - 1} more chunks in background"
+            if precreator.chunk_count > 1
+            else ""
+        )
         console.print(
-            f"[green]✓[/green] Precreated {len(runs)} runs (experiment: {experiment_id})"
+            f"[green]✓[/green] Precreated runs (experiment: {experiment_id}{pending})"
         )
-    return run_batch_id
+    return precreator
+
+
+def precreate_runs(
+    *,
+    runs: List[Dict[str, Any]],
+    experiment_id: str,
+    scenario: Optional[str] = None,
+    base_dir: Optional[Path] = None,
+    api_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+    bundle_version_id: Optional[str] = None,
+    chunk_size: int = DEFAULT_PRECREATE_CHUNK_SIZE,
+    quiet: bool = False,
+) -> Optional[str]:
+    """
+    Precreate runs via /api/sync/upload so streaming can reference existing runs.
+
+    Blocks until every chunk has been attempted.
+    """
+    precreator = start_precreate_runs(
+        runs=runs,
+        experiment_id=experiment_id,
+        scenario=scenario,
+        base_dir=base_dir,
+        api_url=api_url,
+        api_key=api_key,
+        bundle_version_id=bundle_version_id,
+        chunk_size=chunk_size,
+        quiet=True,
+    )
+    stats = precreator.close()
+    if not quiet:
+        console.print(
+            f"[green]✓[/green] Precreated {stats.registered} runs (experiment: {experiment_id})"
+        )
+        if stats.failed:
+            console.print(f"[yellow]Failed to precreate {stats.failed} runs.[/yellow]")
+    return precreator.run_batch_id
 
 
 def stream_turn(
@@ -227,48 +313,24 @@ def stream_turn(
 ) -> bool:
     """
     Stream a single turn to the sync API (best-effort).
+
+    `fluxloop test` uses :class:`~fluxloop_cli.turn_streamer.TurnStreamer` to
+    stream many turns over one connection; this helper sends just one.
     """
     try:
         api_url = _resolve_api_url(api_url)
         api_key = _resolve_api_key(api_key)
-        run_id = turn.get("run_id")
-        turn_id = turn.get("turn_id")
-        if not run_id or not turn_id:
+        payload = build_turn_payload(turn)
+        if payload is None:
             return False
+        turn_id = payload["turn_id"]
 
-        allowed_keys = {
-            "run_id",
-            "turn_id",
-            "sequence",
-            "role",
-            "content",
-            "timestamp",
-            "duration_ms",
-            "warnings",
-        }
-        payload: Dict[str, Any] = {key: turn.get(key) for key in allowed_keys}
-        payload["run_id"] = run_id
-        payload["turn_id"] = turn_id
-
-        if payload.get("sequence") is not None:
-            try:
-                payload["sequence"] = int(payload["sequence"])
-            except (TypeError, ValueError):
-                pass
-
-        if not payload.get("timestamp"):
-            payload["timestamp"] = utc_now_iso()
-
-        if payload.get("warnings") is None:
-            payload["warnings"] = []
-
-        idempotency_key = f"{run_id}:{turn_id}"
         headers = {
             "Authorization": f"Bearer {api_key}",
-            "Idempotency-Key": idempotency_key,
+            "Idempotency-Key": turn_idempotency_key(payload),
         }
         if endpoint is None:
-            endpoint = "/api/sync/turns"
+            endpoint = DEFAULT_TURNS_ENDPOINT
 
         with httpx.Client(base_url=api_url, timeout=timeout_seconds) as client:
             _post_with_retry(
@@ -312,6 +374,11 @@ def _ensure_sync_dir(scenario_root: Path) -> Path:
     return sync_dir
 
 
+def _upload_manifest_path(scenario_root: Path, experiment_id: str) -> Path:
+    """Get the artifact upload manifest for an experiment."""
+    return _get_state_dir(scenario_root) / "sync" / "uploads" / f"{experiment_id}.jsonl"
+
+
 def _sync_state_paths(scenario_root: Path) -> List[Path]:
     """Get possible sync.json paths."""
     state_dir = _get_state_dir(scenario_root)
@@ -341,24 +408,55 @@ def _write_json(path: Path, payload: dict) -> None:
     path.write_text(json.dumps(payload, indent=2, ensure_ascii=False))
 
 
+def _write_text_if_changed(path: Path, text: str) -> bool:
+    """Write ``text`` unless the file already holds it; return True if written."""
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def _pull_cache_path(scenario_root: Path) -> Path:
+    """Get the cached response of the last bundle pull."""
+    return _get_state_dir(scenario_root) / "sync" / "pull_cache.json"
+
+
+def _read_pull_cache(path: Path, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the cached pull for ``request`` (project/bundle selection), if any."""
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("request") != request:
+        return None
+    if not isinstance(cache.get("data"), dict):
+        return None
+    return cache
+
+
 def _slugify(value: str) -> str:
     lowered = value.strip().lower()
     cleaned = "".join(ch if ch.isalnum() or ch in ("_", "-") else "_" for ch in lowered)
     return cleaned.strip("_") or "criteria"
 
 
-def _write_criteria(criteria_dir: Path, criteria_pack: List[Dict[str, Any]]) -> None:
+def _write_criteria(criteria_dir: Path, criteria_pack: List[Dict[str, Any]]) -> int:
     criteria_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
     for idx, item in enumerate(criteria_pack):
         if not isinstance(item, dict):
             continue
         name = item.get("name") or item.get("id") or f"criteria_{idx + 1}"
         filename = _slugify(str(name))
         path = criteria_dir / f"{filename}.yaml"
-        path.write_text(
-            yaml.safe_dump(item, sort_keys=False, allow_unicode=True),
-            encoding="utf-8",
+        written += _write_text_if_changed(
+            path, yaml.safe_dump(item, sort_keys=False, allow_unicode=True)
         )
+    return written
 
 
 def _extract_input_text(messages: Any) -> str:
@@ -404,12 +502,17 @@ def _resolve_inputs_path(
     return _resolve_relative_path(Path(inputs_file), scenario, base_dir), inputs_file
 
 
-def _load_inputs_mapping(inputs_path: Path) -> Dict[Tuple[str, Optional[str]], List[str]]:
+def _load_inputs_mapping(
+    inputs_path: Path, scenario: Optional[str] = None
+) -> Dict[Tuple[str, Optional[str]], List[str]]:
     if not inputs_path.exists():
         return {}
-    payload = yaml.safe_load(inputs_path.read_text()) or {}
-    entries = payload.get("inputs") if isinstance(payload, dict) else payload
-    if not isinstance(entries, list):
+    source = InputSource(
+        inputs_path, cache_dir=resolve_cache_dir(_resolve_scenario_dir(scenario))
+    )
+    try:
+        entries = list(source.iter_raw())
+    except ValueError:
         return {}
 
     mapping: Dict[Tuple[str, Optional[str]], List[str]] = {}
@@ -426,9 +529,45 @@ def _load_inputs_mapping(inputs_path: Path) -> Dict[Tuple[str, Optional[str]], L
     return mapping
 
 
-def _resolve_input_item_id(
-    trace: dict, mapping: Dict[Tuple[str, Optional[str]], List[str]]
-) -> Optional[str]:
+class _InputItemIndex:
+    """Input item ids keyed by ``(input text, persona)`` with a per-text index.
+
+    Built once per command so each trace resolves its id without scanning
+    every key of the inputs mapping.
+    """
+
+    def __init__(self, mapping: Dict[Tuple[str, Optional[str]], List[str]]) -> None:
+        self._ids: Dict[Tuple[str, Optional[str]], Deque[str]] = {
+            key: deque(ids) for key, ids in mapping.items()
+        }
+        self._keys_by_text: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        for key in self._ids:
+            self._keys_by_text.setdefault(key[0], []).append(key)
+        for keys in self._keys_by_text.values():
+            keys.sort(key=lambda pair: "" if pair[1] is None else str(pair[1]))
+
+    def _candidates(self, input_text: str, persona: Optional[str]) -> Optional[Deque[str]]:
+        for key in ((input_text, persona), (input_text, None)):
+            ids = self._ids.get(key)
+            if ids:
+                return ids
+        # Fallback: match by input text only when persona metadata is missing/mismatched.
+        for key in self._keys_by_text.get(input_text, ()):
+            ids = self._ids[key]
+            if ids:
+                return ids
+        return None
+
+    def peek(self, input_text: str, persona: Optional[str]) -> Optional[str]:
+        ids = self._candidates(input_text, persona)
+        return ids[0] if ids else None
+
+    def take(self, input_text: str, persona: Optional[str]) -> Optional[str]:
+        ids = self._candidates(input_text, persona)
+        return ids.popleft() if ids else None
+
+
+def _resolve_input_item_id(trace: dict, index: _InputItemIndex) -> Optional[str]:
     conversation_state = trace.get("conversation_state") or {}
     metadata = conversation_state.get("metadata") if isinstance(conversation_state, dict) else {}
     variation = metadata.get("variation") if isinstance(metadata, dict) else None
@@ -438,24 +577,105 @@ def _resolve_input_item_id(
             return direct
 
     input_text = trace.get("input")
-    persona = trace.get("persona")
     if input_text:
-        key = (input_text, persona)
-        if key in mapping and mapping[key]:
-            return mapping[key].pop(0)
-        key = (input_text, None)
-        if key in mapping and mapping[key]:
-            return mapping[key].pop(0)
-        # Fallback: match by input text only when persona metadata is missing/mismatched.
-        fallback_keys = [
-            key for key in mapping.keys() if key[0] == input_text and mapping[key]
-        ]
-        if fallback_keys:
-            fallback_keys.sort(key=lambda pair: "" if pair[1] is None else str(pair[1]))
-            return mapping[fallback_keys[0]].pop(0)
+        return index.take(input_text, trace.get("persona"))
     return None
 
 
+def _index_per_trace_markdown(per_trace_dir: Path) -> Dict[str, Path]:
+    """Map trace ids to their ``<index>_<trace_id>.md`` analysis files."""
+    index: Dict[str, Path] = {}
+    for path in sorted(per_trace_dir.glob("*.md")):
+        trace_id = path.stem.split("_", 1)[-1]
+        index.setdefault(trace_id, path)
+    return index
+
+
+def _find_per_trace_markdown(
+    trace_id: str, index: Dict[str, Path]
+) -> Optional[Path]:
+    path = index.get(trace_id)
+    if path is not None:
+        return path
+    # Files not following the naming scheme still match by substring, as before.
+    for candidate in index.values():
+        if trace_id in candidate.name:
+            return candidate
+    return None
+
+
+@dataclass
+class _RunPlan:
+    """Identifiers resolved for one trace before its payload is built."""
+
+    run_id: str
+    trace_id: Optional[str]
+    input_item_id: str
+    status: str
+
+    def run_payload(self) -> Dict[str, Any]:
+        return {
+            "id": self.run_id,
+            "input_item_id": self.input_item_id,
+            "persona_id": None,
+            "status": self.status,
+        }
+
+
+def _plan_runs(trace_summary_path: Path, input_index: _InputItemIndex) -> List[_RunPlan]:
+    plans: List[_RunPlan] = []
+    for trace in _iter_jsonl(trace_summary_path):
+        trace_id = trace.get("trace_id")
+        input_item_id = _resolve_input_item_id(trace, input_index)
+        if not input_item_id:
+            raise typer.BadParameter(
+                f"input_item_id not found for trace {trace_id}. Run sync pull first."
+            )
+        plans.append(
+            _RunPlan(
+                run_id=_coerce_run_id(trace_id),
+                trace_id=trace_id,
+                input_item_id=input_item_id,
+                status="completed" if trace.get("success") else "failed",
+            )
+        )
+    return plans
+
+
+def _build_run_result(plan: _RunPlan, trace: dict) -> Dict[str, Any]:
+    metrics = {}
+    if trace.get("duration_ms") is not None:
+        metrics["duration_ms"] = trace.get("duration_ms")
+    if trace.get("token_usage"):
+        metrics.update(trace.get("token_usage"))
+
+    transcript = []
+    for entry in trace.get("conversation") or []:
+        if not isinstance(entry, dict):
+            continue
+        transcript.append(
+            {
+                "role": entry.get("role"),
+                "content": entry.get("content"),
+                "metadata": entry.get("metadata"),
+            }
+        )
+
+    local_eval_summary = {
+        "verdict": "pass" if trace.get("success") else "fail",
+        "scores": {},
+        "failures": [],
+    }
+
+    return {
+        "run_id": plan.run_id,
+        "status": plan.status,
+        "metrics": metrics,
+        "transcript": transcript,
+        "local_eval_summary": local_eval_summary,
+    }
+
+
 def _coerce_run_id(trace_id: Optional[str]) -> str:
     if trace_id:
         try:
@@ -501,6 +721,9 @@ def pull(
     scenario: Optional[str] = typer.Option(None, "--scenario", help="Scenario name (defaults to current context)"),
     api_url: Optional[str] = typer.Option(None, "--api-url", help="Sync API base URL"),
     api_key: Optional[str] = typer.Option(None, "--api-key", help="Sync API key"),
+    force: bool = typer.Option(
+        False, "--force", help="Download the full bundle even if the cached copy is current"
+    ),
     quiet: bool = typer.Option(False, "--quiet", help="Minimal output"),
 ):
     """
@@ -533,23 +756,39 @@ def pull(
         "include_criteria": True,
     }
 
+    scenario_root = _resolve_scenario_dir(scenario)
+    inputs_path, inputs_file = _resolve_inputs_path(scenario, None, config_file)
+
+    # Reuse the last pull for the same selection when the server reports no change.
+    cache_path = _pull_cache_path(scenario_root)
+    cache_request = {"project_id": project_id, "bundle_version_id": bundle_version_id}
+    cache = None if force else _read_pull_cache(cache_path, cache_request)
+    headers = {"Authorization": f"Bearer {api_key}"}
+    if cache and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+
     with httpx.Client(base_url=api_url, timeout=30.0) as client:
-        resp = client.post(
-            "/api/sync/pull",
-            json=payload,
-            headers={"Authorization": f"Bearer {api_key}"},
+        resp = client.post("/api/sync/pull", json=payload, headers=headers)
+        if resp.status_code == 304 and cache is not None:
+            data = cache["data"]
+            not_modified = True
+        else:
+            resp.raise_for_status()
+            data = resp.json()
+            not_modified = False
+
+    if not not_modified:
+        _write_json(
+            cache_path,
+            {"request": cache_request, "etag": resp.headers.get("ETag"), "data": data},
         )
-        resp.raise_for_status()
-        data = resp.json()
 
-    scenario_root = _resolve_scenario_dir(scenario)
     state_dir = _ensure_state_dir(scenario_root)
     sync_dir = _ensure_sync_dir(scenario_root)
 
     personas = data.get("personas") or []
     persona_map = {item.get("id"): item.get("name") for item in personas if item.get("id")}
 
-    inputs_path, inputs_file = _resolve_inputs_path(scenario, None, config_file)
     inputs_payload = {"inputs": []}
     for item in data.get("input_items") or []:
         input_text = _extract_input_text(item.get("messages"))
@@ -570,25 +809,52 @@ def pull(
             }
         )
 
-    inputs_path.parent.mkdir(parents=True, exist_ok=True)
-    inputs_path.write_text(yaml.safe_dump(inputs_payload, sort_keys=False, allow_unicode=True))
+    # Files are only rewritten when their content differs from the bundle.
+    written = 0
+    written += _write_text_if_changed(
+        inputs_path, yaml.safe_dump(inputs_payload, sort_keys=False, allow_unicode=True)
+    )
 
     criteria_pack = data.get("criteria_pack") or []
-    _write_json(sync_dir / "personas.json", {"items": personas})
-    _write_json(sync_dir / "criteria.json", {"items": criteria_pack})
-    _write_criteria(state_dir / "criteria", criteria_pack if isinstance(criteria_pack, list) else [])
+    written += _write_text_if_changed(
+        sync_dir / "personas.json",
+        json.dumps({"items": personas}, indent=2, ensure_ascii=False),
+    )
+    written += _write_text_if_changed(
+        sync_dir / "criteria.json",
+        json.dumps({"items": criteria_pack}, indent=2, ensure_ascii=False),
+    )
+    written += _write_criteria(
+        state_dir / "criteria", criteria_pack if isinstance(criteria_pack, list) else []
+    )
 
-    sync_state = {
+    sync_state = _read_sync_state(scenario_root)
+    bundle_state = {
         "project_id": data.get("bundle_version", {}).get("project_id") or project_id,
         "bundle_version_id": data.get("bundle_version", {}).get("id"),
         "inputs_file": inputs_file,
-        "pulled_at": data.get("sync_meta", {}).get("pulled_at"),
         "api_url": api_url,
     }
+    if not_modified and all(sync_state.get(key) == value for key, value in bundle_state.items()):
+        if not quiet:
+            suffix = f", restored {written} files" if written else ""
+            console.print(
+                f"[green]✓[/green] Bundle unchanged "
+                f"({bundle_state['bundle_version_id'] or 'latest'}{suffix})"
+            )
+        return
+
+    sync_state = {
+        **bundle_state,
+        "pulled_at": data.get("sync_meta", {}).get("pulled_at"),
+    }
     _write_sync_state(scenario_root, sync_state)
 
     if not quiet:
-        console.print(f"[green]✓[/green] Pulled {len(inputs_payload['inputs'])} inputs")
+        console.print(
+            f"[green]✓[/green] Pulled {len(inputs_payload['inputs'])} inputs "
+            f"({written} files changed)"
+        )
         console.print(f"[green]✓[/green] Saved inputs to {inputs_path}")
         console.print(f"[green]✓[/green] Saved sync metadata to {_sync_state_paths(scenario_root)[0]}")
 
@@ -607,6 +873,20 @@ def upload(
     bundle_version_id: Optional[str] = typer.Option(
         None, "--bundle-version-id", help="Bundle version ID"
     ),
+    concurrency: int = typer.Option(
+        DEFAULT_UPLOAD_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Maximum artifact uploads in flight",
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Re-upload artifacts even if they are unchanged"
+    ),
+    compression: str = typer.Option(
+        "auto",
+        "--compression",
+        help="Request body encoding: auto (negotiated), gzip, zstd or none",
+    ),
     quiet: bool = typer.Option(False, "--quiet", help="Minimal output"),
 ):
     """
@@ -622,6 +902,10 @@ def upload(
     _load_env(scenario)
     api_url = _resolve_api_url(api_url)
     api_key = _resolve_api_key(api_key)
+    try:
+        negotiator = EncodingNegotiator(compression)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
 
     scenario_root = _resolve_scenario_dir(scenario)
     sync_state = _read_sync_state(scenario_root)
@@ -658,186 +942,131 @@ def upload(
     experiment_id = experiment_dir.name
 
     inputs_path, _ = _resolve_inputs_path(scenario, None, config_file)
-    input_map = _load_inputs_mapping(inputs_path)
-
-    traces = list(_iter_jsonl(trace_summary_path))
-    run_ids: Dict[str, str] = {}
-    runs_payload: List[dict] = []
-    results_payload: List[dict] = []
-    all_completed = True
-
-    for trace in traces:
-        trace_id = trace.get("trace_id")
-        run_id = _coerce_run_id(trace_id)
-        run_ids[trace_id or run_id] = run_id
-
-        input_item_id = _resolve_input_item_id(trace, input_map)
-        if not input_item_id:
-            raise typer.BadParameter(
-                f"input_item_id not found for trace {trace_id}. Run sync pull first."
-            )
-
-        status = "completed" if trace.get("success") else "failed"
-        if status != "completed":
-            all_completed = False
-
-        runs_payload.append(
-            {
-                "id": run_id,
-                "input_item_id": input_item_id,
-                "persona_id": None,
-                "status": status,
-            }
-        )
-
-        metrics = {}
-        if trace.get("duration_ms") is not None:
-            metrics["duration_ms"] = trace.get("duration_ms")
-        if trace.get("token_usage"):
-            metrics.update(trace.get("token_usage"))
-
-        transcript = []
-        for entry in trace.get("conversation") or []:
-            if not isinstance(entry, dict):
-                continue
-            transcript.append(
-                {
-                    "role": entry.get("role"),
-                    "content": entry.get("content"),
-                    "metadata": entry.get("metadata"),
-                }
-            )
-
-        local_eval_summary = {
-            "verdict": "pass" if trace.get("success") else "fail",
-            "scores": {},
-            "failures": [],
-        }
-
-        results_payload.append(
-            {
-                "run_id": run_id,
-                "status": status,
-                "metrics": metrics,
-                "transcript": transcript,
-                "local_eval_summary": local_eval_summary,
-            }
-        )
+    input_index = _InputItemIndex(_load_inputs_mapping(inputs_path, scenario))
 
+    # First pass keeps only ids, so every trace is validated before anything is sent.
+    plans = _plan_runs(trace_summary_path, input_index)
+    all_completed = all(plan.status == "completed" for plan in plans)
     run_batch_status = "completed" if all_completed else "failed"
 
-    artifacts_payload: List[dict] = []
-    project_id = sync_state.get("project_id")
+    artifacts: List[ArtifactUpload] = []
 
-    def _upload_file(run_id: str, artifact_type: str, file_path: Path) -> None:
-        if not file_path.exists():
-            return
-        content_type = _guess_content_type(file_path)
-        with httpx.Client(base_url=api_url, timeout=60.0) as client:
-            presign_resp = client.post(
-                "/api/storage/presign",
-                json={
-                    "project_id": project_id,
-                    "run_id": run_id,
-                    "artifact_type": artifact_type,
-                    "filename": file_path.name,
-                    "content_type": content_type,
-                },
-                headers={"Authorization": f"Bearer {api_key}"},
-            )
-            presign_resp.raise_for_status()
-            presign = presign_resp.json()
-
-            upload_headers = presign.get("headers") or {}
-            upload_url = presign["upload_url"]
-            upload_resp = httpx.put(
-                upload_url,
-                content=file_path.read_bytes(),
-                headers=upload_headers,
-                timeout=120.0,
-            )
-            upload_resp.raise_for_status()
-            artifacts_payload.append(
-                {
-                    "run_id": run_id,
-                    "type": artifact_type,
-                    "storage_url": presign["storage_url"],
-                }
+    def _add_artifact(run_id: str, artifact_type: str, file_path: Path) -> None:
+        artifacts.append(
+            ArtifactUpload(
+                run_id=run_id,
+                artifact_type=artifact_type,
+                path=file_path,
+                content_type=_guess_content_type(file_path),
             )
+        )
 
     per_trace_dir = experiment_dir / "per_trace_analysis"
     if per_trace_dir.exists():
-        for trace in traces:
-            trace_id = trace.get("trace_id")
-            if not trace_id:
-                continue
-            run_id = run_ids.get(trace_id)
-            if not run_id:
+        markdown_index = _index_per_trace_markdown(per_trace_dir)
+        for plan in plans:
+            if not plan.trace_id:
                 continue
-            matches = list(per_trace_dir.glob(f"*{trace_id}*.md"))
-            if matches:
-                _upload_file(run_id, "per_trace_markdown", matches[0])
+            markdown = _find_per_trace_markdown(plan.trace_id, markdown_index)
+            if markdown is not None:
+                _add_artifact(plan.run_id, "per_trace_markdown", markdown)
 
         per_trace_jsonl = per_trace_dir / "per_trace.jsonl"
-        if traces:
-            first_run_id = run_ids.get(traces[0].get("trace_id"), list(run_ids.values())[0])
-            _upload_file(first_run_id, "per_trace_index", per_trace_jsonl)
-
-    if traces:
-        first_run_id = run_ids.get(traces[0].get("trace_id"), list(run_ids.values())[0])
-        _upload_file(first_run_id, "summary", experiment_dir / "summary.json")
-        _upload_file(first_run_id, "trace_summary", experiment_dir / "trace_summary.jsonl")
-        _upload_file(first_run_id, "observations", experiment_dir / "observations.jsonl")
-
-    turns_payload = load_turns(experiment_dir / "turns.jsonl")
-    turn_summaries = summarize_turns(turns_payload) if turns_payload else {}
-    turn_summary_payload: List[Dict[str, Any]] = []
-    for run_id in run_ids.values():
-        summary = turn_summaries.get(run_id)
-        if summary is None:
-            continue
-        turn_summary_payload.append(
-            {
-                "run_id": run_id,
-                "total_turns": summary.total_turns,
-                "warning_turns": summary.warning_turns,
-                "warning_count": summary.warning_count,
-                "warning_rate": summary.warning_rate,
-            }
+        if plans:
+            _add_artifact(plans[0].run_id, "per_trace_index", per_trace_jsonl)
+
+    if plans:
+        first_run_id = plans[0].run_id
+        _add_artifact(first_run_id, "summary", experiment_dir / "summary.json")
+        _add_artifact(first_run_id, "trace_summary", experiment_dir / "trace_summary.jsonl")
+        _add_artifact(first_run_id, "observations", experiment_dir / "observations.jsonl")
+
+    project_id = sync_state.get("project_id")
+    manifest_path = _upload_manifest_path(scenario_root, experiment_id)
+    if force:
+        manifest_path.unlink(missing_ok=True)
+    uploader = ArtifactUploader(
+        api_url=api_url,
+        api_key=api_key,
+        project_id=project_id,
+        concurrency=concurrency,
+        manifest=UploadManifest(manifest_path, project_id=project_id),
+        negotiator=negotiator,
+    )
+    artifacts_payload = uploader.upload_all(artifacts)
+    if uploader.skipped and not quiet:
+        console.print(
+            f"[dim]Skipped {uploader.skipped} unchanged artifacts "
+            f"(uploaded {uploader.uploaded})[/dim]"
         )
 
-    payload = {
-        "bundle_version_id": bundle_version_id,
-        "run_batch": {
-            "experiment_id": experiment_id,
-            "execution_target": "local",
-            "status": run_batch_status,
-        },
-        "runs": runs_payload,
-        "run_results": results_payload,
-        "artifacts": artifacts_payload,
-        "turns": turns_payload,
-        "turn_summaries": turn_summary_payload,
-        "upload_meta": {},
-    }
+    turns_path = experiment_dir / "turns.jsonl"
+    turn_summaries = summarize_turns(iter_turn_records(turns_path))
+
+    def _payload_items() -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for plan, trace in zip(plans, _iter_jsonl(trace_summary_path)):
+            yield "runs", plan.run_payload()
+            yield "run_results", _build_run_result(plan, trace)
+            summary = turn_summaries.get(plan.run_id)
+            if summary is not None:
+                yield "turn_summaries", {
+                    "run_id": plan.run_id,
+                    "total_turns": summary.total_turns,
+                    "warning_turns": summary.warning_turns,
+                    "warning_count": summary.warning_count,
+                    "warning_rate": summary.warning_rate,
+                }
+        for turn in iter_turn_records(turns_path):
+            yield "turns", turn
 
+    run_batch_id = None
+    chunk_count = 0
+    headers = {"Authorization": f"Bearer {api_key}"}
     with httpx.Client(base_url=api_url, timeout=60.0) as client:
-        resp = client.post(
-            "/api/sync/upload",
-            json=payload,
-            headers={"Authorization": f"Bearer {api_key}"},
+        chunks = iter_chunks(
+            _payload_items(), max_bytes=UPLOAD_CHUNK_MAX_BYTES, max_items=UPLOAD_CHUNK_MAX_ITEMS
         )
-        resp.raise_for_status()
-        upload_result = resp.json()
+        for index, chunk, is_last in with_last_flag(chunks):
+            chunked = index > 0 or not is_last
+            payload = {
+                "bundle_version_id": bundle_version_id,
+                "run_batch": {
+                    "experiment_id": experiment_id,
+                    "execution_target": "local",
+                    "status": run_batch_status if is_last else "running",
+                },
+                "runs": chunk.get("runs", []),
+                "run_results": chunk.get("run_results", []),
+                "artifacts": artifacts_payload if is_last else [],
+                "turns": chunk.get("turns", []),
+                "turn_summaries": chunk.get("turn_summaries", []),
+                "upload_meta": (
+                    {"mode": "chunked", "chunk_index": index, "final": is_last}
+                    if chunked
+                    else {}
+                ),
+            }
+            # Each chunk is retried on its own; experiment_id keeps re-sends idempotent.
+            resp = _post_with_retry(
+                client,
+                "/api/sync/upload",
+                payload=payload,
+                headers=headers,
+                timeout_seconds=60.0,
+                negotiator=negotiator,
+            )
+            run_batch_id = resp.json().get("run_batch_id") or run_batch_id
+            chunk_count += 1
 
     # Cache run_batch_id for future reference
-    run_batch_id = upload_result.get("run_batch_id")
     if run_batch_id:
         sync_state["last_run_batch_id"] = run_batch_id
         sync_state["last_experiment_id"] = experiment_id
         _write_sync_state(scenario_root, sync_state)
 
     if not quiet:
+        chunk_note = f", {chunk_count} chunks" if chunk_count > 1 else ""
         console.print(
-            f"[green]✓[/green] Uploaded {len(runs_payload)} runs (experiment: {experiment_id})"
+            f"[green]✓[/green] Uploaded {len(plans)} runs "
+            f"(experiment: {experiment_id}{chunk_note})"
         )
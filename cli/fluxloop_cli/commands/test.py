@@ -6,19 +6,24 @@ from __future__ import annotations
 
 import asyncio
 import os
-from concurrent.futures import ThreadPoolExecutor
 import yaml
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 import typer
 from rich.console import Console
 
 from ..config_loader import load_experiment_config, load_project_config
+from ..input_loader import InputSource, resolve_cache_dir
 from ..constants import DEFAULT_CONFIG_PATH, FLUXLOOP_DIR_NAME, SCENARIOS_DIR_NAME, STATE_DIR_NAME
 from ..project_paths import resolve_config_path
+from ..phase_timer import print_phase_report
+from ..profiling import PROFILE_MODES
+from ..run_precreator import DEFAULT_PRECREATE_CHUNK_SIZE, RunPrecreator
 from ..runner import ExperimentRunner
+from ..turn_streamer import TurnStreamer
 from ..turns import (
+    ResultMarkdownWriter,
     TurnRecorder,
     format_warning_for_display,
     load_criteria_items,
@@ -28,6 +33,8 @@ from ..turns import (
 )
 from . import sync
 
+if TYPE_CHECKING:
+    from fluxloop.schemas import PersonaConfig
 
 app = typer.Typer(help="Run pull -> run -> upload test workflow.")
 console = Console()
@@ -62,6 +69,15 @@ def main(
     full: bool = typer.Option(False, "--full", help="Run full test"),
     quiet: bool = typer.Option(False, "--quiet", help="Minimal output"),
     no_collector: bool = typer.Option(False, "--no-collector", help="Disable collector"),
+    profile_runner: bool = typer.Option(
+        False, "--profile-runner", help="Print time spent in each runner phase"
+    ),
+    profile: Optional[str] = typer.Option(
+        None, "--profile", help="Profile agent runs: cprofile or sampling"
+    ),
+    profile_every: int = typer.Option(
+        1, "--profile-every", min=1, help="Profile only every Nth run"
+    ),
 ):
     """
     Run FluxLoop test workflow (run -> upload).
@@ -121,12 +137,10 @@ def main(
                 (source_dir / inputs_path).resolve() if source_dir and not inputs_path.is_absolute() else inputs_path
             )
             if resolved_inputs.exists():
-                payload = yaml.safe_load(resolved_inputs.read_text()) or {}
-                entries = payload.get("inputs") if isinstance(payload, dict) else payload
-                if isinstance(entries, list) and entries:
-                    smoke_payload = (
-                        {"inputs": entries[:1]} if isinstance(payload, dict) else entries[:1]
-                    )
+                source = InputSource(resolved_inputs, cache_dir=resolve_cache_dir(source_dir))
+                first = next(iter(source.iter_raw()), None)
+                if first is not None:
+                    smoke_payload = {"inputs": [first]}
                     state_dir = scenario_root / STATE_DIR_NAME
                     smoke_path = state_dir / "smoke_inputs.yaml"
                     smoke_path.parent.mkdir(parents=True, exist_ok=True)
@@ -137,12 +151,19 @@ def main(
                     config.inputs_file = str(smoke_path)
 
     guardrails = load_guardrails_from_config(project_config)
-    runner = ExperimentRunner(config, no_collector=no_collector)
+    if profile and profile not in PROFILE_MODES:
+        raise typer.BadParameter(
+            f"Unknown profile mode '{profile}'. Choose one of: {', '.join(PROFILE_MODES)}"
+        )
+    runner = ExperimentRunner(
+        config, no_collector=no_collector, profile=profile, profile_every=profile_every
+    )
     recorder = TurnRecorder(runner.output_dir / "turns.jsonl", guardrails)
     state_dir = scenario_root / STATE_DIR_NAME
     criteria_items = load_criteria_items(state_dir / "criteria")
     result_path = runner.output_dir / "result.md"
-    result_path.write_text("", encoding="utf-8")
+    result_writer = ResultMarkdownWriter(result_path)
+    result_writer.start()
     latest_path = write_latest_result_link(scenario_root, result_path)
 
     stream_enabled = stream_turns
@@ -159,22 +180,42 @@ def main(
     stream_endpoint = test_config.get("turn_stream_endpoint") or os.getenv(
         "FLUXLOOP_TURN_STREAM_ENDPOINT"
     )
-    stream_retries = int(test_config.get("turn_stream_retry_max", 3))
-    stream_backoff = float(test_config.get("turn_stream_backoff_seconds", 1.0))
-    stream_timeout = float(test_config.get("turn_stream_timeout_seconds", 10.0))
-    stream_executor = ThreadPoolExecutor(max_workers=2) if stream_enabled else None
-    stream_futures = []
+    streamer: Optional[TurnStreamer] = None
     if stream_enabled:
         sync._load_env(scenario)
+        try:
+            streamer = TurnStreamer(
+                api_url=sync._resolve_api_url(None),
+                api_key=sync._resolve_api_key(None),
+                endpoint=stream_endpoint,
+                batch_endpoint=test_config.get("turn_stream_batch_endpoint")
+                or os.getenv("FLUXLOOP_TURN_STREAM_BATCH_ENDPOINT"),
+                max_retries=int(test_config.get("turn_stream_retry_max", 3)),
+                backoff_seconds=float(test_config.get("turn_stream_backoff_seconds", 1.0)),
+                timeout_seconds=float(test_config.get("turn_stream_timeout_seconds", 10.0)),
+                batch_size=int(test_config.get("turn_stream_batch_size", 20)),
+                batch_window_seconds=float(
+                    test_config.get("turn_stream_batch_window_seconds", 0.2)
+                ),
+                queue_size=int(test_config.get("turn_stream_queue_size", 1000)),
+                quiet=quiet,
+            )
+        except typer.BadParameter as exc:
+            if not quiet:
+                console.print(f"[yellow]Turn streaming disabled:[/yellow] {exc}")
+            stream_enabled = False
 
     run_id_map = {}
+    run_ordinals: Dict[str, int] = {}
+    precreator: Optional[RunPrecreator] = None
+    precreate_wait_seconds = float(test_config.get("precreate_wait_seconds", 60.0))
     if stream_enabled and not stream_after_upload:
-        inputs = asyncio.run(runner._load_inputs())
+        inputs = asyncio.run(runner._open_inputs())
         persona_map = {p.name: p for p in (config.personas or [])}
         use_entry_persona = config.has_external_inputs()
 
         inputs_path, _ = sync._resolve_inputs_path(scenario, None, config_file)
-        input_map = sync._load_inputs_mapping(inputs_path)
+        input_index = sync._InputItemIndex(sync._load_inputs_mapping(inputs_path, scenario))
 
         def _lookup_input_item_id(entry: dict, persona_name: Optional[str]) -> Optional[str]:
             metadata = entry.get("metadata") or {}
@@ -184,17 +225,7 @@ def main(
             input_text = entry.get("input")
             if not input_text:
                 return None
-            key = (input_text, persona_name)
-            if key in input_map and input_map[key]:
-                return input_map[key][0]
-            key = (input_text, None)
-            if key in input_map and input_map[key]:
-                return input_map[key][0]
-            fallback_keys = [k for k in input_map.keys() if k[0] == input_text and input_map[k]]
-            if fallback_keys:
-                fallback_keys.sort(key=lambda pair: "" if pair[1] is None else str(pair[1]))
-                return input_map[fallback_keys[0]][0]
-            return None
+            return input_index.peek(input_text, persona_name)
 
         runs_payload = []
         for iteration in range(config.iterations):
@@ -254,7 +285,9 @@ def main(
                             }
                         )
 
-        sync.precreate_runs(
+        run_ordinals = {run_id: number for number, run_id in enumerate(run_id_map.values(), 1)}
+
+        precreator = sync.start_precreate_runs(
             runs=runs_payload,
             experiment_id=runner.output_dir.name,
             scenario=scenario,
@@ -262,6 +295,9 @@ def main(
             api_url=None,
             api_key=None,
             bundle_version_id=None,
+            chunk_size=int(
+                test_config.get("precreate_chunk_size", DEFAULT_PRECREATE_CHUNK_SIZE)
+            ),
             quiet=quiet,
         )
 
@@ -270,22 +306,11 @@ def main(
 
     def _turn_record_callback(turn_payload: dict) -> None:
         record = recorder.record_turn(turn_payload)
-        if stream_enabled and stream_executor and not stream_after_upload:
-            stream_futures.append(
-                stream_executor.submit(
-                    sync.stream_turn,
-                    turn=record,
-                    experiment_id=runner.output_dir.name,
-                    scenario_root=scenario_root,
-                    api_url=None,
-                    api_key=None,
-                    endpoint=stream_endpoint,
-                    max_retries=stream_retries,
-                    backoff_seconds=stream_backoff,
-                    timeout_seconds=stream_timeout,
-                    quiet=quiet,
-                )
-            )
+        # Keep result.md current so latest_result is always available.
+        result_writer.append_turn(record)
+        if streamer is not None and not stream_after_upload:
+            with runner.phases.phase("turn_streaming"):
+                streamer.submit(record)
         if quiet:
             return
         if record.get("role") != "assistant":
@@ -293,12 +318,7 @@ def main(
         run_id = record["run_id"]
         turn_index = recorder.get_assistant_turn_count(run_id)
         total_runs = len(run_id_map) if run_id_map else None
-        run_number = None
-        if run_id_map:
-            try:
-                run_number = list(run_id_map.values()).index(run_id) + 1
-            except ValueError:
-                run_number = None
+        run_number = run_ordinals.get(run_id)
         duration_ms = record.get("duration_ms")
         duration = f"{duration_ms / 1000:.1f}s" if duration_ms is not None else "-"
         warning_msg = format_warning_for_display(record.get("warnings", []))
@@ -317,37 +337,66 @@ def main(
             console.print("    Response:")
             for line in str(content).splitlines():
                 console.print(f"      {line}")
-        # Update result.md progressively so latest_result is always available.
-        result_path.write_text(
-            render_result_markdown(list(recorder.iter_turns()), recorder.get_overall_summary(), criteria_items),
-            encoding="utf-8",
+
+    def _provide_run_id(
+        variation: dict, persona: Optional[PersonaConfig], iteration: int
+    ) -> Optional[str]:
+        run_id = run_id_map.get(
+            (
+                iteration,
+                persona.name if persona else None,
+                variation.get("source_index"),
+                variation.get("input"),
+            )
         )
+        # Later chunks are still being precreated; only wait for this run's chunk.
+        if precreator is not None and run_id:
+            registered = precreator.wait_for(run_id, timeout=precreate_wait_seconds)
+            if not registered and not quiet:
+                console.print(
+                    f"[yellow]Run {run_id} was not precreated; its turns may not stream.[/yellow]"
+                )
+        return run_id
 
     try:
-        asyncio.run(
+        run_results = asyncio.run(
             runner.run_experiment(
                 turn_record_callback=_turn_record_callback,
-                run_id_provider=(
-                    None
-                    if not run_id_map
-                    else lambda variation, persona, iteration: run_id_map.get(
-                        (
-                            iteration,
-                            persona.name if persona else None,
-                            variation.get("source_index"),
-                            variation.get("input"),
-                        )
-                    )
-                ),
+                run_id_provider=_provide_run_id if run_id_map else None,
             )
         )
     except KeyboardInterrupt:
         console.print("[yellow]Test interrupted by user[/yellow]")
+        if precreator is not None:
+            precreator.close(timeout=5.0)
+        if streamer is not None:
+            streamer.close(timeout=5.0)
         raise typer.Exit(1)
     except Exception as exc:
         console.print(f"[red]Test failed:[/red] {exc}")
+        if precreator is not None:
+            precreator.close(timeout=5.0)
+        if streamer is not None:
+            streamer.close(timeout=5.0)
         raise typer.Exit(1)
 
+    if precreator is not None:
+        # The final upload must not race with chunks still marking runs as running.
+        precreate_stats = precreator.close()
+        if not quiet and precreate_stats.failed:
+            console.print(
+                f"[yellow]Failed to precreate {precreate_stats.failed} runs.[/yellow]"
+            )
+
+    if profile_runner and not quiet and run_results.get("runner_profile"):
+        print_phase_report(
+            run_results["runner_profile"], run_results.get("duration_seconds"), console
+        )
+
+    profile_info = run_results.get("profile") or {}
+    if profile_info.get("path") and not quiet:
+        console.print(f"[Profile] {runner.output_dir / profile_info['path']}")
+
     summary = recorder.get_overall_summary()
     turns = list(recorder.iter_turns())
     result_path.write_text(
@@ -364,10 +413,13 @@ def main(
             api_url=None,
             api_key=None,
             bundle_version_id=None,
+            concurrency=int(test_config.get("upload_concurrency", sync.DEFAULT_UPLOAD_CONCURRENCY)),
+            force=False,
+            compression=str(test_config.get("upload_compression", "auto")),
             quiet=quiet,
         )
 
-    if stream_enabled and stream_after_upload:
+    if streamer is not None and stream_after_upload:
         if not do_upload:
             if not quiet:
                 console.print(
@@ -377,43 +429,15 @@ def main(
             if not quiet:
                 console.print("[Stream] Streaming turns after upload...")
             for turn in turns:
-                if stream_executor:
-                    stream_futures.append(
-                        stream_executor.submit(
-                            sync.stream_turn,
-                            turn=turn,
-                            experiment_id=runner.output_dir.name,
-                            scenario_root=scenario_root,
-                            api_url=None,
-                            api_key=None,
-                            endpoint=stream_endpoint,
-                            max_retries=stream_retries,
-                            backoff_seconds=stream_backoff,
-                            timeout_seconds=stream_timeout,
-                            quiet=quiet,
-                        )
-                    )
-                else:
-                    sync.stream_turn(
-                        turn=turn,
-                        experiment_id=runner.output_dir.name,
-                        scenario_root=scenario_root,
-                        api_url=None,
-                        api_key=None,
-                        endpoint=stream_endpoint,
-                        max_retries=stream_retries,
-                        backoff_seconds=stream_backoff,
-                        timeout_seconds=stream_timeout,
-                        quiet=quiet,
-                    )
+                streamer.submit(turn)
 
-    if stream_executor:
-        for future in stream_futures:
-            try:
-                future.result()
-            except Exception:
-                continue
-        stream_executor.shutdown(wait=True)
+    if streamer is not None:
+        stream_stats = streamer.close()
+        if not quiet and stream_stats.total:
+            console.print(
+                f"[Stream] Delivered {stream_stats.delivered} turns"
+                f" ({stream_stats.dropped} dropped)"
+            )
 
     if quiet:
         console.print(
@@ -0,0 +1,165 @@
+"""
+Content-encoding negotiation for sync uploads.
+
+The sync API advertises the request encodings it accepts through an
+``Accept-Encoding`` response header (RFC 7694) and presign responses may list
+``accept_encoding`` for the storage target. Bodies are compressed only when the
+receiver has advertised support; otherwise they are sent as-is. zstd requires
+the optional ``zstandard`` package (``pip install fluxloop-cli[zstd]``).
+"""
+
+from __future__ import annotations
+
+import gzip
+import tempfile
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import httpx
+
+COMPRESSION_MODES = ("auto", "gzip", "zstd", "none")
+
+# Bodies smaller than this are not worth compressing.
+MIN_COMPRESS_BYTES = 1024
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "text/markdown",
+    "text/html",
+    "text/plain",
+)
+
+_CHUNK_SIZE = 256 * 1024
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def supported_encodings() -> List[str]:
+    """Encodings this client can produce, in order of preference."""
+    encodings = ["gzip"]
+    if zstd_available():
+        encodings.insert(0, "zstd")
+    return encodings
+
+
+def parse_accept_encoding(value: Union[str, Iterable[str], None]) -> List[str]:
+    """Parse an ``Accept-Encoding`` value (header string or list) into codings."""
+    if not value:
+        return []
+    items = value.split(",") if isinstance(value, str) else list(value)
+    codings: List[str] = []
+    for item in items:
+        coding, _, params = str(item).strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        codings.append(coding)
+    return codings
+
+
+def choose_encoding(mode: str, advertised: Iterable[str]) -> Optional[str]:
+    """Pick a content coding for ``mode`` given what the receiver advertised."""
+    if mode == "none":
+        return None
+    accepted = set(advertised)
+    candidates = supported_encodings() if mode == "auto" else [mode]
+    for coding in candidates:
+        if coding == "zstd" and not zstd_available():
+            continue
+        if coding in accepted or "*" in accepted:
+            return coding
+    return None
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if encoding == "zstd":
+        import zstandard
+
+        compressed: bytes = zstandard.ZstdCompressor(level=3).compress(data)
+        return compressed
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def compress_file(
+    path: Path, encoding: str, *, digest: Optional[Any] = None
+) -> IO[bytes]:
+    """Compress ``path`` into a temporary file and return it rewound.
+
+    Presigned uploads need the final length up front, so the compressed body is
+    staged on disk instead of being streamed. ``digest`` receives the raw bytes.
+    """
+    staged = tempfile.TemporaryFile()
+    with path.open("rb") as source:
+        if encoding == "gzip":
+            with gzip.GzipFile(fileobj=staged, mode="wb", compresslevel=6, mtime=0) as sink:
+                _copy(source, sink, digest)
+        elif encoding == "zstd":
+            import zstandard
+
+            with zstandard.ZstdCompressor(level=3).stream_writer(
+                staged, closefd=False
+            ) as sink:
+                _copy(source, sink, digest)
+        else:
+            staged.close()
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+    staged.seek(0)
+    return staged
+
+
+def _copy(source: IO[bytes], sink: Any, digest: Optional[Any]) -> None:
+    for chunk in iter(lambda: source.read(_CHUNK_SIZE), b""):
+        if digest is not None:
+            digest.update(chunk)
+        sink.write(chunk)
+
+
+class EncodingNegotiator:
+    """Tracks which request encoding the sync API accepts.
+
+    ``observe`` is fed every API response; until the server advertises support
+    (or after it rejects a compressed body) requests are sent uncompressed.
+    """
+
+    def __init__(self, mode: str = "auto") -> None:
+        if mode not in COMPRESSION_MODES:
+            raise ValueError(
+                f"Unknown compression mode '{mode}'. Choose one of: {', '.join(COMPRESSION_MODES)}"
+            )
+        self.mode = mode
+        self._advertised: List[str] = []
+        self._rejected = False
+
+    @property
+    def encoding(self) -> Optional[str]:
+        if self._rejected:
+            return None
+        return choose_encoding(self.mode, self._advertised)
+
+    def observe(self, response: httpx.Response) -> None:
+        advertised = parse_accept_encoding(response.headers.get("Accept-Encoding"))
+        if advertised:
+            self._advertised = advertised
+
+    def reject(self) -> None:
+        """Disable compression after the server refused an encoded body."""
+        self._rejected = True
+
+    def encode_json(self, body: bytes) -> Tuple[bytes, Dict[str, str]]:
+        """Return ``(content, headers)`` for a JSON request body."""
+        headers = {"Content-Type": "application/json"}
+        encoding = self.encoding
+        if encoding and len(body) >= MIN_COMPRESS_BYTES:
+            body = compress_bytes(body, encoding)
+            headers["Content-Encoding"] = encoding
+        return body, headers
@@ -2,9 +2,12 @@
 Configuration loader for experiments.
 """
 
+import hashlib
+import json
+import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import yaml
 from pydantic import ValidationError
@@ -17,26 +20,76 @@ from .config_schema import (
     is_legacy_config,
 )
 from .constants import CONFIG_DIRECTORY_NAME
+from .input_loader import (
+    file_fingerprint,
+    open_input_source,
+    resolve_cache_dir,
+    resolve_inputs_path,
+)
 
 # Add shared schemas to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared"))
 
 from fluxloop.schemas import ExperimentConfig, VariationStrategy
 
+CONFIG_CACHE_VERSION = 2
+
 
 def load_experiment_config(
     config_file: Path,
     *,
     scenario: Optional[str] = None,
     require_inputs_file: bool = True,
+    use_cache: bool = True,
 ) -> ExperimentConfig:
     """
     Load and validate experiment configuration from YAML file.
+
+    Validated configurations are cached under the scenario ``.state/cache``
+    directory and reused while every section file (and the inputs file) is
+    unchanged, skipping YAML parsing and validation.
     """
     resolved_path = resolve_config_path(config_file, scenario)
 
     structure, scenario_root, config_dir = _detect_config_context(resolved_path)
 
+    if structure == "legacy":
+        source_paths = [resolved_path]
+        source_dir = resolved_path.parent
+    else:
+        source_paths = list(iter_section_paths(scenario_root))
+        source_dir = scenario_root
+
+    cache_path: Optional[Path] = None
+    if use_cache:
+        cache_path = _config_cache_path(source_dir, resolved_path, require_inputs_file)
+    if cache_path is not None:
+        cached = _read_config_cache(cache_path, resolved_path, source_paths)
+        if cached is not None:
+            return cached
+
+    config = _load_experiment_config_uncached(
+        resolved_path,
+        structure=structure,
+        scenario_root=scenario_root,
+        config_dir=config_dir,
+        require_inputs_file=require_inputs_file,
+    )
+
+    if cache_path is not None:
+        _write_config_cache(cache_path, resolved_path, source_paths, config)
+
+    return config
+
+
+def _load_experiment_config_uncached(
+    resolved_path: Path,
+    *,
+    structure: str,
+    scenario_root: Path,
+    config_dir: Path,
+    require_inputs_file: bool,
+) -> ExperimentConfig:
     if structure == "legacy":
         if not resolved_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {resolved_path}")
@@ -133,9 +186,8 @@ def _resolve_input_count(
 ) -> int:
     """Determine the effective number of inputs for this configuration."""
     if config.inputs_file:
-        inputs_path = (config.get_source_dir() / Path(config.inputs_file)
-                       if config.get_source_dir() and not Path(config.inputs_file).is_absolute()
-                       else Path(config.inputs_file)).resolve()
+        source = open_input_source(config.inputs_file, config.get_source_dir())
+        inputs_path = source.path
 
         if not inputs_path.exists():
             if require_inputs_file:
@@ -144,31 +196,19 @@ def _resolve_input_count(
                 )
             return len(config.base_inputs)
 
-        with open(inputs_path, "r", encoding="utf-8") as f:
-            payload = yaml.safe_load(f)
-
-        if not payload:
+        try:
+            count = source.count()
+        except ValueError:
             if require_inputs_file:
-                raise ValueError(f"Inputs file is empty: {inputs_path}")
+                raise
             return len(config.base_inputs)
 
-        if isinstance(payload, dict):
-            entries = payload.get("inputs")
-            if entries is None:
-                if require_inputs_file:
-                    raise ValueError("Inputs file must contain an 'inputs' list when using mapping format")
-                return len(config.base_inputs)
-        elif isinstance(payload, list):
-            entries = payload
-        else:
-            raise ValueError("Inputs file must be either a list or a mapping with an 'inputs' key")
-
-        if not isinstance(entries, list):
+        if not count:
             if require_inputs_file:
-                raise ValueError("Inputs entries must be provided as a list")
+                raise ValueError(f"Inputs file is empty: {inputs_path}")
             return len(config.base_inputs)
 
-        return len(entries)
+        return count
 
     # No external file – rely on base_inputs multiplied by variation count
     base_count = len(config.base_inputs)
@@ -225,6 +265,120 @@ def merge_config_overrides(
     return ExperimentConfig(**data)
 
 
+def _config_cache_path(
+    source_dir: Path,
+    resolved_path: Path,
+    require_inputs_file: bool,
+) -> Optional[Path]:
+    cache_dir = resolve_cache_dir(source_dir)
+    if cache_dir is None:
+        return None
+    key = hashlib.sha1(f"{resolved_path}|{require_inputs_file}".encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"config-{key}.json"
+
+
+def _path_fingerprint(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return file_fingerprint(path)
+    except OSError:
+        return None
+
+
+def _config_cache_key(
+    resolved_path: Path,
+    source_paths: List[Path],
+    inputs_path: Optional[Path],
+) -> Dict[str, Any]:
+    from . import __version__ as cli_version
+
+    schema_module = sys.modules[ExperimentConfig.__module__]
+    return {
+        "version": CONFIG_CACHE_VERSION,
+        "cli_version": cli_version,
+        "schema": _path_fingerprint(Path(schema_module.__file__ or "")),
+        "config_path": str(resolved_path),
+        "sections": [(str(path), _path_fingerprint(path)) for path in source_paths],
+        "inputs": (
+            (str(inputs_path), _path_fingerprint(inputs_path)) if inputs_path else None
+        ),
+    }
+
+
+def _read_config_cache(
+    cache_path: Path,
+    resolved_path: Path,
+    source_paths: List[Path],
+) -> Optional[ExperimentConfig]:
+    try:
+        payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        stored_key = payload["key"]
+        inputs = stored_key.get("inputs")
+        inputs_path = Path(inputs[0]) if inputs else None
+        if stored_key != _json_round_trip(
+            _config_cache_key(resolved_path, source_paths, inputs_path)
+        ):
+            return None
+        return _config_from_cache(payload["config"])
+    except Exception:
+        return None
+
+
+def _write_config_cache(
+    cache_path: Path,
+    resolved_path: Path,
+    source_paths: List[Path],
+    config: ExperimentConfig,
+) -> None:
+    inputs_path: Optional[Path] = None
+    if config.inputs_file:
+        inputs_path = resolve_inputs_path(config.inputs_file, config.get_source_dir())
+
+    try:
+        cached_config = _config_to_cache(config)
+        # Values JSON cannot represent faithfully (e.g. dates inside base_inputs)
+        # would come back changed, so such configurations are not cached.
+        if _config_from_cache(_json_round_trip(cached_config)) != config:
+            return
+        payload = {
+            "key": _config_cache_key(resolved_path, source_paths, inputs_path),
+            "config": cached_config,
+        }
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        tmp_path.replace(cache_path)
+    except Exception:
+        # Caching is best-effort; a read-only workspace simply loads uncached.
+        return
+
+
+def _config_to_cache(config: ExperimentConfig) -> Dict[str, Any]:
+    # Dumping only explicitly set fields lets model_validate rebuild the same
+    # model_fields_set on every nested model.
+    source_dir = config.get_source_dir()
+    return {
+        "data": config.model_dump(mode="json", exclude_unset=True),
+        "source_dir": str(source_dir) if source_dir is not None else None,
+        "resolved_input_count": config.get_resolved_input_count(),
+        "resolved_persona_count": config.get_resolved_persona_count(),
+    }
+
+
+def _config_from_cache(cached: Dict[str, Any]) -> ExperimentConfig:
+    config = ExperimentConfig.model_validate(cached["data"])
+    if cached.get("source_dir") is not None:
+        config.set_source_dir(Path(cached["source_dir"]))
+    if cached.get("resolved_input_count") is not None:
+        config.set_resolved_input_count(cached["resolved_input_count"])
+    if cached.get("resolved_persona_count") is not None:
+        config.set_resolved_persona_count(cached["resolved_persona_count"])
+    return config
+
+
+def _json_round_trip(value: Any) -> Any:
+    return json.loads(json.dumps(value))
+
+
 def _load_yaml_mapping(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {}
@@ -16,6 +16,9 @@ SCENARIOS_DIR_NAME = "scenarios"
 # State directory inside each scenario
 STATE_DIR_NAME = ".state"
 
+# Parsed input/config caches (inside .state/)
+CACHE_DIR_NAME = "cache"
+
 # Workspace-level files
 PROJECT_JSON_FILENAME = "project.json"      # Web Project connection
 CONTEXT_JSON_FILENAME = "context.json"      # Current scenario pointer
@@ -2,10 +2,26 @@
 
 from __future__ import annotations
 
+import contextlib
 import datetime as dt
+import io
 import json
+import shutil
+import tempfile
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+from pathlib import Path
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+)
 
 import yaml
 
@@ -20,11 +36,16 @@ from .llm_generator import (
     DEFAULT_USER_PROMPT_TEMPLATE,
     LLMGenerationError,
     generate_llm_inputs,
+    planned_prompt_hashes,
 )
 
 if TYPE_CHECKING:
     from .llm_generator import LLMClient
 
+# Full data rows beyond this size spill from memory to a temporary file.
+_FULL_DATA_SPOOL_BYTES = 8 * 1024 * 1024
+_SECTION_SPOOL_BYTES = 1024 * 1024
+
 
 @dataclass
 class GenerationSettings:
@@ -37,6 +58,8 @@ class GenerationSettings:
     use_cache: bool = True
     llm_api_key_override: Optional[str] = None
     llm_client: Optional["LLMClient"] = None
+    progress_path: Optional[Path] = None
+    resume: bool = True
 
 
 @dataclass
@@ -47,14 +70,171 @@ class GeneratedInput:
     metadata: Dict[str, object] = field(default_factory=dict)
 
 
+PROGRESS_FILE_SUFFIX = ".partial.jsonl"
+
+
+def progress_path_for(output_path: Path) -> Path:
+    """Return the append-only progress file used while generating ``output_path``."""
+
+    return output_path.with_name(output_path.name + PROGRESS_FILE_SUFFIX)
+
+
+class GenerationProgressWriter:
+    """Append-only JSONL log of generated inputs, keyed on prompt hash for resume."""
+
+    def __init__(self, path: Path, prompt_hashes: Optional[Set[str]] = None) -> None:
+        self.path = path
+        # When set, entries for other prompts (left by a run with different
+        # personas, strategies or limit) are ignored.
+        self.prompt_hashes = prompt_hashes
+
+    def reset(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("", encoding="utf-8")
+
+    def completed_prompt_hashes(self) -> Set[str]:
+        hashes: Set[str] = set()
+        for entry in self.iter_entries():
+            prompt_hash = entry.metadata.get("prompt_hash")
+            if isinstance(prompt_hash, str):
+                hashes.add(prompt_hash)
+        return hashes
+
+    def append(self, item: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        needs_newline = self.path.exists() and not _ends_with_newline(self.path)
+        line = json.dumps(
+            {"input": item["input"], "metadata": item.get("metadata", {})},
+            ensure_ascii=False,
+        )
+        with self.path.open("a", encoding="utf-8") as handle:
+            if needs_newline:
+                handle.write("\n")
+            handle.write(line + "\n")
+            handle.flush()
+
+    def iter_entries(self) -> Iterator[GeneratedInput]:
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted run; the prompt is regenerated.
+                    continue
+                if not isinstance(record, dict) or "input" not in record:
+                    continue
+                metadata = record.get("metadata") or {}
+                if (
+                    self.prompt_hashes is not None
+                    and metadata.get("prompt_hash") not in self.prompt_hashes
+                ):
+                    continue
+                yield GeneratedInput(input=record["input"], metadata=metadata)
+
+    def count(self) -> int:
+        return sum(1 for _ in self.iter_entries())
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as handle:
+        handle.seek(0, io.SEEK_END)
+        if handle.tell() == 0:
+            return True
+        handle.seek(-1, io.SEEK_END)
+        return handle.read(1) == b"\n"
+
+
+def _spool(max_size: int) -> IO[str]:
+    return tempfile.SpooledTemporaryFile(max_size=max_size, mode="w+", encoding="utf-8")
+
+
+@dataclass
+class _SpooledSection:
+    """YAML lines of one persona section, spooled to a temporary file."""
+
+    spool: IO[str]
+    count: int = 0
+
+    def write(self, line: str) -> None:
+        self.spool.write(line)
+        self.count += 1
+
+
 @dataclass
 class GenerationResult:
-    """Container for generation output."""
+    """Container for generation output.
+
+    When ``progress`` is set, entries live in the progress file and are streamed
+    from disk instead of being held in ``entries``.
+    """
 
     entries: List[GeneratedInput]
     metadata: Dict[str, object]
+    progress: Optional[GenerationProgressWriter] = None
+
+    def iter_entries(self) -> Iterator[GeneratedInput]:
+        if self.progress is not None:
+            return self.progress.iter_entries()
+        return iter(self.entries)
+
+    @property
+    def total_entries(self) -> int:
+        if self.progress is not None:
+            return self.progress.count()
+        return len(self.entries)
 
     def to_yaml(self) -> str:
+        buffer = io.StringIO()
+        self._write_yaml(buffer)
+        return buffer.getvalue()
+
+    def write_yaml(self, path: Path) -> None:
+        """Write the YAML document to ``path`` without materializing all entries."""
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            self._write_yaml(handle)
+        tmp_path.replace(path)
+
+    def _write_yaml(self, out: TextIO) -> None:
+        # Single pass over the entries: each persona section and the full data
+        # rows are spooled to temporary files, so no entry is kept in memory.
+        with contextlib.ExitStack() as stack:
+            total = 0
+            persona_sections: Dict[str, _SpooledSection] = {}
+            full_data = stack.enter_context(_spool(_FULL_DATA_SPOOL_BYTES))
+            for entry in self.iter_entries():
+                total += 1
+                persona_key = str(entry.metadata.get("persona") or "generic_user")
+                section = persona_sections.get(persona_key)
+                if section is None:
+                    section = _SpooledSection(stack.enter_context(_spool(_SECTION_SPOOL_BYTES)))
+                    persona_sections[persona_key] = section
+                strategy = entry.metadata.get("strategy")
+                prefix = f"[{strategy}] " if strategy else ""
+                section.write(_dump_yaml([f"{prefix}{entry.input}"]) + "\n")
+                full_data.write(_dump_yaml([_full_data_row(entry)]) + "\n")
+
+            self._write_sections(
+                out,
+                total=total,
+                persona_sections=persona_sections,
+                full_data=full_data,
+            )
+
+    def _write_sections(
+        self,
+        out: TextIO,
+        *,
+        total: int,
+        persona_sections: Dict[str, _SpooledSection],
+        full_data: IO[str],
+    ) -> None:
         timestamp = dt.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
         provider = self.metadata.get("llm_provider") or "unknown"
         model = self.metadata.get("llm_model") or "unknown"
@@ -66,50 +246,52 @@ class GenerationResult:
 
         strategies = self.metadata.get("strategies") or []
         stats = {
-            "total_generated": len(self.entries),
+            "total_generated": total,
             "base_inputs": self.metadata.get("total_base_inputs", 0),
             "personas": self.metadata.get("total_personas", 0),
             "strategies": len(strategies),
         }
 
-        persona_summary: Dict[str, List[str]] = {}
-        for entry in self.entries:
-            persona_key = entry.metadata.get("persona") or "generic_user"
-            if persona_key not in persona_summary:
-                persona_summary[persona_key] = []
-
-            strategy = entry.metadata.get("strategy")
-            prefix = f"[{strategy}] " if strategy else ""
-            persona_summary[persona_key].append(f"{prefix}{entry.input}")
-
-        preferred_meta_order = [
-            "strategy",
-            "base_index",
-            "persona",
-            "persona_description",
-            "prompt_hash",
-        ]
-        excluded_meta_keys = {"prompt", "model", "provider"}
-
-        full_data: List[Dict[str, Any]] = []
-        for entry in self.entries:
-            row: Dict[str, Any] = {}
-            row["input"] = entry.input
-            metadata = entry.metadata or {}
-
-            for key in preferred_meta_order:
-                value = metadata.get(key)
-                if value is not None:
-                    row[key] = value
-
-            for key, value in metadata.items():
-                if key in preferred_meta_order or key in excluded_meta_keys:
-                    continue
-                if value is None:
-                    continue
-                row[key] = value
+        out.write(
+            "\n".join(
+                [
+                    "# ===================================================================",
+                    f"# Generated User Inputs: {timestamp}",
+                    f"# Model: {model_label}",
+                    "# ===================================================================",
+                    "",
+                    _dump_yaml({"stats": stats}),
+                    "",
+                ]
+            )
+        )
 
-            full_data.append(row)
+        for persona_key, section in persona_sections.items():
+            header_label = persona_key.replace("_", " ").upper()
+            out.write(
+                "\n"
+                "# -------------------------------------------------------------------\n"
+                f"# {header_label} ({section.count} inputs)\n"
+                "# -------------------------------------------------------------------\n"
+                "\n"
+                f"{_dump_yaml({persona_key: None})[: -len(' null')]}\n"
+            )
+            section.spool.seek(0)
+            shutil.copyfileobj(section.spool, out)
+
+        out.write(
+            "\n"
+            "# ===================================================================\n"
+            "# FULL DATA\n"
+            "# ===================================================================\n"
+            "\n"
+        )
+        if total:
+            out.write("inputs:\n")
+            full_data.seek(0)
+            shutil.copyfileobj(full_data, out)
+        else:
+            out.write(_dump_yaml({"inputs": []}) + "\n")
 
         generation_config = {
             "config_name": self.metadata.get("config_name"),
@@ -124,65 +306,16 @@ class GenerationResult:
             key: value for key, value in generation_config.items() if value is not None
         }
 
-        lines: List[str] = [
-            "# ===================================================================",
-            f"# Generated User Inputs: {timestamp}",
-            f"# Model: {model_label}",
-            "# ===================================================================",
-            "",
-            yaml.safe_dump(
-                {"stats": stats},
-                sort_keys=False,
-                allow_unicode=True,
-            ).strip(),
-            "",
-        ]
-
-        for persona_key, summary_items in persona_summary.items():
-            header_label = persona_key.replace("_", " ").upper()
-            lines.extend(
-                [
-                    "# -------------------------------------------------------------------",
-                    f"# {header_label} ({len(summary_items)} inputs)",
-                    "# -------------------------------------------------------------------",
-                    "",
-                    yaml.safe_dump(
-                        {persona_key: summary_items},
-                        sort_keys=False,
-                        allow_unicode=True,
-                    ).strip(),
-                    "",
-                ]
-            )
-
-        lines.extend(
-            [
-                "# ===================================================================",
-                "# FULL DATA",
-                "# ===================================================================",
-                "",
-                yaml.safe_dump(
-                    {"inputs": full_data},
-                    sort_keys=False,
-                    allow_unicode=True,
-                ).strip(),
-                "",
-                "# -------------------------------------------------------------------",
-                "# COMMON METADATA (applies to all inputs above)",
-                "# -------------------------------------------------------------------",
-                "",
-                yaml.safe_dump(
-                    {"generation_config": generation_config},
-                    sort_keys=False,
-                    allow_unicode=True,
-                ).strip(),
-                "",
-            ]
+        out.write(
+            "\n"
+            "# -------------------------------------------------------------------\n"
+            "# COMMON METADATA (applies to all inputs above)\n"
+            "# -------------------------------------------------------------------\n"
+            "\n"
+            + _dump_yaml({"generation_config": generation_config})
+            + "\n"
         )
 
-        content = "\n".join(lines).rstrip()
-        return content + "\n"
-
     def to_json(self) -> str:
         return json.dumps(
             {
@@ -193,13 +326,47 @@ class GenerationResult:
                         "input": entry.input,
                         "metadata": entry.metadata,
                     }
-                    for entry in self.entries
+                    for entry in self.iter_entries()
                 ],
             },
             indent=2,
         )
 
 
+_PREFERRED_META_ORDER = (
+    "strategy",
+    "base_index",
+    "persona",
+    "persona_description",
+    "prompt_hash",
+)
+_EXCLUDED_META_KEYS = {"prompt", "model", "provider"}
+
+
+def _full_data_row(entry: GeneratedInput) -> Dict[str, Any]:
+    row: Dict[str, Any] = {"input": entry.input}
+    metadata = entry.metadata or {}
+
+    for key in _PREFERRED_META_ORDER:
+        value = metadata.get(key)
+        if value is not None:
+            row[key] = value
+
+    for key, value in metadata.items():
+        if key in _PREFERRED_META_ORDER or key in _EXCLUDED_META_KEYS:
+            continue
+        if value is None:
+            continue
+        row[key] = value
+
+    return row
+
+
+def _dump_yaml(data: Any) -> str:
+    dumped: str = yaml.safe_dump(data, sort_keys=False, allow_unicode=True)
+    return dumped.strip()
+
+
 class GenerationError(Exception):
     """Raised when input generation cannot proceed."""
 
@@ -225,11 +392,29 @@ def generate_inputs(
         else:
             strategies = DEFAULT_STRATEGIES
 
+        progress: Optional[GenerationProgressWriter] = None
+        completed: Set[str] = set()
+        if settings.progress_path is not None and not settings.dry_run:
+            progress = GenerationProgressWriter(settings.progress_path)
+            if settings.resume:
+                # Only entries for this run's prompts count as done or are written.
+                try:
+                    progress.prompt_hashes = planned_prompt_hashes(
+                        config=config, strategies=strategies, limit=settings.limit
+                    )
+                except LLMGenerationError as exc:
+                    raise GenerationError(str(exc)) from exc
+                completed = progress.completed_prompt_hashes()
+            else:
+                progress.reset()
+
         try:
             raw_entries = generate_llm_inputs(
                 config=config,
                 strategies=strategies,
                 settings=settings,
+                on_result=progress.append if progress is not None else None,
+                skip_prompt_hashes=completed,
             )
         except LLMGenerationError as exc:
             raise GenerationError(str(exc)) from exc
@@ -254,7 +439,7 @@ def generate_inputs(
             ),
         }
 
-        return GenerationResult(entries=entries, metadata=metadata)
+        return GenerationResult(entries=entries, metadata=metadata, progress=progress)
 
     raise GenerationError(
         "Only LLM-based generation is supported. Set input_generation.mode to 'llm'"
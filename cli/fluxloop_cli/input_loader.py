@@ -0,0 +1,257 @@
+"""
+Lazy loading of experiment input files.
+
+Supported formats:
+- ``.jsonl``: one input entry per line
+- YAML: a single document (list of entries or mapping with ``inputs``) or a
+  multi-document stream where each document is an entry or a list of entries
+
+Parsed YAML entries are cached as JSON lines under the scenario
+``.state/cache`` directory and reused while the source file is unchanged.
+Files with entries JSON cannot round-trip (e.g. YAML dates) are not cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import yaml
+
+from .constants import CACHE_DIR_NAME, CONFIG_DIRECTORY_NAME, STATE_DIR_NAME
+
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+INPUTS_CACHE_VERSION = 2
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def resolve_inputs_path(inputs_file: str, source_dir: Optional[Path]) -> Path:
+    """Resolve an inputs file relative to the configuration source directory."""
+    raw_path = Path(inputs_file)
+    if source_dir and not raw_path.is_absolute():
+        return (source_dir / raw_path).resolve()
+    return raw_path.resolve()
+
+
+def resolve_cache_dir(source_dir: Optional[Path]) -> Optional[Path]:
+    """Return the scenario cache directory, or None outside a scenario."""
+    if source_dir is None:
+        return None
+    if (source_dir / STATE_DIR_NAME).is_dir() or (source_dir / CONFIG_DIRECTORY_NAME).is_dir():
+        return source_dir / STATE_DIR_NAME / CACHE_DIR_NAME
+    return None
+
+
+def file_fingerprint(path: Path) -> Dict[str, Any]:
+    """Return mtime, size and content hash for cache validation."""
+    stat = path.stat()
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest.hexdigest(),
+    }
+
+
+class InputSource:
+    """Re-iterable, lazily parsed view over an inputs file.
+
+    Each iteration streams entries from disk again, so large input sets are never
+    held in memory as a whole.
+    """
+
+    def __init__(self, path: Path, *, cache_dir: Optional[Path] = None) -> None:
+        self.path = path
+        self.cache_dir = cache_dir
+        self._count: Optional[int] = None
+        self._validated_stat: Optional[Tuple[int, int]] = None
+
+    @property
+    def is_jsonl(self) -> bool:
+        return self.path.suffix.lower() in JSONL_SUFFIXES
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield normalized variations, validating each entry."""
+        for index, item in enumerate(self.iter_raw()):
+            if not isinstance(item, dict):
+                raise ValueError(
+                    f"Input entry at index {index} must be a mapping, got {type(item).__name__}"
+                )
+
+            input_value = item.get("input")
+            if not input_value:
+                raise ValueError(f"Input entry at index {index} is missing required 'input' field")
+
+            yield {
+                "input": input_value,
+                "metadata": item.get("metadata", item),
+                "source": "external_file",
+                "source_index": index,
+            }
+
+    def count(self) -> int:
+        """Return the number of raw entries (computed once per source)."""
+        if self._count is None:
+            self._count = sum(1 for _ in self.iter_raw())
+        return self._count
+
+    def validate(self) -> int:
+        """Check every entry up front and return the number of variations."""
+        if not self.path.exists():
+            raise FileNotFoundError(f"Inputs file not found: {self.path}")
+        if self.path.stat().st_size == 0:
+            raise ValueError(f"Inputs file is empty: {self.path}")
+
+        total = sum(1 for _ in self)
+        if not total:
+            raise ValueError(f"Inputs file {self.path} did not contain any inputs")
+        self._count = total
+        return total
+
+    def iter_raw(self) -> Iterator[Any]:
+        """Yield raw entries without validation."""
+        if self.is_jsonl:
+            yield from self._iter_jsonl()
+            return
+
+        cache = self._cache_paths()
+        if cache is None:
+            yield from self._iter_yaml()
+            return
+
+        data_path, meta_path = cache
+        if self._is_cache_valid(meta_path) and data_path.exists():
+            yield from _iter_jsonl_cache(data_path)
+            return
+
+        yield from self._iter_yaml_and_cache(data_path, meta_path)
+
+    # ------------------------------------------------------------------
+    # Parsing
+    # ------------------------------------------------------------------
+
+    def _iter_jsonl(self) -> Iterator[Any]:
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(
+                        f"Invalid JSON on line {line_number} of {self.path}: {exc}"
+                    ) from exc
+
+    def _iter_yaml(self) -> Iterator[Any]:
+        with self.path.open("r", encoding="utf-8") as handle:
+            for document in yaml.load_all(handle, Loader=_YAML_LOADER):
+                if document is None:
+                    continue
+                if isinstance(document, dict) and "inputs" in document:
+                    entries = document["inputs"] or []
+                elif isinstance(document, list):
+                    entries = document
+                elif isinstance(document, dict) and "input" in document:
+                    entries = [document]
+                else:
+                    raise ValueError(
+                        "Inputs file must be a list of inputs or a mapping containing an "
+                        "'inputs' list"
+                    )
+                if not isinstance(entries, list):
+                    raise ValueError("Inputs entries must be provided as a list")
+                yield from entries
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cache_paths(self) -> Optional[Tuple[Path, Path]]:
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha1(str(self.path).encode("utf-8")).hexdigest()[:16]
+        stem = f"inputs-{self.path.stem}-{key}"
+        return self.cache_dir / f"{stem}.jsonl", self.cache_dir / f"{stem}.json"
+
+    def _is_cache_valid(self, meta_path: Path) -> bool:
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+
+        if meta.get("version") != INPUTS_CACHE_VERSION:
+            return False
+
+        stat = self.path.stat()
+        if meta.get("mtime_ns") != stat.st_mtime_ns or meta.get("size") != stat.st_size:
+            return False
+
+        # Hash once per source; later passes only re-check mtime and size.
+        if self._validated_stat != (stat.st_mtime_ns, stat.st_size):
+            if meta.get("sha256") != file_fingerprint(self.path)["sha256"]:
+                return False
+            self._validated_stat = (stat.st_mtime_ns, stat.st_size)
+
+        self._count = meta.get("count")
+        return True
+
+    def _iter_yaml_and_cache(self, data_path: Path, meta_path: Path) -> Iterator[Any]:
+        fingerprint = file_fingerprint(self.path)
+        try:
+            data_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = data_path.with_name(f"{data_path.name}.{os.getpid()}.tmp")
+            handle = tmp_path.open("w", encoding="utf-8")
+        except OSError:
+            yield from self._iter_yaml()
+            return
+
+        count = 0
+        completed = False
+        cacheable = True
+        try:
+            for entry in self._iter_yaml():
+                if cacheable:
+                    try:
+                        line = json.dumps(entry, ensure_ascii=False, allow_nan=False)
+                    except (TypeError, ValueError):
+                        line = None
+                    # Non-string keys would silently change type, so require a round trip.
+                    if line is not None and json.loads(line) == entry:
+                        handle.write(line + "\n")
+                    else:
+                        cacheable = False
+                count += 1
+                yield entry
+            completed = cacheable
+        finally:
+            handle.close()
+            if completed:
+                meta_path.unlink(missing_ok=True)
+                tmp_path.replace(data_path)
+                meta = {"version": INPUTS_CACHE_VERSION, "count": count, **fingerprint}
+                meta_path.write_text(json.dumps(meta), encoding="utf-8")
+                self._count = count
+            else:
+                tmp_path.unlink(missing_ok=True)
+
+
+def _iter_jsonl_cache(path: Path) -> Iterator[Any]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            yield json.loads(line)
+
+
+def open_input_source(inputs_file: str, source_dir: Optional[Path]) -> InputSource:
+    """Create an :class:`InputSource` for a configured inputs file."""
+    return InputSource(
+        resolve_inputs_path(inputs_file, source_dir),
+        cache_dir=resolve_cache_dir(source_dir),
+    )
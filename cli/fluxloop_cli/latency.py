@@ -0,0 +1,222 @@
+"""
+Streaming latency quantiles for experiment summaries.
+
+:class:`LatencySketch` is a DDSketch-style quantile sketch: values are counted
+in logarithmic buckets so any quantile is reported within a fixed relative
+error, memory stays bounded regardless of the number of samples, and sketches
+from separate runs can be merged exactly. :class:`LatencyStats` keeps one
+sketch per metric, broken down by persona and input.
+
+Inputs are keyed by :func:`input_key`, a short hash of the input text, and at
+most ``max_inputs`` inputs get their own sketch; the rest share the
+``OVERFLOW_INPUT_KEY`` bucket.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+
+# Values at or below this (milliseconds) are counted as zero.
+MIN_INDEXABLE_VALUE = 1e-3
+
+SUMMARY_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+DEFAULT_MAX_INPUTS = 1000
+OVERFLOW_INPUT_KEY = "_other"
+
+
+def input_key(value: Any) -> Optional[str]:
+    """Return a stable 12-character id for an input (None for empty inputs)."""
+    if value is None or value == "":
+        return None
+    text = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+class LatencySketch:
+    """Mergeable quantile sketch with bounded relative error."""
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_bins: int = DEFAULT_MAX_BINS,
+    ) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max(1, max_bins)
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        if value is None or math.isnan(value):
+            return
+        value = max(0.0, float(value))
+        if value <= MIN_INDEXABLE_VALUE:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + 1
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencySketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the value at quantile ``q`` (0..1), or None when empty."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                # Bucket midpoint keeps the estimate within relative_accuracy.
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def _collapse(self) -> None:
+        # Fold the lowest buckets together, keeping accuracy for the tail.
+        indexes = sorted(self.bins)
+        overflow = len(indexes) - self.max_bins
+        target = indexes[overflow]
+        for index in indexes[:overflow]:
+            self.bins[target] += self.bins.pop(index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "ddsketch",
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zero_count": self.zero_count,
+            "bins": {str(index): count for index, count in sorted(self.bins.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "LatencySketch":
+        sketch = cls(
+            relative_accuracy=float(payload.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY))
+        )
+        bins = payload.get("bins") or {}
+        sketch.bins = {int(index): int(count) for index, count in bins.items()}
+        sketch.zero_count = int(payload.get("zero_count", 0))
+        sketch.count = int(payload.get("count", 0))
+        sketch.sum = float(payload.get("sum", 0.0))
+        if sketch.count:
+            sketch.min = float(payload["min"])
+            sketch.max = float(payload["max"])
+        return sketch
+
+    def summary(self, quantiles: Iterable[float] = SUMMARY_QUANTILES) -> Dict[str, Any]:
+        """Return count, mean, min/max and percentiles (``p50``...) for reporting."""
+        result: Dict[str, Any] = {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = self.quantile(q)
+        return result
+
+
+class LatencyStats:
+    """Latency sketches per metric, overall and broken down by persona/input."""
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_inputs: int = DEFAULT_MAX_INPUTS,
+    ) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.max_inputs = max(0, max_inputs)
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+
+    def record(
+        self,
+        metric: str,
+        value_ms: Optional[float],
+        *,
+        persona: Optional[str] = None,
+        input_key: Optional[str] = None,
+    ) -> None:
+        if value_ms is None:
+            return
+        entry = self._metrics.setdefault(
+            metric,
+            {"overall": self._new(), "by_persona": {}, "by_input": {}},
+        )
+        entry["overall"].add(value_ms)
+        if persona:
+            entry["by_persona"].setdefault(persona, self._new()).add(value_ms)
+        if input_key:
+            by_input = entry["by_input"]
+            if input_key not in by_input and len(by_input) >= self.max_inputs:
+                input_key = OVERFLOW_INPUT_KEY
+            by_input.setdefault(input_key, self._new()).add(value_ms)
+
+    def sketch(self, metric: str) -> Optional[LatencySketch]:
+        entry = self._metrics.get(metric)
+        return entry["overall"] if entry else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Percentiles plus serialized sketches, suitable for ``summary.json``."""
+        return {
+            metric: {
+                **entry["overall"].summary(),
+                "sketch": entry["overall"].to_dict(),
+                "by_persona": {
+                    name: {**sketch.summary(), "sketch": sketch.to_dict()}
+                    for name, sketch in entry["by_persona"].items()
+                },
+                "by_input": {
+                    name: {**sketch.summary(), "sketch": sketch.to_dict()}
+                    for name, sketch in entry["by_input"].items()
+                },
+            }
+            for metric, entry in self._metrics.items()
+        }
+
+    def _new(self) -> LatencySketch:
+        return LatencySketch(relative_accuracy=self.relative_accuracy)
@@ -0,0 +1,80 @@
+"""
+Typer group that imports subcommand modules only when they are invoked.
+
+Command modules pull in httpx, yaml, pydantic schemas, the runner and the
+FluxLoop SDK. Registering them lazily keeps `fluxloop --help` and lightweight
+commands from paying for imports they never use.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import typer
+from typer.core import TyperGroup
+
+if TYPE_CHECKING:
+    # Annotations only: recent Typer releases vendor click instead of depending on it.
+    import click
+
+
+class _LazySubcommandPlaceholder(TyperGroup):
+    """Stand-in used for help listings; never invoked directly."""
+
+
+class LazyTyperGroup(TyperGroup):
+    """Top-level group resolving ``lazy_subcommands`` on first use.
+
+    ``lazy_subcommands`` maps a command name to ``(module_path, help)`` where the
+    module exposes a ``typer.Typer`` instance named ``app``. Help output uses the
+    registered help text and does not import the module.
+    """
+
+    lazy_subcommands: Dict[str, Tuple[str, str]] = {}
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._loaded: Dict[str, click.Command] = {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        names = list(super().list_commands(ctx))
+        names.extend(name for name in self.lazy_subcommands if name not in names)
+        return names
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        command = super().get_command(ctx, cmd_name)
+        if command is not None:
+            return command
+        if cmd_name in self._loaded:
+            return self._loaded[cmd_name]
+        if cmd_name not in self.lazy_subcommands:
+            return None
+        _, help_text = self.lazy_subcommands[cmd_name]
+        return _LazySubcommandPlaceholder(name=cmd_name, help=help_text)
+
+    def resolve_command(
+        self, ctx: click.Context, args: List[str]
+    ) -> Tuple[Optional[str], Optional[click.Command], List[str]]:
+        cmd_name, command, remaining = super().resolve_command(ctx, args)
+        if cmd_name is not None and isinstance(command, _LazySubcommandPlaceholder):
+            command = self.load_command(cmd_name)
+        return cmd_name, command, remaining
+
+    def load_command(self, cmd_name: str) -> click.Command:
+        """Import the module behind ``cmd_name`` and build its click group."""
+        if cmd_name in self._loaded:
+            return self._loaded[cmd_name]
+
+        module_path, help_text = self.lazy_subcommands[cmd_name]
+        module = importlib.import_module(module_path)
+
+        # Mirror `app.add_typer(module.app, name=..., help=...)` so single-command
+        # Typer apps still behave as groups (e.g. `fluxloop generate inputs`).
+        wrapper = typer.Typer(rich_markup_mode=getattr(self, "rich_markup_mode", "rich"))
+        wrapper.add_typer(module.app, name=cmd_name, help=help_text)
+        group = typer.main.get_command(wrapper)
+        command = group.commands[cmd_name]  # type: ignore[attr-defined]
+
+        self._loaded[cmd_name] = command
+        return command
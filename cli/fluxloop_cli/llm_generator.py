@@ -8,7 +8,19 @@ import inspect
 import json
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 import httpx
 from rich.console import Console
@@ -59,6 +71,23 @@ Your task is to generate a single, realistic user message that a person would ty
 
 Generated User Message:"""
 
+BATCH_PROMPT_TEMPLATE = (
+    "You will receive {count} independent generation tasks. Complete each task on its own, "
+    "exactly as if it were the only one.\n\n"
+    'Respond with a JSON object of the form {{"outputs": ["...", "..."]}} where "outputs" '
+    "contains exactly {count} strings, in task order. Each string must ONLY be the generated "
+    "user message text for that task.\n\n"
+    "{tasks}"
+)
+
+# Sampling parameters forwarded to the provider when set explicitly in configuration.
+SAMPLING_PARAMETERS: Sequence[str] = (
+    "temperature",
+    "top_p",
+    "frequency_penalty",
+    "presence_penalty",
+)
+
 
 class LLMGenerationError(RuntimeError):
     """Raised when LLM-backed generation fails."""
@@ -102,23 +131,38 @@ def _hash_prompt(prompt: str) -> str:
     return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
 
 
-async def _generate_one_variation_openai(
-    client: httpx.AsyncClient,
-    llm_config: LLMGeneratorConfig,
-    prompt_text: str,
-    metadata: Dict[str, Any],
-) -> Dict[str, Any]:
-    """Generate a single input variation via OpenAI API."""
+def _build_messages(llm_config: LLMGeneratorConfig, prompt_text: str) -> List[Dict[str, str]]:
     messages: List[Dict[str, str]] = []
     if llm_config.system_prompt:
         messages.append({"role": "system", "content": llm_config.system_prompt})
     messages.append({"role": "user", "content": prompt_text})
+    return messages
+
 
-    payload = {
+def _build_openai_payload(
+    llm_config: LLMGeneratorConfig,
+    messages: List[Dict[str, str]],
+    *,
+    output_count: int = 1,
+) -> Dict[str, Any]:
+    """Build a chat completion payload honoring explicitly configured sampling options.
+
+    Only parameters present in the user's configuration are forwarded so provider
+    defaults (and models that reject custom sampling values) keep working.
+    """
+
+    payload: Dict[str, Any] = {
         "model": llm_config.model,
         "messages": messages,
     }
 
+    configured = llm_config.model_fields_set
+    for name in SAMPLING_PARAMETERS:
+        if name in configured:
+            payload[name] = getattr(llm_config, name)
+    if "max_tokens" in configured:
+        payload["max_completion_tokens"] = llm_config.max_tokens * output_count
+
     # Add GPT-5 specific controls if they exist on the config object
     # if hasattr(llm_config, "reasoning_effort") and llm_config.reasoning_effort:
     #     payload["reasoning"] = {"effort": llm_config.reasoning_effort}
@@ -126,9 +170,11 @@ async def _generate_one_variation_openai(
     # if hasattr(llm_config, "text_verbosity") and llm_config.text_verbosity:
     #     payload["text"] = {"verbosity": llm_config.text_verbosity}
 
-    response = await _request_openai(client, config=llm_config, payload=payload)
+    return payload
+
 
-    text = None
+def _extract_openai_content(response: Dict[str, Any]) -> str:
+    text: Optional[str] = None
     if "choices" in response:
         choices = response.get("choices", [])
         if choices:
@@ -141,6 +187,15 @@ async def _generate_one_variation_openai(
             f"OpenAI response did not contain content. Full response:\n{error_details}"
         )
 
+    return text
+
+
+def _build_variation(
+    llm_config: LLMGeneratorConfig,
+    text: str,
+    prompt_text: str,
+    metadata: Dict[str, Any],
+) -> Dict[str, Any]:
     return {
         "input": text.strip(),
         "metadata": {
@@ -153,6 +208,87 @@ async def _generate_one_variation_openai(
     }
 
 
+async def _generate_one_variation_openai(
+    client: httpx.AsyncClient,
+    llm_config: LLMGeneratorConfig,
+    prompt_text: str,
+    metadata: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Generate a single input variation via OpenAI API."""
+    payload = _build_openai_payload(llm_config, _build_messages(llm_config, prompt_text))
+    response = await _request_openai(client, config=llm_config, payload=payload)
+    text = _extract_openai_content(response)
+    return _build_variation(llm_config, text, prompt_text, metadata)
+
+
+def _format_batch_prompt(prompts: Sequence[Tuple[str, Dict[str, Any]]]) -> str:
+    tasks = "\n\n".join(
+        f"### Task {index}\n{prompt_text}"
+        for index, (prompt_text, _) in enumerate(prompts, start=1)
+    )
+    return BATCH_PROMPT_TEMPLATE.format(count=len(prompts), tasks=tasks)
+
+
+def _parse_batch_outputs(text: str, expected: int) -> List[str]:
+    try:
+        parsed = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise LLMGenerationError(f"Batched response was not valid JSON: {exc}") from exc
+
+    outputs = parsed.get("outputs") if isinstance(parsed, dict) else parsed
+    if not isinstance(outputs, list) or len(outputs) != expected:
+        raise LLMGenerationError(
+            f"Batched response returned {len(outputs) if isinstance(outputs, list) else 0} "
+            f"outputs, expected {expected}"
+        )
+    if not all(isinstance(item, str) and item.strip() for item in outputs):
+        raise LLMGenerationError("Batched response contained empty or non-text outputs")
+    return outputs
+
+
+async def _generate_variation_batch_openai(
+    client: httpx.AsyncClient,
+    llm_config: LLMGeneratorConfig,
+    prompts: Sequence[Tuple[str, Dict[str, Any]]],
+) -> List[Dict[str, Any]]:
+    """Generate one variation per prompt with a single JSON-array request.
+
+    Falls back to one request per prompt when the batched request fails (HTTP
+    error status, timeout or transport error) or its response cannot be mapped
+    back onto the prompts.
+    """
+    if len(prompts) == 1:
+        prompt_text, metadata = prompts[0]
+        return [await _generate_one_variation_openai(client, llm_config, prompt_text, metadata)]
+
+    payload = _build_openai_payload(
+        llm_config,
+        _build_messages(llm_config, _format_batch_prompt(prompts)),
+        output_count=len(prompts),
+    )
+    payload["response_format"] = {"type": "json_object"}
+
+    try:
+        response = await _request_openai(client, config=llm_config, payload=payload)
+        outputs = _parse_batch_outputs(_extract_openai_content(response), len(prompts))
+    except (LLMGenerationError, httpx.HTTPError) as exc:
+        logger.warning(f"Batched generation failed, retrying prompts individually: {exc}")
+        results: List[Dict[str, Any]] = []
+        for prompt_text, metadata in prompts:
+            try:
+                results.append(
+                    await _generate_one_variation_openai(client, llm_config, prompt_text, metadata)
+                )
+            except LLMGenerationError as item_exc:
+                logger.warning(f"Failed to generate one variation: {item_exc}")
+        return results
+
+    return [
+        _build_variation(llm_config, text, prompt_text, metadata)
+        for text, (prompt_text, metadata) in zip(outputs, prompts)
+    ]
+
+
 async def _request_openai(
     client: httpx.AsyncClient,
     *,
@@ -179,7 +315,10 @@ async def _request_openai(
             f"OpenAI API error {response.status_code}: {response.text}"
         )
 
-    return response.json()
+    try:
+        return response.json()
+    except ValueError as exc:
+        raise LLMGenerationError(f"OpenAI response was not valid JSON: {exc}") from exc
 
 
 async def _generate_variations_openai(
@@ -190,23 +329,31 @@ async def _generate_variations_openai(
     prompts: Sequence[Tuple[str, Dict[str, Any]]],
     progress: Progress,
     task_id: Any,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> List[Dict[str, Any]]:
-    tasks = [
-        _generate_one_variation_openai(client, llm_config, prompt_text, metadata)
-        for prompt_text, metadata in prompts
-    ]
+    batch_size = llm_config.batch_size
+    batches = [prompts[start : start + batch_size] for start in range(0, len(prompts), batch_size)]
 
-    results: List[Dict[str, Any]] = []
-    for future in asyncio.as_completed(tasks):
+    async def _run_batch(
+        batch: Sequence[Tuple[str, Dict[str, Any]]],
+    ) -> Tuple[int, List[Dict[str, Any]]]:
         try:
-            result = await future
-            results.append(result)
+            return len(batch), await _generate_variation_batch_openai(client, llm_config, batch)
         except LLMGenerationError as exc:
-            logger.warning(f"Failed to generate one variation: {exc}")
+            logger.warning(f"Failed to generate {len(batch)} variation(s): {exc}")
         except Exception as exc:
             logger.error(f"An unexpected error occurred during generation: {exc}")
-        finally:
-            progress.update(task_id, advance=1)
+        return len(batch), []
+
+    results: List[Dict[str, Any]] = []
+    for future in asyncio.as_completed([_run_batch(batch) for batch in batches]):
+        attempted, batch_results = await future
+        if on_result is not None:
+            for item in batch_results:
+                on_result(item)
+        else:
+            results.extend(batch_results)
+        progress.update(task_id, advance=attempted)
 
     return results
 
@@ -218,28 +365,19 @@ async def _generate_variations_mock(
     prompts: Sequence[Tuple[str, Dict[str, Any]]],
     progress: Progress,
     task_id: Any,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> List[Dict[str, Any]]:
-    if llm_config.provider == "mock":
-        results = await _generate_variations_mock(
-            config=config,
-            llm_config=llm_config,
-            prompts=prompts,
-        )
-        progress.update(task_id, completed=len(prompts))
-        return results
-
-    if llm_config.provider == "openai":
-        async with httpx.AsyncClient() as client:
-            return await _generate_variations_openai(
-                client=client,
-                config=config,
-                llm_config=llm_config,
-                prompts=prompts,
-                progress=progress,
-                task_id=task_id,
-            )
-
-    raise LLMGenerationError(f"Unsupported LLM provider: {llm_config.provider}")
+    """Produce deterministic variations without calling a provider."""
+    results: List[Dict[str, Any]] = []
+    for index, (prompt_text, metadata) in enumerate(prompts):
+        text = f"[mock {metadata.get('strategy')}] variation {index + 1}"
+        variation = _build_variation(llm_config, text, prompt_text, metadata)
+        if on_result is not None:
+            on_result(variation)
+        else:
+            results.append(variation)
+        progress.update(task_id, advance=1)
+    return results
 
 
 def _format_prompt(
@@ -281,6 +419,7 @@ async def _generate_with_client(
     prompts: Sequence[Tuple[str, Dict[str, Any]]],
     progress: Progress,
     task_id: Any,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> List[Dict[str, Any]]:
     if llm_config.provider == "mock":
         return await _generate_variations_mock(
@@ -289,6 +428,7 @@ async def _generate_with_client(
             prompts=prompts,
             progress=progress,
             task_id=task_id,
+            on_result=on_result,
         )
 
     if llm_config.provider == "openai":
@@ -300,6 +440,7 @@ async def _generate_with_client(
                 prompts=prompts,
                 progress=progress,
                 task_id=task_id,
+                on_result=on_result,
             )
 
     raise LLMGenerationError(f"Unsupported LLM provider: {llm_config.provider}")
@@ -335,13 +476,31 @@ def _collect_prompts(
     return prompts
 
 
+def planned_prompt_hashes(
+    *,
+    config: ExperimentConfig,
+    strategies: Sequence[VariationStrategy],
+    limit: Optional[int],
+) -> Set[str]:
+    """Return the prompt hashes a generation run with these options would request."""
+    prompts = _collect_prompts(config=config, strategies=strategies, limit=limit)
+    return {_hash_prompt(prompt_text) for prompt_text, _ in prompts}
+
+
 def generate_llm_inputs(
     *,
     config: ExperimentConfig,
     strategies: Sequence[VariationStrategy],
     settings,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    skip_prompt_hashes: Optional[AbstractSet[str]] = None,
 ) -> List[Dict[str, Any]]:
-    """Generate inputs using an LLM provider."""
+    """Generate inputs using an LLM provider.
+
+    Prompts whose hash appears in ``skip_prompt_hashes`` are not sent. When
+    ``on_result`` is given, each variation is handed to it as soon as it is
+    generated and is not retained in the returned list.
+    """
 
     llm_config = _ensure_llm_mode(config)
 
@@ -357,6 +516,42 @@ def generate_llm_inputs(
     if not prompts:
         raise LLMGenerationError("No prompts generated from base inputs")
 
+    console = Console()
+
+    if skip_prompt_hashes:
+        pending = [
+            (prompt_text, metadata)
+            for prompt_text, metadata in prompts
+            if _hash_prompt(prompt_text) not in skip_prompt_hashes
+        ]
+        if len(pending) < len(prompts):
+            console.print(
+                f"⏩ Resuming: skipping [bold cyan]{len(prompts) - len(pending)}[/bold cyan] "
+                "variations already generated"
+            )
+        prompts = pending
+        if not prompts:
+            return []
+
+    delivered = 0
+
+    def _deliver(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        nonlocal delivered
+        retained: List[Dict[str, Any]] = []
+        for item in items:
+            delivered += 1
+            if on_result is not None:
+                on_result(item)
+            else:
+                retained.append(item)
+        return retained
+
+    def _count_streamed(item: Dict[str, Any]) -> None:
+        nonlocal delivered
+        delivered += 1
+        if on_result is not None:
+            on_result(item)
+
     async def _run_generation(progress: Progress, task_id: Any) -> List[Dict[str, Any]]:
         if settings.llm_client:
             # Note: Custom clients do not support progress bars currently
@@ -366,18 +561,19 @@ def generate_llm_inputs(
                 llm_config=llm_config,
             )
             if inspect.isawaitable(result):
-                return await result
-            return result
+                result = await result
+            return _deliver(result)
 
-        return await _generate_with_client(
+        results = await _generate_with_client(
             config=config,
             llm_config=llm_config,
             prompts=prompts,
             progress=progress,
             task_id=task_id,
+            on_result=_count_streamed if on_result is not None else None,
         )
+        return _deliver(results)
 
-    console = Console()
     console.print(f"🧠 Generating [bold cyan]{len(prompts)}[/bold cyan] variations using LLM...")
 
     results: List[Dict[str, Any]] = []
@@ -407,9 +603,9 @@ def generate_llm_inputs(
 
             results = loop.run_until_complete(_run_generation(progress, generation_task))
 
-    if len(results) < len(prompts):
+    if delivered < len(prompts):
         console.print(
-            f"[yellow]Warning:[/yellow] {len(prompts) - len(results)} variations failed to generate."
+            f"[yellow]Warning:[/yellow] {len(prompts) - delivered} variations failed to generate."
         )
 
     return results
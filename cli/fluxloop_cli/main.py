@@ -10,25 +10,7 @@ from rich.console import Console
 from rich.panel import Panel
 
 from . import __version__
-from .commands import (
-    apikeys,
-    auth,
-    bundles,
-    config,
-    context,
-    criteria,
-    generate,
-    init,
-    inputs,
-    local_context,
-    personas,
-    projects,
-    run,
-    scenarios,
-    status,
-    sync,
-    test,
-)
+from .lazy_group import LazyTyperGroup
 
 # Suppress known noisy warnings from dependencies to keep CLI output clean.
 warnings.filterwarnings(
@@ -47,36 +29,45 @@ warnings.filterwarnings(
     category=UserWarning,
 )
 
+# Subcommands are imported on first use; see LazyTyperGroup.
+SUBCOMMANDS = {
+    "init": ("fluxloop_cli.commands.init", "Initialize a new FluxLoop project"),
+    "run": ("fluxloop_cli.commands.run", "Run simulations and experiments"),
+    "status": ("fluxloop_cli.commands.status", "Check status and view results"),
+    "config": ("fluxloop_cli.commands.config", "Manage configuration"),
+    "generate": ("fluxloop_cli.commands.generate", "Generate input datasets"),
+    "sync": ("fluxloop_cli.commands.sync", "Sync bundles and upload results"),
+    "criteria": ("fluxloop_cli.commands.criteria", "Show pulled evaluation criteria"),
+    "test": ("fluxloop_cli.commands.test", "Run pull -> run -> upload test workflow"),
+    "auth": ("fluxloop_cli.commands.auth", "Manage authentication"),
+    "apikeys": ("fluxloop_cli.commands.apikeys", "Manage API Keys for sync operations"),
+    "projects": ("fluxloop_cli.commands.projects", "Manage projects"),
+    "scenarios": ("fluxloop_cli.commands.scenarios", "Manage test scenarios"),
+    # "intent" is renamed to avoid conflict with the local "context" command
+    "intent": ("fluxloop_cli.commands.context", "Refine intent and context"),
+    "context": ("fluxloop_cli.commands.local_context", "Manage local working context"),
+    "personas": ("fluxloop_cli.commands.personas", "Manage test personas"),
+    "inputs": ("fluxloop_cli.commands.inputs", "Synthesize and manage test inputs"),
+    "bundles": ("fluxloop_cli.commands.bundles", "Manage test bundles"),
+}
+
+
+class FluxLoopGroup(LazyTyperGroup):
+    lazy_subcommands = SUBCOMMANDS
+
+
 # Create the main Typer app
 app = typer.Typer(
     name="fluxloop",
     help="FluxLoop CLI - Run simulations and manage experiments for AI agents",
     add_completion=True,
     rich_markup_mode="rich",
+    cls=FluxLoopGroup,
 )
 
 # Create console for rich output
 console = Console()
 
-# Add subcommands
-app.add_typer(init.app, name="init", help="Initialize a new FluxLoop project")
-app.add_typer(run.app, name="run", help="Run simulations and experiments")
-app.add_typer(status.app, name="status", help="Check status and view results")
-app.add_typer(config.app, name="config", help="Manage configuration")
-app.add_typer(generate.app, name="generate", help="Generate input datasets")
-app.add_typer(sync.app, name="sync", help="Sync bundles and upload results")
-app.add_typer(criteria.app, name="criteria", help="Show pulled evaluation criteria")
-app.add_typer(test.app, name="test", help="Run pull -> run -> upload test workflow")
-app.add_typer(auth.app, name="auth", help="Manage authentication")
-app.add_typer(apikeys.app, name="apikeys", help="Manage API Keys for sync operations")
-app.add_typer(projects.app, name="projects", help="Manage projects")
-app.add_typer(scenarios.app, name="scenarios", help="Manage test scenarios")
-app.add_typer(context.app, name="intent", help="Refine intent and context")  # renamed to avoid conflict
-app.add_typer(local_context.app, name="context", help="Manage local working context")
-app.add_typer(personas.app, name="personas", help="Manage test personas")
-app.add_typer(inputs.app, name="inputs", help="Synthesize and manage test inputs")
-app.add_typer(bundles.app, name="bundles", help="Manage test bundles")
-
 
 def version_callback(value: bool):
     """Show version and exit."""
@@ -0,0 +1,96 @@
+"""
+Bounded chunking of large sync payloads.
+
+Items are grouped per payload section (``runs``, ``run_results``, ``turns``...)
+and emitted as chunks whose serialized size and item count stay under fixed
+limits, so uploads can be built from streaming iterators and retried chunk by
+chunk.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_CHUNK_MAX_BYTES = 4 * 1024 * 1024
+DEFAULT_CHUNK_MAX_ITEMS = 1000
+
+Chunk = Dict[str, List[Dict[str, Any]]]
+
+
+class PayloadChunker:
+    """Accumulates ``(section, item)`` pairs into size-bounded chunks."""
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = DEFAULT_CHUNK_MAX_BYTES,
+        max_items: int = DEFAULT_CHUNK_MAX_ITEMS,
+    ) -> None:
+        self.max_bytes = max(1, max_bytes)
+        self.max_items = max(1, max_items)
+        self._chunk: Chunk = {}
+        self._bytes = 0
+        self._items = 0
+
+    def add(self, section: str, item: Dict[str, Any]) -> Optional[Chunk]:
+        """Add an item; return the previous chunk if this item starts a new one.
+
+        An item larger than ``max_bytes`` is still sent, alone in its chunk.
+        """
+        size = len(json.dumps(item, ensure_ascii=False).encode("utf-8")) + 1
+        emitted: Optional[Chunk] = None
+        if self._items and (
+            self._bytes + size > self.max_bytes or self._items >= self.max_items
+        ):
+            emitted = self.flush()
+        self._chunk.setdefault(section, []).append(item)
+        self._bytes += size
+        self._items += 1
+        return emitted
+
+    def flush(self) -> Optional[Chunk]:
+        if not self._items:
+            return None
+        chunk, self._chunk = self._chunk, {}
+        self._bytes = 0
+        self._items = 0
+        return chunk
+
+
+def iter_chunks(
+    items: Iterable[Tuple[str, Dict[str, Any]]],
+    *,
+    max_bytes: int = DEFAULT_CHUNK_MAX_BYTES,
+    max_items: int = DEFAULT_CHUNK_MAX_ITEMS,
+) -> Iterator[Chunk]:
+    """Yield bounded chunks from a stream of ``(section, item)`` pairs.
+
+    At least one (possibly empty) chunk is always yielded, so callers that
+    finalize on the last chunk still send a request for an empty stream.
+    """
+    chunker = PayloadChunker(max_bytes=max_bytes, max_items=max_items)
+    emitted = False
+    for section, item in items:
+        chunk = chunker.add(section, item)
+        if chunk is not None:
+            emitted = True
+            yield chunk
+    chunk = chunker.flush()
+    if chunk is not None or not emitted:
+        yield chunk or {}
+
+
+def with_last_flag(chunks: Iterable[Chunk]) -> Iterator[Tuple[int, Chunk, bool]]:
+    """Yield ``(index, chunk, is_last)`` while holding at most one chunk back."""
+    iterator = iter(chunks)
+    try:
+        current = next(iterator)
+    except StopIteration:
+        return
+    index = 0
+    for upcoming in iterator:
+        yield index, current, False
+        current = upcoming
+        index += 1
+    yield index, current, True
@@ -0,0 +1,114 @@
+"""
+Per-phase timing of the runner's own work.
+
+The runner wraps each phase of a run (calling the agent, flushing the event
+buffer, loading observations, recording turns...) in :meth:`PhaseTimer.phase`.
+Phases may nest; each phase is charged only its self time, so the per-phase
+totals add up to the instrumented wall time without double counting. Times use
+the monotonic ``time.perf_counter`` clock.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+# Phases that measure the code under test rather than FluxLoop itself.
+AGENT_PHASES = frozenset({"agent", "supervisor"})
+
+
+@dataclass
+class _Frame:
+    """An open phase."""
+
+    name: str
+    start: float
+    nested: float = 0.0  # seconds spent in phases opened inside this one
+
+
+class PhaseTimer:
+    """Accumulates self time per phase, per run and for the whole experiment."""
+
+    def __init__(self) -> None:
+        self.totals: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self._run: Optional[Dict[str, float]] = None
+        self._stack: List[_Frame] = []
+
+    def start_run(self) -> Dict[str, float]:
+        """Begin attributing phases to a new run and return its (live) totals."""
+        self._run = {}
+        return self._run
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        frame = _Frame(name, time.perf_counter())
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame.start
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1].nested += elapsed
+            self._charge(name, (elapsed - frame.nested) * 1000)
+
+    def _charge(self, name: str, self_ms: float) -> None:
+        self.totals[name] = self.totals.get(name, 0.0) + self_ms
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self._run is not None:
+            self._run[name] = self._run.get(name, 0.0) + self_ms
+
+    def summary(self) -> Dict[str, object]:
+        """Experiment totals for ``summary.json``."""
+        return {
+            "phases_ms": {name: round(value, 3) for name, value in sorted(self.totals.items())},
+            "calls": dict(sorted(self.calls.items())),
+            "overhead_ms": round(overhead_ms(self.totals), 3),
+        }
+
+
+def overhead_ms(phases: Dict[str, float]) -> float:
+    """Time spent in FluxLoop's own phases (everything except the agent/supervisor)."""
+    return sum(value for name, value in phases.items() if name not in AGENT_PHASES)
+
+
+def rounded_phases(phases: Dict[str, float]) -> Dict[str, float]:
+    return {name: round(value, 3) for name, value in sorted(phases.items())}
+
+
+def print_phase_report(
+    summary: Dict[str, object], wall_seconds: Optional[float], console: Console
+) -> None:
+    """Render the ``--profile-runner`` table."""
+    phases = summary.get("phases_ms") or {}
+    calls = summary.get("calls") or {}
+    if not isinstance(phases, dict) or not phases:
+        return
+    wall_ms = (wall_seconds or 0.0) * 1000
+
+    table = Table(title="Runner Phases", show_header=True)
+    table.add_column("Phase", style="cyan")
+    table.add_column("Total", justify="right")
+    table.add_column("Calls", justify="right")
+    table.add_column("Mean", justify="right")
+    table.add_column("% Wall", justify="right")
+    for name, total in sorted(phases.items(), key=lambda item: item[1], reverse=True):
+        count = int(calls.get(name, 0)) if isinstance(calls, dict) else 0
+        share = f"{total / wall_ms * 100:.1f}%" if wall_ms else "-"
+        label = name if name not in AGENT_PHASES else f"{name} (target)"
+        table.add_row(
+            label,
+            f"{total:.1f}ms",
+            str(count),
+            f"{total / count:.2f}ms" if count else "-",
+            share,
+        )
+    console.print(table)
+    overhead = summary.get("overhead_ms") or 0.0
+    console.print(f"FluxLoop overhead: {overhead:.1f}ms")
@@ -0,0 +1,310 @@
+"""
+Optional profiling of agent runs.
+
+``cprofile`` wraps every profiled run in :mod:`cProfile` and writes a
+``.pstats`` file per run plus a merged ``profile.pstats`` for the experiment,
+alongside ``profile.collapsed`` rebuilt from its caller graph (weights are
+microseconds of self time; see :func:`collapse_pstats`).
+``sampling`` is a pure-Python stack sampler: a background thread reads
+``sys._current_frames()`` at a fixed interval and writes collapsed stacks
+(``frame;frame;frame count``), the input format of flamegraph.pl and
+speedscope, per run and merged into ``profile.collapsed``.
+
+Both profilers follow the runner's event-loop thread and any thread a sync
+agent is dispatched to (see :meth:`ProfileSession.track_thread`).
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+DEFAULT_SAMPLE_INTERVAL_SECONDS = 0.005
+PROFILES_DIR_NAME = "profiles"
+
+# Deepest stack recorded by the sampler; deeper frames are truncated at the root.
+MAX_STACK_DEPTH = 256
+
+# Paths carrying less self time than this are left out of collapsed pstats.
+MIN_COLLAPSED_MICROSECONDS = 1
+
+# pstats function key: (filename, first line, function name).
+PstatsKey = Tuple[str, int, str]
+
+
+class ProfileSession(ABC):
+    """Profile of a single run."""
+
+    suffix = ""
+
+    @abstractmethod
+    def start(self) -> None:
+        """Begin profiling on the calling thread."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop profiling; called on the thread that called :meth:`start`."""
+
+    @contextmanager
+    def track_thread(self) -> Iterator[None]:
+        """Include the calling (worker) thread in this profile."""
+        yield
+
+    @abstractmethod
+    def write(self, path: Path) -> None:
+        """Write this run's profile to ``path``."""
+
+
+class CProfileSession(ProfileSession):
+    suffix = ".pstats"
+
+    def __init__(self) -> None:
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._stats: Optional[pstats.Stats] = None
+
+    def _new_profile(self) -> cProfile.Profile:
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+    def start(self) -> None:
+        self._main = self._new_profile()
+        self._main.enable()
+
+    def stop(self) -> None:
+        self._main.disable()
+
+    @contextmanager
+    def track_thread(self) -> Iterator[None]:
+        # Before Python 3.12 cProfile only sees the thread that enabled it; from
+        # 3.12 the main profile already covers all threads and a second one fails.
+        profile = self._new_profile()
+        try:
+            profile.enable()
+        except ValueError:
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """Merged stats of all tracked threads (call after :meth:`stop`)."""
+        if self._stats is not None:
+            return self._stats
+        stats: Optional[pstats.Stats] = None
+        for profile in self._profiles:
+            profile.create_stats()
+            if not profile.stats:  # type: ignore[attr-defined]
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        self._stats = stats
+        return stats
+
+    def write(self, path: Path) -> None:
+        stats = self.stats()
+        if stats is not None:
+            stats.dump_stats(str(path))
+
+
+class SamplingSession(ProfileSession):
+    suffix = ".collapsed"
+
+    def __init__(self, interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS) -> None:
+        self.interval_seconds = max(0.0005, interval_seconds)
+        self.samples: Counter = Counter()
+        self._threads: Set[int] = set()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._threads.add(threading.get_ident())
+        self._sampler = threading.Thread(
+            target=self._sample_loop, name="fluxloop-profiler", daemon=True
+        )
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    @contextmanager
+    def track_thread(self) -> Iterator[None]:
+        ident = threading.get_ident()
+        self._threads.add(ident)
+        try:
+            yield
+        finally:
+            self._threads.discard(ident)
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            frames = sys._current_frames()
+            for ident in list(self._threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.samples[collapse_stack(frame)] += 1
+
+    def write(self, path: Path) -> None:
+        write_collapsed(path, self.samples)
+
+
+def frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collapse_stack(frame: Optional[FrameType]) -> str:
+    """Return ``root;...;leaf`` for ``frame``."""
+    labels: List[str] = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def pstats_label(func: PstatsKey) -> str:
+    filename, lineno, name = func
+    return f"{name} ({os.path.basename(filename)}:{lineno})".replace(";", ":")
+
+
+def collapse_pstats(stats: pstats.Stats) -> Dict[str, int]:
+    """Approximate collapsed stacks from cProfile's caller graph.
+
+    cProfile keeps caller -> callee edges, not whole stacks, so each function's
+    self time is split across the paths reaching it in proportion to the
+    cumulative time of every edge on the path. Weights are microseconds.
+    """
+    entries = stats.stats  # type: ignore[attr-defined]
+    children: Dict[PstatsKey, List[Tuple[PstatsKey, float]]] = {}
+    roots: List[PstatsKey] = []
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+
+    folded: Dict[str, int] = {}
+
+    def visit(func: PstatsKey, share: float, path: List[str], seen: Set[PstatsKey]) -> None:
+        _, _, self_time, cumulative, _ = entries[func]
+        path.append(pstats_label(func))
+        weight = int(self_time * share * 1_000_000)
+        if weight >= MIN_COLLAPSED_MICROSECONDS:
+            stack = ";".join(path)
+            folded[stack] = folded.get(stack, 0) + weight
+        if len(path) < MAX_STACK_DEPTH:
+            seen.add(func)
+            for child, edge_cumulative in children.get(func, []):
+                child_cumulative = entries[child][3]
+                if child in seen or child_cumulative <= 0:
+                    continue
+                child_share = share * edge_cumulative / child_cumulative
+                if child_cumulative * child_share * 1_000_000 >= MIN_COLLAPSED_MICROSECONDS:
+                    visit(child, min(child_share, 1.0), path, seen)
+            seen.discard(func)
+        path.pop()
+
+    for root in sorted(roots):
+        visit(root, 1.0, [], set())
+    return folded
+
+
+def write_collapsed(path: Path, samples: Dict[str, int]) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        for stack, count in sorted(samples.items()):
+            handle.write(f"{stack} {count}\n")
+
+
+class ExperimentProfiler:
+    """Creates a session per profiled run and merges them for the experiment."""
+
+    def __init__(
+        self,
+        mode: str,
+        output_dir: Path,
+        *,
+        every: int = 1,
+        interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS,
+    ) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                f"Unknown profile mode '{mode}'. Choose one of: {', '.join(PROFILE_MODES)}"
+            )
+        self.mode = mode
+        self.output_dir = output_dir
+        self.every = max(1, every)
+        self.interval_seconds = interval_seconds
+        self.profiled_runs = 0
+        self._seen_runs = 0
+        self._stats: Optional[pstats.Stats] = None
+        self._samples: Counter = Counter()
+
+    @property
+    def profiles_dir(self) -> Path:
+        return self.output_dir / PROFILES_DIR_NAME
+
+    def start_run(self) -> Optional[ProfileSession]:
+        """Start profiling the next run, or return None if it is not sampled."""
+        self._seen_runs += 1
+        if (self._seen_runs - 1) % self.every:
+            return None
+        session: ProfileSession
+        if self.mode == "cprofile":
+            session = CProfileSession()
+        else:
+            session = SamplingSession(self.interval_seconds)
+        session.start()
+        return session
+
+    def finish_run(self, session: ProfileSession, name: str) -> Path:
+        """Stop ``session``, write its file and fold it into the experiment profile."""
+        session.stop()
+        self.profiles_dir.mkdir(parents=True, exist_ok=True)
+        path = self.profiles_dir / f"{name}{session.suffix}"
+        session.write(path)
+        if isinstance(session, CProfileSession):
+            stats = session.stats()
+            if stats is not None:
+                if self._stats is None:
+                    self._stats = pstats.Stats(str(path))
+                else:
+                    self._stats.add(str(path))
+        elif isinstance(session, SamplingSession):
+            self._samples.update(session.samples)
+        self.profiled_runs += 1
+        return path
+
+    def finalize(self) -> Optional[Path]:
+        """Write the merged profile for the experiment."""
+        if self.mode == "cprofile":
+            if self._stats is None:
+                return None
+            path = self.output_dir / "profile.pstats"
+            self._stats.dump_stats(str(path))
+            write_collapsed(self.output_dir / "profile.collapsed", collapse_pstats(self._stats))
+            return path
+        if not self._samples:
+            return None
+        path = self.output_dir / "profile.collapsed"
+        write_collapsed(path, self._samples)
+        return path
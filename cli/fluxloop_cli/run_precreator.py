@@ -0,0 +1,180 @@
+"""
+Pipelined precreation of test runs.
+
+Large iteration x persona x input matrices are registered with the sync API in
+chunks instead of one request. The first chunk is sent before execution starts
+so the first runs can begin immediately; the remaining chunks are posted from a
+background thread while the runner executes. A chunk that keeps failing is
+moved to the back of the queue so later chunks are not held up behind it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from rich.console import Console
+
+from .payload_chunks import iter_chunks
+
+DEFAULT_PRECREATE_CHUNK_SIZE = 100
+
+# Posts one chunk of runs and returns the run_batch_id reported by the server.
+PostChunk = Callable[[int, List[Dict[str, Any]]], Optional[str]]
+
+console = Console()
+
+
+@dataclass
+class PrecreateStats:
+    """Counts reported once every chunk has been attempted."""
+
+    registered: int = 0
+    failed: int = 0
+    chunks: int = 0
+
+
+class RunPrecreator:
+    """Registers runs chunk by chunk alongside execution.
+
+    Usage::
+
+        precreator = RunPrecreator(runs, post_chunk=post)
+        precreator.start()            # sends the first chunk, then pipelines the rest
+        precreator.wait_for(run_id)   # before a run starts
+        stats = precreator.close()
+    """
+
+    def __init__(
+        self,
+        runs: List[Dict[str, Any]],
+        *,
+        post_chunk: PostChunk,
+        chunk_size: int = DEFAULT_PRECREATE_CHUNK_SIZE,
+        max_rounds: int = 3,
+        backoff_seconds: float = 1.0,
+        quiet: bool = False,
+    ) -> None:
+        self._post_chunk = post_chunk
+        self.max_rounds = max(1, max_rounds)
+        self.backoff_seconds = backoff_seconds
+        self.quiet = quiet
+
+        self._chunks: List[List[Dict[str, Any]]] = [
+            chunk["runs"]
+            for chunk in iter_chunks(
+                (("runs", run) for run in runs), max_items=max(1, chunk_size)
+            )
+            if chunk
+        ]
+        self._chunk_of: Dict[str, int] = {
+            str(run["id"]): index
+            for index, chunk in enumerate(self._chunks)
+            for run in chunk
+        }
+        # Chunk index -> True (registered) / False (gave up); missing while pending.
+        self._outcome: Dict[int, bool] = {}
+        self._queue: Deque[Tuple[int, int]] = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = False
+        self.run_batch_id: Optional[str] = None
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self._chunks)
+
+    def start(self) -> Optional[str]:
+        """Send the first chunk synchronously and pipeline the rest.
+
+        Errors from the first chunk propagate so a misconfigured API fails the
+        command before any run executes.
+        """
+        if not self._chunks:
+            return None
+        self._send(0, raise_errors=True)
+        self._queue.extend((index, 1) for index in range(1, len(self._chunks)))
+        if self._queue:
+            self._thread = threading.Thread(
+                target=self._worker, name="fluxloop-run-precreator", daemon=True
+            )
+            self._thread.start()
+        return self.run_batch_id
+
+    def wait_for(self, run_id: Optional[str], timeout: Optional[float] = None) -> bool:
+        """Block until the chunk holding ``run_id`` is registered or abandoned."""
+        if not run_id:
+            return False
+        index = self._chunk_of.get(str(run_id))
+        if index is None:
+            return False
+        with self._condition:
+            self._condition.wait_for(lambda: index in self._outcome, timeout)
+            return self._outcome.get(index, False)
+
+    def close(self, timeout: Optional[float] = None) -> PrecreateStats:
+        """Wait for outstanding chunks and return the final counts."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                with self._condition:
+                    self._stop = True
+                    self._condition.notify_all()
+                self._thread.join(1.0)
+        return self.stats
+
+    @property
+    def stats(self) -> PrecreateStats:
+        with self._condition:
+            registered = sum(
+                len(self._chunks[index]) for index, ok in self._outcome.items() if ok
+            )
+            return PrecreateStats(
+                registered=registered,
+                failed=sum(len(chunk) for chunk in self._chunks) - registered,
+                chunks=len(self._chunks),
+            )
+
+    # ------------------------------------------------------------------
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                if self._stop or not self._queue:
+                    return
+                index, attempt = self._queue.popleft()
+            if attempt > 1:
+                time.sleep(self.backoff_seconds * (2 ** (attempt - 2)))
+            if self._send(index, raise_errors=False):
+                continue
+            with self._condition:
+                if attempt < self.max_rounds:
+                    # Retry after the chunks queued behind this one.
+                    self._queue.append((index, attempt + 1))
+                    continue
+                self._outcome[index] = False
+                self._condition.notify_all()
+            if not self.quiet:
+                console.print(
+                    f"[yellow]Failed to precreate {len(self._chunks[index])} runs "
+                    f"(chunk {index + 1}/{len(self._chunks)}).[/yellow]"
+                )
+
+    def _send(self, index: int, *, raise_errors: bool) -> bool:
+        try:
+            run_batch_id = self._post_chunk(index, self._chunks[index])
+        except Exception as exc:
+            if raise_errors:
+                raise
+            if not self.quiet:
+                console.print(f"[yellow]Run precreate chunk {index + 1} failed:[/yellow] {exc}")
+            return False
+        with self._condition:
+            if run_batch_id and not self.run_batch_id:
+                self.run_batch_id = run_batch_id
+            self._outcome[index] = True
+            self._condition.notify_all()
+        return True
@@ -12,38 +12,56 @@ import json
 import logging
 import os
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from uuid import UUID, uuid4
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 import fluxloop
-import yaml
 
 from fluxloop.buffer import EventBuffer
+from fluxloop.metrics import enable_metrics_from_config
+from fluxloop.sinks import InMemorySink
 from fluxloop.schemas import ExperimentConfig, PersonaConfig, MultiTurnConfig
 from rich.console import Console
 
 from .environment import load_env_chain
+from .input_loader import InputSource, open_input_source
 from .target_loader import TargetLoader
 from .arg_binder import ArgBinder
 from .conversation_supervisor import ConversationSupervisor, SupervisorDecision
+from .latency import LatencyStats, input_key
+from .phase_timer import PhaseTimer, overhead_ms, rounded_phases
+from .profiling import ExperimentProfiler, ProfileSession
 from .token_usage import extract_token_usage_from_observations
 
 console = Console()
 logger = logging.getLogger(__name__)
 
+# Seconds; agent runs range from milliseconds to minutes.
+RUN_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
 
 class ExperimentRunner:
     """Runner for full experiments with multiple iterations."""
     
-    def __init__(self, config: ExperimentConfig, no_collector: bool = False):
+    def __init__(
+        self,
+        config: ExperimentConfig,
+        no_collector: bool = False,
+        *,
+        profile: Optional[str] = None,
+        profile_every: int = 1,
+    ):
         """
         Initialize the experiment runner.
         
         Args:
             config: Experiment configuration
             no_collector: If True, disable sending to collector
+            profile: Profile runs with "cprofile" or "sampling" (None disables)
+            profile_every: Profile only every Nth run
         """
         self.config = config
         self.no_collector = no_collector
@@ -81,6 +99,8 @@ class ExperimentRunner:
             offline_store_dir=str(offline_dir),
         )
         self.offline_dir = offline_dir
+        # Opt-in health metrics (FLUXLOOP_METRICS_ENABLED / FLUXLOOP_METRICS_PORT)
+        self.metrics = enable_metrics_from_config(fluxloop.get_config())
 
         # Create output directory
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -88,7 +108,7 @@ class ExperimentRunner:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         # Results storage
-        self.results = {
+        self.results: Dict[str, Any] = {
             "total_runs": 0,
             "successful": 0,
             "failed": 0,
@@ -96,6 +116,20 @@ class ExperimentRunner:
             "errors": [],
             "durations": [],
         }
+        # Streaming percentiles for run, agent turn and supervisor latency
+        self.latency = LatencyStats()
+        # Self time of each runner phase (agent call, flush, observation loading...)
+        self.phases = PhaseTimer()
+        self.profiler = (
+            ExperimentProfiler(profile, self.output_dir, every=profile_every)
+            if profile
+            else None
+        )
+        self._profile_session: Optional[ProfileSession] = None
+        # Receives this experiment's observations while run_experiment() runs
+        self._memory_sink: Optional[InMemorySink] = None
+        # Validated inputs source, shared by the CLI summary and the run itself
+        self._inputs: Optional[InputSource] = None
 
         # Helpers for target loading and argument binding
         self._arg_binder = ArgBinder(config)
@@ -147,12 +181,37 @@ class ExperimentRunner:
         Returns:
             Experiment results summary
         """
+        buffer = EventBuffer.get_instance()
+        self._memory_sink = InMemorySink()
+        buffer.add_sink(self._memory_sink)
+        try:
+            return await self._run_experiment(
+                progress_callback,
+                turn_progress_callback,
+                turn_record_callback,
+                run_id_provider,
+            )
+        finally:
+            buffer.remove_sink(self._memory_sink)
+            self._memory_sink = None
+
+    async def _run_experiment(
+        self,
+        progress_callback: Optional[Callable],
+        turn_progress_callback: Optional[Callable[[int, int, Optional[str]], None]],
+        turn_record_callback: Optional[Callable[[Dict[str, Any]], None]],
+        run_id_provider: Optional[
+            Callable[[Dict[str, Any], Optional[PersonaConfig], int], Optional[str]]
+        ],
+    ) -> Dict[str, Any]:
         start_time = time.time()
+        if turn_record_callback is not None:
+            turn_record_callback = self._timed_turn_recorder(turn_record_callback)
         
         # Load agent module
         agent_func = self._load_agent()
         
-        inputs = await self._load_inputs()
+        inputs = await self._open_inputs()
 
         persona_map = {persona.name: persona for persona in (self.config.personas or [])}
         use_entry_persona = self.config.has_external_inputs()
@@ -218,7 +277,21 @@ class ExperimentRunner:
             self.results["avg_duration_ms"] = sum(self.results["durations"]) / len(self.results["durations"])
         else:
             self.results["avg_duration_ms"] = 0
+
+        run_sketch = self.latency.sketch("run_duration_ms")
+        for q in (50, 95, 99):
+            self.results[f"p{q}_duration_ms"] = (
+                run_sketch.quantile(q / 100) if run_sketch is not None else None
+            )
         
+        if self.profiler is not None:
+            aggregate = self.profiler.finalize()
+            self.results["profile"] = {
+                "mode": self.profiler.mode,
+                "runs_profiled": self.profiler.profiled_runs,
+                "path": str(aggregate.relative_to(self.output_dir)) if aggregate else None,
+            }
+
         # Save results
         self._save_results()
         
@@ -228,11 +301,24 @@ class ExperimentRunner:
             "failed": self.results["failed"],
             "success_rate": self.results["success_rate"],
             "avg_duration_ms": self.results["avg_duration_ms"],
+            "p95_duration_ms": self.results["p95_duration_ms"],
+            "duration_seconds": self.results["duration_seconds"],
+            "runner_profile": self.phases.summary(),
+            "profile": self.results.get("profile"),
             "output_dir": str(self.output_dir),
         }
     
     async def _load_inputs(self) -> List[Dict[str, Any]]:
-        """Load input entries from configuration or external files."""
+        """Load all input entries into memory (prefer :meth:`_open_inputs`)."""
+        return list(await self._open_inputs())
+
+    async def _open_inputs(self) -> InputSource:
+        """Open the configured inputs file as a lazily streamed source.
+
+        The file is validated on the first call only; later calls reuse the source.
+        """
+        if self._inputs is not None:
+            return self._inputs
         if not self.config.inputs_file:
             raise ValueError(
                 "inputs_file is not configured. Generate inputs with "
@@ -240,64 +326,134 @@ class ExperimentRunner:
                 "in setting.yaml before running experiments."
             )
 
-        inputs = self._load_external_inputs()
-        self.config.set_resolved_input_count(len(inputs))
+        inputs = self._open_external_inputs()
+        self.config.set_resolved_input_count(inputs.validate())
         if self.config.has_external_inputs():
             self.config.set_resolved_persona_count(1)
         else:
             persona_multiplier = len(self.config.personas) if self.config.personas else 1
             self.config.set_resolved_persona_count(persona_multiplier)
+        self._inputs = inputs
         return inputs
 
+    def _open_external_inputs(self) -> InputSource:
+        """Create a streaming source for the external inputs file."""
+        source = open_input_source(
+            self.config.inputs_file,  # type: ignore[arg-type]
+            self.config.get_source_dir(),
+        )
+        if not source.path.exists():
+            raise FileNotFoundError(f"Inputs file not found: {source.path}")
+        return source
+
     def _load_external_inputs(self) -> List[Dict[str, Any]]:
         """Load variations from an external file."""
-        source_dir = self.config.get_source_dir()
-        raw_path = Path(self.config.inputs_file)  # type: ignore[arg-type]
-        inputs_path = (source_dir / raw_path if source_dir and not raw_path.is_absolute() else raw_path).resolve()
-        if not inputs_path.exists():
-            raise FileNotFoundError(f"Inputs file not found: {inputs_path}")
-
-        with open(inputs_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-
-        if not data:
-            raise ValueError(f"Inputs file is empty: {inputs_path}")
-
-        # Support either top-level list or dict with "inputs"
-        entries: List[Dict[str, Any]]
-        variations: List[Dict[str, Any]] = []
-        if isinstance(data, dict) and "inputs" in data:
-            entries = data["inputs"]
-        elif isinstance(data, list):
-            entries = data
-        else:
-            raise ValueError(
-                "Inputs file must be a list of inputs or a mapping containing an 'inputs' list"
-            )
+        source = self._open_external_inputs()
+        source.validate()
+        return list(source)
 
-        for index, item in enumerate(entries):
-            if not isinstance(item, dict):
-                raise ValueError(
-                    f"Input entry at index {index} must be a mapping, got {type(item).__name__}"
-                )
+    async def _trace_id_override(
+        self,
+        run_id_provider: Optional[
+            Callable[[Dict[str, Any], Optional[PersonaConfig], int], Optional[str]]
+        ],
+        variation: Dict[str, Any],
+        persona: Optional[PersonaConfig],
+        iteration: int,
+    ) -> Optional[UUID]:
+        """Return the precreated run id for this run as a trace id, if any."""
+        if not run_id_provider:
+            return None
+        # The provider may block (e.g. until the run is precreated), so it runs in
+        # the default executor instead of on the event loop.
+        loop = asyncio.get_running_loop()
+        candidate = await loop.run_in_executor(
+            None, run_id_provider, variation, persona, iteration
+        )
+        if not candidate:
+            return None
+        try:
+            return UUID(str(candidate))
+        except Exception:
+            return None
 
-            input_value = item.get("input")
-            if not input_value:
-                raise ValueError(f"Input entry at index {index} is missing required 'input' field")
+    async def _run_single(
+        self,
+        agent_func: Callable,
+        variation: Dict[str, Any],
+        persona: Optional[PersonaConfig],
+        iteration: int,
+        *,
+        turn_progress_callback: Optional[Callable[[int, int, Optional[str]], None]] = None,
+        turn_record_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        run_id_provider: Optional[
+            Callable[[Dict[str, Any], Optional[PersonaConfig], int], Optional[str]]
+        ] = None,
+    ) -> None:
+        """Run a single execution, profiling and publishing metrics when enabled."""
 
-            variations.append({
-                "input": input_value,
-                "metadata": item.get("metadata", item),
-                "source": "external_file",
-                "source_index": index,
-            })
+        with self._publish_run():
+            session = self.profiler.start_run() if self.profiler else None
+            if session is None:
+                await self._execute_single(
+                    agent_func,
+                    variation,
+                    persona,
+                    iteration,
+                    turn_progress_callback=turn_progress_callback,
+                    turn_record_callback=turn_record_callback,
+                    run_id_provider=run_id_provider,
+                )
+                return
+
+            traces_before = len(self.results["traces"])
+            self._profile_session = session
+            try:
+                await self._execute_single(
+                    agent_func,
+                    variation,
+                    persona,
+                    iteration,
+                    turn_progress_callback=turn_progress_callback,
+                    turn_record_callback=turn_record_callback,
+                    run_id_provider=run_id_provider,
+                )
+            finally:
+                self._profile_session = None
+                self._finish_profile(session, traces_before)
+
+    @contextmanager
+    def _publish_run(self) -> Iterator[None]:
+        """Track runs in flight and completed runs in the metrics registry."""
+        registry = self.metrics
+        if registry is None:
+            yield
+            return
+        in_flight = registry.gauge("fluxloop_runner_runs_in_flight", "Runs currently executing")
+        failed_before = self.results["failed"]
+        in_flight.inc()
+        try:
+            yield
+        finally:
+            in_flight.dec()
+            status = "failure" if self.results["failed"] > failed_before else "success"
+            registry.counter("fluxloop_runner_runs_completed", "Finished runs").inc(
+                status=status
+            )
 
-        if not variations:
-            raise ValueError(f"Inputs file {inputs_path} did not contain any inputs")
+    def _finish_profile(self, session: ProfileSession, traces_before: int) -> None:
+        assert self.profiler is not None
+        trace = (
+            self.results["traces"][-1]
+            if len(self.results["traces"]) > traces_before
+            else None
+        )
+        name = (trace or {}).get("trace_id") or f"run_{self.results['total_runs']:04d}"
+        path = self.profiler.finish_run(session, str(name))
+        if trace is not None:
+            trace["profile_path"] = str(path.relative_to(self.output_dir))
 
-        return variations
-    
-    async def _run_single(
+    async def _execute_single(
         self,
         agent_func: Callable,
         variation: Dict[str, Any],
@@ -310,8 +466,6 @@ class ExperimentRunner:
             Callable[[Dict[str, Any], Optional[PersonaConfig], int], Optional[str]]
         ] = None,
     ) -> None:
-        """Run a single execution."""
-
         if self._should_use_multi_turn():
             await self._run_multi_turn(
                 agent_func,
@@ -324,6 +478,7 @@ class ExperimentRunner:
             return
 
         self.results["total_runs"] += 1
+        run_phases = self.phases.start_run()
         
         # Create trace name
         trace_name = f"{self.config.name}_iter{iteration}"
@@ -347,14 +502,9 @@ class ExperimentRunner:
             trace_id: Optional[str] = None
             result: Any
 
-            trace_id_override: Optional[UUID] = None
-            if run_id_provider:
-                candidate = run_id_provider(variation, persona, iteration)
-                if candidate:
-                    try:
-                        trace_id_override = UUID(str(candidate))
-                    except Exception:
-                        trace_id_override = None
+            trace_id_override = await self._trace_id_override(
+                run_id_provider, variation, persona, iteration
+            )
 
             with fluxloop.instrument(trace_name, trace_id=trace_id_override) as ctx:
                 if hasattr(ctx, "trace") and getattr(ctx, "trace") is not None:
@@ -390,18 +540,20 @@ class ExperimentRunner:
 
                 # Run agent
                 turn_start = time.time()
-                result = await self._call_agent(
-                    agent_func,
-                    input_text,
-                    iteration=iteration,
-                    callback_store=callback_messages,
-                    conversation_state=None,
-                    persona=persona,
-                    auto_approve=None,
-                )
+                with self.phases.phase("agent"):
+                    result = await self._call_agent(
+                        agent_func,
+                        input_text,
+                        iteration=iteration,
+                        callback_store=callback_messages,
+                        conversation_state=None,
+                        persona=persona,
+                        auto_approve=None,
+                    )
 
                 # Allow background callbacks to flush
-                await self._wait_for_callbacks(callback_messages)
+                with self.phases.phase("callbacks_wait"):
+                    await self._wait_for_callbacks(callback_messages)
 
                 send_messages = callback_messages.get("send", [])
                 error_messages = callback_messages.get("error", [])
@@ -416,11 +568,13 @@ class ExperimentRunner:
                     )
 
             # Force flush buffered events so observations are persisted
-            EventBuffer.get_instance().flush()
+            with self.phases.phase("buffer_flush"):
+                EventBuffer.get_instance().flush()
 
             observations: List[Dict[str, Any]] = []
             if trace_id:
-                observations = self._load_observations_for_trace(trace_id)
+                with self.phases.phase("load_observations"):
+                    observations = self._load_observations_for_trace(trace_id)
             token_usage = extract_token_usage_from_observations(observations)
 
             seen_observation_keys: Set[Tuple[Optional[str], Optional[str], Optional[str]]] = set()
@@ -446,6 +600,7 @@ class ExperimentRunner:
                 variation_metadata = dict(variation_metadata)
                 variation_metadata["persona"] = persona.name
             trace_persona = persona.name if persona else variation_metadata.get("persona")
+            self._record_latency("run_duration_ms", duration_ms, variation, trace_persona)
 
             trace_entry = {
                 "trace_id": trace_id,
@@ -483,10 +638,13 @@ class ExperimentRunner:
                     persona=trace_persona,
                 )
             )
-            actions = self._summarize_observation_actions(observations, seen_observation_keys)
+            with self.phases.phase("summarize_actions"):
+                actions = self._summarize_observation_actions(observations, seen_observation_keys)
             assistant_text = self._ensure_text(result)
             trace_entry["output"] = assistant_text
 
+            turn_ms = (time.time() - turn_start) * 1000
+            self._record_latency("agent_turn_ms", turn_ms, variation, trace_persona)
             if turn_record_callback:
                 turn_record_callback(
                     {
@@ -494,7 +652,7 @@ class ExperimentRunner:
                         "role": "assistant",
                         "content": assistant_text,
                         "timestamp": datetime.now(timezone.utc).isoformat(),
-                        "duration_ms": (time.time() - turn_start) * 1000,
+                        "duration_ms": turn_ms,
                         "metadata": {
                             "iteration": iteration,
                             "persona": trace_persona,
@@ -524,6 +682,8 @@ class ExperimentRunner:
                 },
             }
 
+            trace_entry["runner_phases_ms"] = rounded_phases(run_phases)
+            trace_entry["runner_overhead_ms"] = round(overhead_ms(run_phases), 3)
             self.results["traces"].append(trace_entry)
             
         except Exception as e:
@@ -556,6 +716,7 @@ class ExperimentRunner:
         """Execute a multi-turn conversation using the supervisor loop."""
 
         self.results["total_runs"] += 1
+        run_phases = self.phases.start_run()
 
         multi_cfg: MultiTurnConfig = self.config.multi_turn or MultiTurnConfig()
 
@@ -621,6 +782,7 @@ class ExperimentRunner:
         trace_name = f"{self.config.name}_iter{iteration}"
         if persona:
             trace_name += f"_persona_{persona.name}"
+        persona_name = persona.name if persona else None
 
         start_time = time.time()
         termination_reason: Optional[str] = None
@@ -629,14 +791,9 @@ class ExperimentRunner:
         trace_id: Optional[str] = None
 
         try:
-            trace_id_override: Optional[UUID] = None
-            if run_id_provider:
-                candidate = run_id_provider(variation, persona, iteration)
-                if candidate:
-                    try:
-                        trace_id_override = UUID(str(candidate))
-                    except Exception:
-                        trace_id_override = None
+            trace_id_override = await self._trace_id_override(
+                run_id_provider, variation, persona, iteration
+            )
 
             with fluxloop.instrument(trace_name, trace_id=trace_id_override) as ctx:
                 if hasattr(ctx, "trace") and getattr(ctx, "trace") is not None:
@@ -696,23 +853,27 @@ class ExperimentRunner:
                         current_user_input if isinstance(current_user_input, str) else str(current_user_input),
                     )
                     turn_start = time.time()
-                    result = await self._call_agent(
-                        agent_func,
-                        current_user_input,
-                        iteration=iteration,
-                        callback_store=callback_messages,
-                        conversation_state=conversation_state,
-                        persona=persona,
-                        auto_approve=multi_cfg.auto_approve_tools,
-                    )
+                    with self.phases.phase("agent"):
+                        result = await self._call_agent(
+                            agent_func,
+                            current_user_input,
+                            iteration=iteration,
+                            callback_store=callback_messages,
+                            conversation_state=conversation_state,
+                            persona=persona,
+                            auto_approve=multi_cfg.auto_approve_tools,
+                        )
 
-                    await self._wait_for_callbacks(callback_messages)
+                    with self.phases.phase("callbacks_wait"):
+                        await self._wait_for_callbacks(callback_messages)
 
-                    EventBuffer.get_instance().flush()
+                    with self.phases.phase("buffer_flush"):
+                        EventBuffer.get_instance().flush()
 
                     observations: List[Dict[str, Any]] = []
                     if trace_id:
-                        observations = self._load_observations_for_trace(trace_id)
+                        with self.phases.phase("load_observations"):
+                            observations = self._load_observations_for_trace(trace_id)
 
                     assistant_output = self._extract_final_output(
                         callback_messages, observations
@@ -737,10 +898,11 @@ class ExperimentRunner:
                             "content": assistant_text,
                         }
                     )
-                    new_actions = self._summarize_observation_actions(
-                        observations,
-                        seen_observation_keys,
-                    )
+                    with self.phases.phase("summarize_actions"):
+                        new_actions = self._summarize_observation_actions(
+                            observations,
+                            seen_observation_keys,
+                        )
                     normalized_conversation.append(
                         self._make_conversation_entry(
                             turn_index=turn_index,
@@ -750,6 +912,8 @@ class ExperimentRunner:
                             actions=new_actions or None,
                         )
                     )
+                    turn_ms = (time.time() - turn_start) * 1000
+                    self._record_latency("agent_turn_ms", turn_ms, variation, persona_name)
                     if turn_record_callback:
                         turn_record_callback(
                             {
@@ -757,7 +921,7 @@ class ExperimentRunner:
                                 "role": "assistant",
                                 "content": assistant_text,
                                 "timestamp": datetime.now(timezone.utc).isoformat(),
-                                "duration_ms": (time.time() - turn_start) * 1000,
+                                "duration_ms": turn_ms,
                                 "metadata": {
                                     "iteration": iteration,
                                     "persona": persona.name if persona else None,
@@ -776,10 +940,18 @@ class ExperimentRunner:
                         ctx.add_metadata("termination_reason", termination_reason)
                         break
 
-                    decision = await supervisor.decide(
-                        conversation_state=conversation_state,
-                        persona_description=persona_description,
-                        service_context=service_context,
+                    supervisor_start = time.perf_counter()
+                    with self.phases.phase("supervisor"):
+                        decision = await supervisor.decide(
+                            conversation_state=conversation_state,
+                            persona_description=persona_description,
+                            service_context=service_context,
+                        )
+                    self._record_latency(
+                        "supervisor_ms",
+                        (time.perf_counter() - supervisor_start) * 1000,
+                        variation,
+                        persona_name,
                     )
                     last_decision = decision
                     logger.debug(
@@ -881,12 +1053,14 @@ class ExperimentRunner:
                         )
                     current_user_input = next_user_message
 
-                EventBuffer.get_instance().flush()
+                with self.phases.phase("buffer_flush"):
+                    EventBuffer.get_instance().flush()
 
         except Exception as exc:
             self.results["failed"] += 1
             duration_ms = (time.time() - start_time) * 1000
             self.results["durations"].append(duration_ms)
+            self._record_latency("run_duration_ms", duration_ms, variation, persona_name)
             self.results["errors"].append(
                 {
                     "iteration": iteration,
@@ -900,6 +1074,7 @@ class ExperimentRunner:
             self.results["successful"] += 1
             duration_ms = (time.time() - start_time) * 1000
             self.results["durations"].append(duration_ms)
+            self._record_latency("run_duration_ms", duration_ms, variation, persona_name)
 
             trace_entry = {
                 "trace_id": trace_id,
@@ -916,6 +1091,8 @@ class ExperimentRunner:
             if last_decision and last_decision.raw_response:
                 trace_entry["supervisor_response"] = last_decision.raw_response
 
+            trace_entry["runner_phases_ms"] = rounded_phases(run_phases)
+            trace_entry["runner_overhead_ms"] = round(overhead_ms(run_phases), 3)
             self.results["traces"].append(trace_entry)
         finally:
             if turn_progress_callback:
@@ -925,6 +1102,37 @@ class ExperimentRunner:
                     None,
                 )
     
+    def _timed_turn_recorder(
+        self, callback: Callable[[Dict[str, Any]], None]
+    ) -> Callable[[Dict[str, Any]], None]:
+        """Wrap the turn callback so recording (and streaming) time is attributed."""
+
+        def _record(turn: Dict[str, Any]) -> None:
+            with self.phases.phase("turn_recording"):
+                callback(turn)
+
+        return _record
+
+    def _record_latency(
+        self,
+        metric: str,
+        value_ms: float,
+        variation: Dict[str, Any],
+        persona_name: Optional[str],
+    ) -> None:
+        self.latency.record(
+            metric,
+            value_ms,
+            persona=persona_name,
+            input_key=input_key(variation.get("input")),
+        )
+        if self.metrics is not None:
+            self.metrics.histogram(
+                "fluxloop_runner_latency_seconds",
+                "Run, agent turn and supervisor latency",
+                buckets=RUN_LATENCY_BUCKETS,
+            ).observe(value_ms / 1000, metric=metric.replace("_ms", ""))
+
     def _resolve_entry_persona(
         self,
         entry: Dict[str, Any],
@@ -982,8 +1190,12 @@ class ExperimentRunner:
             loop = asyncio.get_event_loop()
             # Preserve contextvars across thread execution
             ctx = contextvars.copy_context()
+            session = self._profile_session
             def _call():
-                return agent_func(**kwargs)
+                if session is None:
+                    return agent_func(**kwargs)
+                with session.track_thread():
+                    return agent_func(**kwargs)
             result = await loop.run_in_executor(None, lambda: ctx.run(_call))
 
         # If an async generator/iterable is returned, consume it into a string
@@ -1010,7 +1222,15 @@ class ExperimentRunner:
             await asyncio.sleep(poll_interval)
 
     def _load_observations_for_trace(self, trace_id: str) -> List[Dict[str, Any]]:
-        """Load observations from the offline store that match the given trace_id."""
+        """Load observations recorded for the given trace_id.
+
+        During run_experiment() they come from the in-memory sink; otherwise
+        the offline store is scanned.
+        """
+        if self._memory_sink is not None:
+            observations: List[Dict[str, Any]] = self._memory_sink.pop_observations(trace_id)
+            return observations
+
         observations_path = self.offline_dir / "observations.jsonl"
         if not observations_path.exists():
             return []
@@ -1326,9 +1546,16 @@ class ExperimentRunner:
                 "failed": self.results["failed"],
                 "success_rate": self.results["success_rate"],
                 "avg_duration_ms": self.results["avg_duration_ms"],
+                "p50_duration_ms": self.results.get("p50_duration_ms"),
+                "p95_duration_ms": self.results.get("p95_duration_ms"),
+                "p99_duration_ms": self.results.get("p99_duration_ms"),
                 "duration_seconds": self.results["duration_seconds"],
             },
+            "latency": self.latency.to_dict(),
+            "runner": self.phases.summary(),
         }
+        if self.results.get("profile"):
+            summary["profile"] = self.results["profile"]
         summary_file.write_text(json.dumps(summary, indent=2))
         
         if self.config.save_traces:
@@ -1368,6 +1595,11 @@ class ExperimentRunner:
                     summary_payload["conversation_state"] = trace.get("conversation_state")
                 if trace.get("termination_reason") is not None:
                     summary_payload["termination_reason"] = trace.get("termination_reason")
+                if trace.get("profile_path") is not None:
+                    summary_payload["profile_path"] = trace.get("profile_path")
+                if trace.get("runner_phases_ms") is not None:
+                    summary_payload["runner_phases_ms"] = trace.get("runner_phases_ms")
+                    summary_payload["runner_overhead_ms"] = trace.get("runner_overhead_ms")
                 summary_file.write(json.dumps(summary_payload) + "\n")
 
     def _save_experiment_observations(self) -> None:
@@ -0,0 +1,400 @@
+"""
+Background streaming of recorded turns to the sync API.
+
+Turns are queued from the runner and delivered by a single asyncio worker that
+runs in its own thread with one keep-alive HTTP client. Turns arriving within a
+short window are coalesced on the client and posted one by one per run, in turn
+``sequence`` order, with runs sharing the connection pool. A batch endpoint is
+only used when one is configured explicitly (``batch_endpoint``), since the
+sync API does not define one by default. When the queue is full, producers wait up to a bounded timeout
+before the turn is dropped, so a slow API never stalls a test indefinitely.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import httpx
+from rich.console import Console
+
+from .turns import utc_now_iso
+
+DEFAULT_TURNS_ENDPOINT = "/api/sync/turns"
+
+# Status codes indicating the configured batch endpoint is unavailable; fall back to
+# per-turn posts.
+BATCH_UNSUPPORTED_STATUSES = (404, 405, 501)
+
+_TURN_PAYLOAD_KEYS = (
+    "run_id",
+    "turn_id",
+    "sequence",
+    "role",
+    "content",
+    "timestamp",
+    "duration_ms",
+    "warnings",
+)
+
+_CLOSE = object()
+
+console = Console()
+
+
+def build_turn_payload(turn: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the sync API payload for a recorded turn, or None if it lacks ids."""
+    run_id = turn.get("run_id")
+    turn_id = turn.get("turn_id")
+    if not run_id or not turn_id:
+        return None
+
+    payload: Dict[str, Any] = {key: turn.get(key) for key in _TURN_PAYLOAD_KEYS}
+
+    if payload.get("sequence") is not None:
+        try:
+            payload["sequence"] = int(payload["sequence"])
+        except (TypeError, ValueError):
+            pass
+
+    if not payload.get("timestamp"):
+        payload["timestamp"] = utc_now_iso()
+
+    if payload.get("warnings") is None:
+        payload["warnings"] = []
+
+    return payload
+
+
+def turn_idempotency_key(payload: Dict[str, Any]) -> str:
+    return f"{payload['run_id']}:{payload['turn_id']}"
+
+
+def _is_retryable_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def _group_by_run(batch: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group payloads by run, ordering each run by ``sequence`` (stable for ties)."""
+    runs: Dict[str, List[Dict[str, Any]]] = {}
+    for payload in batch:
+        runs.setdefault(payload["run_id"], []).append(payload)
+    for turns in runs.values():
+        turns.sort(key=lambda p: p["sequence"] if isinstance(p.get("sequence"), int) else -1)
+    return runs
+
+
+class _BatchUnsupported(Exception):
+    """Raised when the batch endpoint is not available on the server."""
+
+
+@dataclass
+class TurnStreamStats:
+    """Delivery counters reported when the streamer is drained."""
+
+    delivered: int = 0
+    dropped: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.delivered + self.dropped
+
+
+class TurnStreamer:
+    """Pooled, coalescing turn streamer.
+
+    Usage::
+
+        streamer = TurnStreamer(api_url=url, api_key=key)
+        streamer.start()
+        streamer.submit(turn)
+        stats = streamer.close()
+    """
+
+    def __init__(
+        self,
+        *,
+        api_url: str,
+        api_key: str,
+        endpoint: Optional[str] = None,
+        batch_endpoint: Optional[str] = None,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        timeout_seconds: float = 10.0,
+        batch_size: int = 20,
+        batch_window_seconds: float = 0.2,
+        queue_size: int = 1000,
+        enqueue_timeout_seconds: float = 5.0,
+        concurrency: int = 4,
+        quiet: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.api_url = api_url
+        self.api_key = api_key
+        self.endpoint = endpoint or DEFAULT_TURNS_ENDPOINT
+        self.batch_endpoint = batch_endpoint
+        self.max_retries = max(0, max_retries)
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self.batch_size = max(1, batch_size)
+        self.batch_window_seconds = max(0.0, batch_window_seconds)
+        self.queue_size = max(1, queue_size)
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+        self.concurrency = max(1, concurrency)
+        self.quiet = quiet
+        self._transport = transport
+
+        self._batch_supported = bool(self.batch_endpoint) and self.batch_size > 1
+        self._stats = TurnStreamStats()
+        self._pending = 0
+        self._stats_lock = threading.Lock()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[Any]"] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Producer side (runner thread)
+    # ------------------------------------------------------------------
+
+    def start(self) -> "TurnStreamer":
+        if self._thread is not None:
+            return self
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="fluxloop-turn-streamer", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def submit(self, turn: Dict[str, Any]) -> bool:
+        """Queue a turn for delivery, waiting briefly when the queue is full."""
+        payload = build_turn_payload(turn)
+        if payload is None or self._closed:
+            self._record(dropped=1)
+            return False
+
+        self.start()
+        assert self._loop is not None and self._queue is not None
+        with self._stats_lock:
+            self._pending += 1
+        future = asyncio.run_coroutine_threadsafe(self._queue.put(payload), self._loop)
+        try:
+            future.result(timeout=self.enqueue_timeout_seconds)
+        except concurrent.futures.TimeoutError:
+            if not future.cancel():
+                return True
+            self._record(dropped=1, pending=-1)
+            if not self.quiet:
+                console.print("[yellow]Turn stream queue full; dropped a turn.[/yellow]")
+            return False
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> TurnStreamStats:
+        """Flush queued turns, stop the worker and return delivery counts."""
+        if self._closed:
+            return self.stats
+        self._closed = True
+        if self._thread is None:
+            return self.stats
+
+        assert self._loop is not None and self._queue is not None
+        if self._thread.is_alive():
+            closing = asyncio.run_coroutine_threadsafe(self._queue.put(_CLOSE), self._loop)
+            try:
+                closing.result(timeout=timeout)
+            except concurrent.futures.TimeoutError:
+                closing.cancel()
+            self._thread.join(timeout)
+
+        if self._thread.is_alive() and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._thread.join(max(self.timeout_seconds, 1.0))
+
+        # Anything accepted but never resolved (timeout or cancellation) is lost.
+        with self._stats_lock:
+            self._stats.dropped += self._pending
+            self._pending = 0
+        return self.stats
+
+    @property
+    def stats(self) -> TurnStreamStats:
+        with self._stats_lock:
+            return TurnStreamStats(self._stats.delivered, self._stats.dropped)
+
+    def __enter__(self) -> "TurnStreamer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Worker side (streamer thread)
+    # ------------------------------------------------------------------
+
+    def _run_loop(self) -> None:
+        assert self._loop is not None
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = self._loop.create_task(self._worker())
+        self._ready.set()
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        limits = httpx.Limits(
+            max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+        )
+        async with httpx.AsyncClient(
+            base_url=self.api_url,
+            timeout=self.timeout_seconds,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            limits=limits,
+            transport=self._transport,
+        ) as client:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            closing = False
+            while not closing:
+                item = await queue.get()
+                if item is _CLOSE:
+                    break
+
+                batch = [item]
+                deadline = loop.time() + self.batch_window_seconds
+                while len(batch) < self.batch_size:
+                    try:
+                        item = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            item = await asyncio.wait_for(queue.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    if item is _CLOSE:
+                        closing = True
+                        break
+                    batch.append(item)
+
+                await self._deliver(client, semaphore, batch)
+
+    async def _deliver(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        batch: List[Dict[str, Any]],
+    ) -> None:
+        runs = _group_by_run(batch)
+
+        if self.batch_endpoint and self._batch_supported and len(batch) > 1:
+            ordered = [payload for turns in runs.values() for payload in turns]
+            keys = "|".join(turn_idempotency_key(payload) for payload in ordered)
+            try:
+                await self._post(
+                    client,
+                    self.batch_endpoint,
+                    {"turns": ordered},
+                    idempotency_key=f"batch:{hashlib.sha1(keys.encode('utf-8')).hexdigest()}",
+                    batch=True,
+                )
+            except _BatchUnsupported:
+                self._batch_supported = False
+            except Exception as exc:
+                # The batch may be rejected as a whole (shape, size, 5xx, timeout)
+                # while single turns still go through: retry this batch per run.
+                self._report_failure(exc)
+            else:
+                self._record(delivered=len(ordered), pending=-len(ordered))
+                if not self.quiet:
+                    console.print(f"[green][Stream][/green] ✓ {len(ordered)} turns")
+                return
+
+        await asyncio.gather(
+            *(self._deliver_run(client, semaphore, turns) for turns in runs.values())
+        )
+
+    async def _deliver_run(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        turns: List[Dict[str, Any]],
+    ) -> None:
+        # Turns of one run are sent sequentially; different runs share the pool.
+        async with semaphore:
+            for payload in turns:
+                try:
+                    await self._post(
+                        client,
+                        self.endpoint,
+                        payload,
+                        idempotency_key=turn_idempotency_key(payload),
+                    )
+                except Exception as exc:
+                    self._report_failure(exc)
+                    self._record(dropped=1, pending=-1)
+                    continue
+                self._record(delivered=1, pending=-1)
+                if not self.quiet:
+                    console.print(f"[green][Stream][/green] ✓ {payload['turn_id']}")
+
+    async def _post(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        payload: Dict[str, Any],
+        *,
+        idempotency_key: str,
+        batch: bool = False,
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                resp = await client.post(
+                    endpoint,
+                    json=payload,
+                    headers={"Idempotency-Key": idempotency_key},
+                )
+                if batch and resp.status_code in BATCH_UNSUPPORTED_STATUSES:
+                    raise _BatchUnsupported(endpoint)
+                resp.raise_for_status()
+                return resp
+            except httpx.HTTPStatusError as exc:
+                if not _is_retryable_status(exc.response.status_code):
+                    raise
+                if attempt >= self.max_retries:
+                    raise
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+            attempt += 1
+            await asyncio.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _record(self, *, delivered: int = 0, dropped: int = 0, pending: int = 0) -> None:
+        with self._stats_lock:
+            self._stats.delivered += delivered
+            self._stats.dropped += dropped
+            self._pending += pending
+
+    def _report_failure(self, exc: Exception) -> None:
+        if not self.quiet:
+            console.print(f"[yellow]Turn stream failed:[/yellow] {exc}")
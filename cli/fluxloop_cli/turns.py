@@ -10,7 +10,7 @@ from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import yaml
 
@@ -171,23 +171,26 @@ class TurnRecorder:
         return load_turns(self.turns_path)
 
 
-def load_turns(turns_path: Path) -> List[Dict[str, Any]]:
-    turns: List[Dict[str, Any]] = []
+def iter_turn_records(turns_path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream turn records from a ``turns.jsonl`` file, skipping torn lines."""
     if not turns_path.exists():
-        return turns
+        return
     with turns_path.open("r", encoding="utf-8") as handle:
         for line in handle:
             line = line.strip()
             if not line:
                 continue
             try:
-                turns.append(json.loads(line))
+                yield json.loads(line)
             except json.JSONDecodeError:
                 continue
-    return turns
 
 
-def summarize_turns(turns: List[Dict[str, Any]]) -> Dict[str, TurnSummary]:
+def load_turns(turns_path: Path) -> List[Dict[str, Any]]:
+    return list(iter_turn_records(turns_path))
+
+
+def summarize_turns(turns: Iterable[Dict[str, Any]]) -> Dict[str, TurnSummary]:
     summaries: Dict[str, TurnSummary] = defaultdict(TurnSummary)
     for turn in turns:
         run_id = turn.get("run_id")
@@ -202,50 +205,100 @@ def summarize_turns(turns: List[Dict[str, Any]]) -> Dict[str, TurnSummary]:
     return summaries
 
 
+def _summary_lines(summary: TurnSummary, *, width: int = 0) -> List[str]:
+    lines = [
+        f"- Turns: {summary.total_turns} ({summary.warning_turns} warning turns)",
+        f"- Warnings: {summary.warning_count}",
+    ]
+    return [line.ljust(width) for line in lines] if width else lines
+
+
+def _header_lines(summary: TurnSummary, *, width: int = 0) -> List[str]:
+    return ["# FluxLoop Test Result", "", "## Summary", *_summary_lines(summary, width=width), ""]
+
+
+def _turn_lines(turn: Dict[str, Any]) -> List[str]:
+    lines: List[str] = []
+    lines.append("")
+    lines.append(f"### Turn {turn.get('sequence')}")
+    lines.append(f"- Role: {turn.get('role')}")
+    if turn.get("duration_ms") is not None:
+        lines.append(f"- Duration: {turn.get('duration_ms')} ms")
+    warnings = turn.get("warnings") or []
+    if warnings:
+        lines.append("- Status: ⚠️ Warning")
+    else:
+        lines.append("- Status: ✓")
+    lines.append("")
+    lines.append("**Content:**")
+    lines.append(f"> {turn.get('content')}")
+    if warnings:
+        lines.append("")
+        lines.append("**Warnings:**")
+        for warning in warnings:
+            lines.append(f"- {warning.get('message') or warning.get('type')}")
+    return lines
+
+
+def _criteria_lines(criteria_items: List[str]) -> List[str]:
+    if not criteria_items:
+        return []
+    lines = ["", "## Evaluation Criteria"]
+    lines.extend(f"- {item}" for item in criteria_items)
+    return lines
+
+
 def render_result_markdown(
     turns: List[Dict[str, Any]],
     summary: TurnSummary,
     criteria_items: List[str],
 ) -> str:
-    lines: List[str] = []
-    lines.append("# FluxLoop Test Result")
-    lines.append("")
-    lines.append("## Summary")
-    lines.append(f"- Turns: {summary.total_turns} ({summary.warning_turns} warning turns)")
-    lines.append(f"- Warnings: {summary.warning_count}")
-    lines.append("")
-
+    lines: List[str] = _header_lines(summary)
     lines.append("## Turn Details")
     for turn in turns:
-        lines.append("")
-        lines.append(f"### Turn {turn.get('sequence')}")
-        lines.append(f"- Role: {turn.get('role')}")
-        if turn.get("duration_ms") is not None:
-            lines.append(f"- Duration: {turn.get('duration_ms')} ms")
-        warnings = turn.get("warnings") or []
-        if warnings:
-            lines.append("- Status: ⚠️ Warning")
-        else:
-            lines.append("- Status: ✓")
-        lines.append("")
-        lines.append("**Content:**")
-        lines.append(f"> {turn.get('content')}")
-        if warnings:
-            lines.append("")
-            lines.append("**Warnings:**")
-            for warning in warnings:
-                lines.append(f"- {warning.get('message') or warning.get('type')}")
-
-    if criteria_items:
-        lines.append("")
-        lines.append("## Evaluation Criteria")
-        for item in criteria_items:
-            lines.append(f"- {item}")
-
+        lines.extend(_turn_lines(turn))
+    lines.extend(_criteria_lines(criteria_items))
     lines.append("")
     return "\n".join(lines)
 
 
+class ResultMarkdownWriter:
+    """Incrementally maintained ``result.md`` for a running test.
+
+    Turn sections are appended as they are recorded and the summary header is
+    rewritten in place (its lines are padded to a fixed width), so each turn
+    costs the same regardless of how many turns came before. The final report
+    is produced once with :func:`render_result_markdown`.
+    """
+
+    SUMMARY_WIDTH = 64
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.summary = TurnSummary()
+
+    def start(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(self._header_bytes() + "## Turn Details\n".encode("utf-8"))
+
+    def append_turn(self, turn: Dict[str, Any]) -> None:
+        warnings = turn.get("warnings") or []
+        self.summary.total_turns += 1
+        if warnings:
+            self.summary.warning_turns += 1
+            self.summary.warning_count += len(warnings)
+
+        section = "\n".join(_turn_lines(turn)) + "\n"
+        with self.path.open("ab") as handle:
+            handle.write(section.encode("utf-8"))
+        with self.path.open("r+b") as handle:
+            handle.write(self._header_bytes())
+
+    def _header_bytes(self) -> bytes:
+        lines = _header_lines(self.summary, width=self.SUMMARY_WIDTH)
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
 def write_latest_result_link(project_root: Path, result_path: Path) -> Path:
     state_dir = project_root / STATE_DIR_NAME
     state_dir.mkdir(parents=True, exist_ok=True)
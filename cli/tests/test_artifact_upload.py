@@ -0,0 +1,180 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from fluxloop_cli.artifact_upload import ArtifactUpload, ArtifactUploader, UploadManifest
+
+
+class StubStorage:
+    """Sync API + object storage stand-in for httpx.MockTransport."""
+
+    def __init__(
+        self, *, batch_presign: bool = True, fail_path: str = "", expire_once: str = ""
+    ) -> None:
+        self.batch_presign = batch_presign
+        self.fail_path = fail_path
+        self.expire_once = expire_once
+        self.presign_calls: List[str] = []
+        self.events: List[str] = []
+        self.uploads: Dict[str, bytes] = {}
+        self.upload_headers: Dict[str, httpx.Headers] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _presign(self, item: dict) -> dict:
+        key = f"{item['run_id']}/{item['artifact_type']}/{item['filename']}"
+        return {
+            "upload_url": f"https://storage.test/{key}",
+            "storage_url": f"s3://bucket/{key}",
+            "headers": {"x-amz-meta-run": item["run_id"]},
+        }
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == "api.test":
+            assert request.headers["Authorization"] == "Bearer key"
+            self.presign_calls.append(request.url.path)
+            self.events.append("presign")
+            body = json.loads(request.content)
+            if request.url.path.endswith("/batch"):
+                if not self.batch_presign:
+                    return httpx.Response(404)
+                items = [self._presign(item) for item in body["items"]]
+                return httpx.Response(200, json={"items": items})
+            return httpx.Response(200, json=self._presign(body))
+
+        assert "Authorization" not in request.headers
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.02)
+            self.events.append("upload")
+            if self.expire_once and request.url.path.endswith(self.expire_once):
+                self.expire_once = ""
+                return httpx.Response(403)
+            if self.fail_path and request.url.path.endswith(self.fail_path):
+                return httpx.Response(403)
+            self.uploads[request.url.path] = request.read()
+            self.upload_headers[request.url.path] = request.headers
+            return httpx.Response(200)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _artifacts(tmp_path: Path, count: int) -> List[ArtifactUpload]:
+    artifacts = []
+    for index in range(count):
+        path = tmp_path / f"trace_{index}.md"
+        path.write_text(f"# trace {index}\n" * 1000)
+        artifacts.append(
+            ArtifactUpload(f"run-{index}", "per_trace_markdown", path, "text/markdown")
+        )
+    artifacts.append(ArtifactUpload("run-0", "summary", tmp_path / "missing.json"))
+    return artifacts
+
+
+def _uploader(stub: StubStorage, **kwargs) -> ArtifactUploader:
+    return ArtifactUploader(
+        api_url="https://api.test",
+        api_key="key",
+        project_id="project",
+        backoff_seconds=0.0,
+        transport=httpx.MockTransport(stub),
+        **kwargs,
+    )
+
+
+def test_batch_presign_and_bounded_parallel_upload(tmp_path: Path) -> None:
+    stub = StubStorage()
+    artifacts = _artifacts(tmp_path, 7)
+
+    result = _uploader(stub, concurrency=3, presign_batch_size=4).upload_all(artifacts)
+
+    assert stub.presign_calls == ["/api/storage/presign/batch"] * 2
+    assert [entry["run_id"] for entry in result] == [f"run-{i}" for i in range(7)]
+    assert result[0]["storage_url"] == "s3://bucket/run-0/per_trace_markdown/trace_0.md"
+    assert 1 < stub.max_in_flight <= 3
+
+    path = "/run-2/per_trace_markdown/trace_2.md"
+    assert stub.uploads[path] == (tmp_path / "trace_2.md").read_bytes()
+    assert stub.upload_headers[path]["Content-Length"] == str(len(stub.uploads[path]))
+    assert stub.upload_headers[path]["x-amz-meta-run"] == "run-2"
+
+
+def test_falls_back_to_single_presign(tmp_path: Path) -> None:
+    stub = StubStorage(batch_presign=False)
+
+    result = _uploader(stub, presign_batch_size=10).upload_all(_artifacts(tmp_path, 3))
+
+    assert len(result) == 3
+    assert stub.presign_calls == ["/api/storage/presign/batch"] + ["/api/storage/presign"] * 3
+
+
+def test_batches_are_presigned_as_workers_catch_up(tmp_path: Path) -> None:
+    stub = StubStorage()
+
+    _uploader(stub, concurrency=1, presign_batch_size=1).upload_all(_artifacts(tmp_path, 5))
+
+    # One batch is queued behind the running upload; the next waits for a worker.
+    assert stub.events == ["presign", "presign"] + ["upload", "presign"] * 3 + ["upload"] * 2
+
+
+def test_expired_presign_is_refreshed(tmp_path: Path) -> None:
+    stub = StubStorage(expire_once="trace_1.md")
+
+    uploader = _uploader(stub, presign_batch_size=10)
+    result = uploader.upload_all(_artifacts(tmp_path, 3))
+
+    assert len(result) == 3
+    assert stub.presign_calls == ["/api/storage/presign/batch", "/api/storage/presign"]
+    assert "/run-1/per_trace_markdown/trace_1.md" in stub.uploads
+    assert uploader.uploaded == 3
+
+
+def test_upload_failure_is_raised(tmp_path: Path) -> None:
+    stub = StubStorage(fail_path="trace_1.md")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _uploader(stub).upload_all(_artifacts(tmp_path, 3))
+
+
+def test_manifest_skips_unchanged_and_resumes_after_failure(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "state" / "exp.jsonl"
+    artifacts = _artifacts(tmp_path, 3)
+
+    failing = StubStorage(fail_path="trace_1.md")
+    with pytest.raises(httpx.HTTPStatusError):
+        _uploader(
+            failing, concurrency=1, manifest=UploadManifest(manifest_path, project_id="project")
+        ).upload_all(artifacts)
+    assert "/run-0/per_trace_markdown/trace_0.md" in failing.uploads
+
+    # Resume: only what did not finish is uploaded again.
+    stub = StubStorage()
+    uploader = _uploader(stub, manifest=UploadManifest(manifest_path, project_id="project"))
+    result = uploader.upload_all(artifacts)
+    assert len(result) == 3
+    assert "/run-0/per_trace_markdown/trace_0.md" not in stub.uploads
+    assert uploader.skipped >= 1 and uploader.uploaded == 3 - uploader.skipped
+
+    # Touched but identical content is skipped; changed content is re-uploaded.
+    (tmp_path / "trace_0.md").write_bytes((tmp_path / "trace_0.md").read_bytes())
+    (tmp_path / "trace_2.md").write_text("changed")
+    stub = StubStorage()
+    uploader = _uploader(stub, manifest=UploadManifest(manifest_path, project_id="project"))
+    result = uploader.upload_all(artifacts)
+    assert list(stub.uploads) == ["/run-2/per_trace_markdown/trace_2.md"]
+    assert (uploader.uploaded, uploader.skipped) == (1, 2)
+    assert [entry["run_id"] for entry in result] == ["run-0", "run-1", "run-2"]
+
+    # Manifests are scoped to a project.
+    other = _uploader(StubStorage(), manifest=UploadManifest(manifest_path, project_id="other"))
+    other.upload_all(artifacts)
+    assert other.skipped == 0
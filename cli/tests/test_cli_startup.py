@@ -0,0 +1,83 @@
+"""Import-time regression checks for CLI startup."""
+
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+from typer.testing import CliRunner
+
+from fluxloop_cli.main import SUBCOMMANDS, app
+
+# Modules that must not be imported just to start the CLI or print help.
+HEAVY_MODULES = (
+    "httpx",
+    "yaml",
+    "fluxloop",
+    "fluxloop_cli.runner",
+    "fluxloop_cli.commands.test",
+    "fluxloop_cli.commands.sync",
+)
+
+
+def _importtime(*args: str) -> Dict[str, int]:
+    """Run Python with ``-X importtime`` and return cumulative microseconds per module."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|", 2)
+        try:
+            timings[module.strip()] = int(cumulative.strip())
+        except ValueError:
+            continue
+    return timings
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("-c", "import fluxloop_cli.main"),
+        ("-m", "fluxloop_cli.main", "--help"),
+    ],
+)
+def test_cli_startup_does_not_import_command_dependencies(args) -> None:
+    timings = _importtime(*args)
+
+    assert "fluxloop_cli.main" in timings
+    loaded = sorted(name for name in HEAVY_MODULES if name in timings)
+    assert loaded == []
+
+
+def test_subcommand_module_loaded_only_when_invoked() -> None:
+    # A fresh interpreter, since this test process may have imported it already.
+    code = (
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from fluxloop_cli.main import app\n"
+        "module = 'fluxloop_cli.commands.generate'\n"
+        "assert module not in sys.modules, 'loaded at startup'\n"
+        "result = CliRunner().invoke(app, ['generate', '--help'])\n"
+        "assert result.exit_code == 0, result.output\n"
+        "assert 'inputs' in result.output\n"
+        "assert module in sys.modules, 'not loaded on invocation'\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True
+    )
+
+    assert completed.returncode == 0, completed.stderr
+
+
+def test_help_lists_every_subcommand() -> None:
+    result = CliRunner().invoke(app, ["--help"])
+
+    assert result.exit_code == 0
+    for name in SUBCOMMANDS:
+        assert name in result.output
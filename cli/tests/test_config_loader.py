@@ -0,0 +1,78 @@
+import os
+import textwrap
+from pathlib import Path
+
+from fluxloop_cli import config_loader
+from fluxloop_cli.config_loader import load_experiment_config
+
+
+def _write_scenario(root: Path) -> Path:
+    config_dir = root / "configs"
+    config_dir.mkdir(parents=True)
+    (config_dir / "scenario.yaml").write_text("name: demo\n")
+    (config_dir / "simulation.yaml").write_text(
+        textwrap.dedent(
+            """
+            name: demo_experiment
+            iterations: 2
+            inputs_file: inputs/generated.yaml
+            runner:
+              module_path: examples.simple_agent
+              function_name: run
+            """
+        ).strip()
+    )
+    inputs_dir = root / "inputs"
+    inputs_dir.mkdir()
+    (inputs_dir / "generated.yaml").write_text("inputs:\n  - input: one\n  - input: two\n")
+    return config_dir / "simulation.yaml"
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_config_cache_skips_parsing_when_unchanged(tmp_path: Path, monkeypatch) -> None:
+    config_path = _write_scenario(tmp_path)
+
+    first = load_experiment_config(config_path)
+    assert first.iterations == 2
+    assert first.get_resolved_input_count() == 2
+    assert list((tmp_path / ".state" / "cache").glob("config-*.json"))
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("configuration should have been served from cache")
+
+    monkeypatch.setattr(config_loader, "_load_experiment_config_uncached", _fail)
+    cached = load_experiment_config(config_path)
+
+    assert cached is not first
+    assert cached.iterations == 2
+    assert cached.get_source_dir() == tmp_path
+    assert cached.get_resolved_input_count() == 2
+    assert cached == first
+    assert cached.model_fields_set == first.model_fields_set
+    assert cached.runner.model_fields_set == first.runner.model_fields_set
+
+
+def test_config_cache_invalidated_by_section_and_inputs_changes(tmp_path: Path) -> None:
+    config_path = _write_scenario(tmp_path)
+    load_experiment_config(config_path)
+
+    config_path.write_text(config_path.read_text().replace("iterations: 2", "iterations: 5"))
+    _bump_mtime(config_path)
+    assert load_experiment_config(config_path).iterations == 5
+
+    inputs_path = tmp_path / "inputs" / "generated.yaml"
+    inputs_path.write_text("inputs:\n  - input: one\n")
+    _bump_mtime(inputs_path)
+    assert load_experiment_config(config_path).get_resolved_input_count() == 1
+
+
+def test_config_cache_can_be_disabled(tmp_path: Path) -> None:
+    config_path = _write_scenario(tmp_path)
+
+    load_experiment_config(config_path, use_cache=False)
+
+    assert not list((tmp_path / ".state" / "cache").glob("config-*.json"))
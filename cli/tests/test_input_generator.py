@@ -1,18 +1,27 @@
 import asyncio
+import json
 import pathlib
 from typing import List
 
+import httpx
 import pytest
+import yaml
 
 from fluxloop_cli.config_loader import load_experiment_config
 from fluxloop_cli.input_generator import (
     GenerationError,
     GenerationSettings,
     generate_inputs,
+    progress_path_for,
 )
-from fluxloop_cli.llm_generator import DEFAULT_STRATEGIES, generate_llm_inputs
+from fluxloop_cli.llm_generator import DEFAULT_STRATEGIES, _hash_prompt, generate_llm_inputs
 from fluxloop_cli.runner import ExperimentRunner
-from fluxloop.schemas import ExperimentConfig, InputGenerationMode, RunnerConfig
+from fluxloop.schemas import (
+    ExperimentConfig,
+    InputGenerationMode,
+    PersonaConfig,
+    RunnerConfig,
+)
 
 
 @pytest.fixture
@@ -44,10 +53,10 @@ class StubLLMClient:
             "model": llm_config.model,
         })
         outputs = []
-        for (_, metadata) in prompts:
+        for (_prompt, metadata) in prompts:
             outputs.append({
                 "input": f"Generated for {metadata['strategy']}",
-                "metadata": metadata,
+                "metadata": {**metadata, "prompt_hash": _hash_prompt(_prompt)},
             })
         return outputs
 
@@ -67,6 +76,84 @@ def test_generate_inputs_llm_mode(base_config: ExperimentConfig) -> None:
     assert stub.calls[0]["model"] == base_config.input_generation.llm.model
 
 
+def test_generate_inputs_streams_progress_and_resumes(
+    base_config: ExperimentConfig, tmp_path: pathlib.Path
+) -> None:
+    base_config.input_generation.mode = InputGenerationMode.LLM
+    base_config.input_generation.llm.enabled = True
+    base_config.variation_strategies = []
+
+    output_path = tmp_path / "inputs" / "generated.yaml"
+    progress_path = progress_path_for(output_path)
+
+    first = StubLLMClient()
+    generate_inputs(
+        base_config,
+        GenerationSettings(llm_client=first, limit=2, progress_path=progress_path),
+    )
+    assert len(progress_path.read_text().splitlines()) == 2
+
+    # Simulate a torn write from an interrupted run.
+    with progress_path.open("a") as handle:
+        handle.write('{"input": "trunc')
+
+    second = StubLLMClient()
+    result = generate_inputs(
+        base_config,
+        GenerationSettings(llm_client=second, progress_path=progress_path),
+    )
+
+    assert len(second.calls[0]["prompts"]) == len(base_config.base_inputs) * 3 - 2
+    assert result.entries == []
+    assert result.total_entries == len(base_config.base_inputs) * 3
+
+    result.write_yaml(output_path)
+    document = yaml.safe_load(output_path.read_text())
+    assert document["stats"]["total_generated"] == 6
+    assert len(document["inputs"]) == 6
+    assert len({row["prompt_hash"] for row in document["inputs"]}) == 6
+
+
+def test_resume_ignores_progress_from_a_different_plan(
+    base_config: ExperimentConfig, tmp_path: pathlib.Path
+) -> None:
+    base_config.input_generation.mode = InputGenerationMode.LLM
+    base_config.input_generation.llm.enabled = True
+    base_config.variation_strategies = []
+    progress_path = progress_path_for(tmp_path / "generated.yaml")
+
+    generate_inputs(
+        base_config,
+        GenerationSettings(llm_client=StubLLMClient(), progress_path=progress_path),
+    )
+    assert len(progress_path.read_text().splitlines()) == 6
+
+    # Same progress file, but the plan now covers only the first two prompts.
+    resumed = StubLLMClient()
+    result = generate_inputs(
+        base_config,
+        GenerationSettings(llm_client=resumed, limit=2, progress_path=progress_path),
+    )
+    assert resumed.calls == []
+    assert result.total_entries == 2
+
+    # A different base input shares no prompts with the earlier entries.
+    base_config.base_inputs = [{"input": "Other"}]
+    changed = StubLLMClient()
+    result = generate_inputs(
+        base_config,
+        GenerationSettings(llm_client=changed, progress_path=progress_path),
+    )
+    assert len(changed.calls[0]["prompts"]) == 3
+
+    output_path = tmp_path / "generated.yaml"
+    result.write_yaml(output_path)
+    document = yaml.safe_load(output_path.read_text())
+    assert document["stats"]["total_generated"] == 3
+    assert [row["base_index"] for row in document["inputs"]] == [0, 0, 0]
+    assert len(document["generic_user"]) == 3
+
+
 def test_load_external_inputs_relative(tmp_path: pathlib.Path) -> None:
     project_dir = tmp_path / "project"
     inputs_dir = project_dir / "inputs"
@@ -156,3 +243,126 @@ def test_openai_payload_omits_reasoning_and_text_when_unset(monkeypatch):
     payload = calls[0]
     assert "reasoning" not in payload
     assert "text" not in payload
+
+
+def _batched_llm_config(**llm_overrides) -> ExperimentConfig:
+    return ExperimentConfig(
+        name="test",
+        runner={"module_path": "examples.simple_agent", "function_name": "run"},
+        base_inputs=[{"input": "hello"}, {"input": "refund please"}],
+        input_generation={
+            "mode": "llm",
+            "llm": {
+                "enabled": True,
+                "provider": "openai",
+                "model": "gpt-4o-mini",
+                **llm_overrides,
+            },
+        },
+    )
+
+
+def test_openai_batch_size_groups_prompts_into_one_request(monkeypatch):
+    calls = []
+
+    async def fake_request_openai(client, *, config, payload):
+        calls.append(payload)
+        prompt = payload["messages"][-1]["content"]
+        count = prompt.count("### Task ")
+        outputs = [f"variation {index}" for index in range(count)]
+        return {"choices": [{"message": {"content": json.dumps({"outputs": outputs})}}]}
+
+    monkeypatch.setattr(
+        "fluxloop_cli.llm_generator._request_openai",
+        fake_request_openai,
+    )
+
+    config = _batched_llm_config(batch_size=3, temperature=0.2, max_tokens=100)
+    settings = GenerationSettings()
+    result = generate_llm_inputs(config=config, strategies=DEFAULT_STRATEGIES, settings=settings)
+
+    assert len(calls) == 2
+    assert all(payload["temperature"] == 0.2 for payload in calls)
+    assert all(payload["max_completion_tokens"] == 300 for payload in calls)
+    assert all("top_p" not in payload for payload in calls)
+    assert calls[0]["response_format"] == {"type": "json_object"}
+
+    assert len(result) == 6
+    hashes = {item["metadata"]["prompt_hash"] for item in result}
+    assert len(hashes) == 6
+    assert {item["metadata"]["base_index"] for item in result} == {0, 1}
+
+
+def test_openai_batch_falls_back_to_single_requests(monkeypatch):
+    calls = []
+
+    async def fake_request_openai(client, *, config, payload):
+        calls.append(payload)
+        if "response_format" in payload:
+            return {"choices": [{"message": {"content": "not json"}}]}
+        return {"choices": [{"message": {"content": "single"}}]}
+
+    monkeypatch.setattr(
+        "fluxloop_cli.llm_generator._request_openai",
+        fake_request_openai,
+    )
+
+    config = _batched_llm_config(batch_size=2)
+    settings = GenerationSettings(limit=2)
+    result = generate_llm_inputs(config=config, strategies=DEFAULT_STRATEGIES, settings=settings)
+
+    assert len(calls) == 3
+    assert [item["input"] for item in result] == ["single", "single"]
+
+
+@pytest.mark.parametrize("failure", ["status", "timeout"])
+def test_openai_batch_falls_back_on_http_errors(monkeypatch, failure):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        calls.append(payload)
+        if "response_format" in payload:
+            if failure == "timeout":
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(502, text="bad gateway")
+        return httpx.Response(200, json={"choices": [{"message": {"content": "single"}}]})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "fluxloop_cli.llm_generator.httpx.AsyncClient",
+        lambda: real_client(transport=httpx.MockTransport(handler)),
+    )
+
+    config = _batched_llm_config(batch_size=2)
+    settings = GenerationSettings(limit=2)
+    result = generate_llm_inputs(config=config, strategies=DEFAULT_STRATEGIES, settings=settings)
+
+    assert len(calls) == 3
+    assert [item["input"] for item in result] == ["single", "single"]
+
+
+def test_mock_provider_streams_progress(
+    base_config: ExperimentConfig, tmp_path: pathlib.Path
+) -> None:
+    base_config.input_generation.mode = InputGenerationMode.LLM
+    base_config.input_generation.llm.enabled = True
+    base_config.input_generation.llm.provider = "mock"
+    base_config.variation_strategies = []
+    base_config.personas = [
+        PersonaConfig(name="novice", description="New user"),
+        PersonaConfig(name="expert", description="Power user"),
+    ]
+    output_path = tmp_path / "generated.yaml"
+    progress_path = progress_path_for(output_path)
+
+    result = generate_inputs(base_config, GenerationSettings(progress_path=progress_path))
+
+    assert len(progress_path.read_text().splitlines()) == 12
+    assert result.entries == []
+
+    result.write_yaml(output_path)
+    document = yaml.safe_load(output_path.read_text())
+    assert document["stats"]["total_generated"] == 12
+    assert len(document["novice"]) == len(document["expert"]) == 6
+    assert len(document["inputs"]) == 12
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import os
+import pathlib
+
+import pytest
+
+from fluxloop_cli.input_loader import InputSource, open_input_source
+
+
+def test_jsonl_inputs_stream_lazily(tmp_path: pathlib.Path) -> None:
+    inputs_path = tmp_path / "inputs.jsonl"
+    inputs_path.write_text(
+        "\n".join(
+            json.dumps({"input": f"message {index}", "metadata": {"persona": "p"}})
+            for index in range(3)
+        )
+        + "\n\n"
+    )
+
+    source = InputSource(inputs_path)
+    iterator = iter(source)
+    first = next(iterator)
+
+    assert first["input"] == "message 0"
+    assert first["metadata"] == {"persona": "p"}
+    assert first["source_index"] == 0
+    assert source.validate() == 3
+    # Re-iterable: each pass streams from disk again.
+    assert [entry["input"] for entry in source] == [f"message {i}" for i in range(3)]
+
+
+def test_multi_document_yaml_inputs(tmp_path: pathlib.Path) -> None:
+    inputs_path = tmp_path / "inputs.yaml"
+    inputs_path.write_text(
+        "input: first\n"
+        "---\n"
+        "- input: second\n"
+        "- input: third\n"
+        "---\n"
+        "inputs:\n"
+        "  - input: fourth\n"
+    )
+
+    source = InputSource(inputs_path)
+
+    assert [entry["input"] for entry in source] == ["first", "second", "third", "fourth"]
+    assert source.count() == 4
+
+
+def test_validate_reports_missing_input(tmp_path: pathlib.Path) -> None:
+    inputs_path = tmp_path / "inputs.jsonl"
+    inputs_path.write_text('{"input": "ok"}\n{"metadata": {}}\n')
+
+    with pytest.raises(ValueError, match="index 1"):
+        InputSource(inputs_path).validate()
+
+
+def test_yaml_cache_reused_until_source_changes(tmp_path: pathlib.Path) -> None:
+    scenario_dir = tmp_path / "scenario"
+    (scenario_dir / "configs").mkdir(parents=True)
+    inputs_path = scenario_dir / "inputs" / "generated.yaml"
+    inputs_path.parent.mkdir()
+    inputs_path.write_text("inputs:\n  - input: one\n  - input: two\n")
+
+    source = open_input_source("inputs/generated.yaml", scenario_dir)
+    assert source.validate() == 2
+
+    cache_files = sorted(p.suffix for p in (scenario_dir / ".state" / "cache").iterdir())
+    assert cache_files == [".json", ".jsonl"]
+
+    # A fresh source reads the JSON-lines cache instead of parsing YAML.
+    cached = open_input_source("inputs/generated.yaml", scenario_dir)
+    cached._iter_yaml = None  # type: ignore[assignment]
+    assert [entry["input"] for entry in cached] == ["one", "two"]
+    assert cached.count() == 2
+
+    inputs_path.write_text("inputs:\n  - input: three\n")
+    stat = inputs_path.stat()
+    os.utime(inputs_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    refreshed = open_input_source("inputs/generated.yaml", scenario_dir)
+    assert [entry["input"] for entry in refreshed] == ["three"]
+
+
+def test_yaml_entries_json_cannot_round_trip_are_not_cached(tmp_path: pathlib.Path) -> None:
+    scenario_dir = tmp_path / "scenario"
+    (scenario_dir / "configs").mkdir(parents=True)
+    inputs_path = scenario_dir / "inputs.yaml"
+    inputs_path.write_text(
+        "inputs:\n  - input: one\n    metadata: {when: 2024-01-02, 1: numeric key}\n"
+    )
+
+    source = open_input_source("inputs.yaml", scenario_dir)
+    assert source.validate() == 1
+    assert not list((scenario_dir / ".state" / "cache").iterdir())
+
+    metadata = next(iter(source))["metadata"]
+    assert str(metadata["when"]) == "2024-01-02"
+    assert metadata[1] == "numeric key"
+
+
+def test_runner_validates_inputs_once(tmp_path: pathlib.Path, monkeypatch) -> None:
+    from fluxloop.schemas import ExperimentConfig, RunnerConfig
+
+    from fluxloop_cli.runner import ExperimentRunner
+
+    (tmp_path / "inputs.jsonl").write_text('{"input": "hi"}\n{"input": "bye"}\n')
+    config = ExperimentConfig(
+        name="once",
+        base_inputs=[],
+        inputs_file="inputs.jsonl",
+        runner=RunnerConfig(module_path="agent", function_name="run"),
+        output_directory=str(tmp_path / "outputs"),
+    )
+    config.set_source_dir(tmp_path)
+
+    calls = []
+    original = InputSource.validate
+
+    def counting_validate(self: InputSource) -> int:
+        calls.append(self.path)
+        return original(self)
+
+    monkeypatch.setattr(InputSource, "validate", counting_validate)
+
+    runner = ExperimentRunner(config, no_collector=True)
+    first = asyncio.run(runner._open_inputs())
+    second = asyncio.run(runner._open_inputs())
+
+    assert first is second
+    assert len(calls) == 1
+    assert config.get_resolved_input_count() == 2
+
+
+@pytest.mark.parametrize(
+    "filename, content",
+    [
+        (
+            "inputs.jsonl",
+            '{"input": "hi", "metadata": {"input_item_id": "a", "persona": "p"}}\n'
+            '{"input": "bye", "metadata": {"input_item_id": "b"}}\n',
+        ),
+        (
+            "inputs.yaml",
+            "input: hi\nmetadata: {input_item_id: a, persona: p}\n---\n"
+            "- input: bye\n  metadata: {input_item_id: b}\n",
+        ),
+    ],
+)
+def test_sync_inputs_mapping_reads_all_input_formats(
+    tmp_path: pathlib.Path, filename: str, content: str
+) -> None:
+    from fluxloop_cli.commands.sync import _load_inputs_mapping
+
+    inputs_path = tmp_path / filename
+    inputs_path.write_text(content)
+
+    assert _load_inputs_mapping(inputs_path) == {("hi", "p"): ["a"], ("bye", None): ["b"]}
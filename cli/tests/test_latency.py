@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from fluxloop_cli.latency import OVERFLOW_INPUT_KEY, LatencySketch, LatencyStats, input_key
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_are_within_relative_accuracy() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(5, 1.2) for _ in range(5000)]
+    sketch = LatencySketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.9, 0.95, 0.99):
+        assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.011)
+    assert sketch.quantile(0) == min(values)
+    assert sketch.quantile(1) == max(values)
+    assert sketch.count == 5000
+
+
+def test_merged_sketches_match_a_single_sketch() -> None:
+    values = [float(v) for v in range(1, 1001)]
+    whole, left, right = LatencySketch(), LatencySketch(), LatencySketch()
+    for value in values:
+        whole.add(value)
+        (left if value % 2 else right).add(value)
+
+    left.merge(LatencySketch.from_dict(right.to_dict()))
+
+    assert left.to_dict() == whole.to_dict()
+    assert left.quantile(0.99) == whole.quantile(0.99)
+
+
+def test_bins_stay_bounded() -> None:
+    values = [1.1 ** exponent for exponent in range(-2, 200)]
+    sketch = LatencySketch(max_bins=32)
+    for value in values:
+        sketch.add(value)
+
+    assert len(sketch.bins) <= 32
+    # The tail keeps its accuracy when low buckets are collapsed.
+    assert sketch.quantile(0.99) == pytest.approx(_exact(values, 0.99), rel=0.011)
+
+
+def test_empty_sketch_and_zero_values() -> None:
+    sketch = LatencySketch()
+    assert sketch.quantile(0.5) is None
+    assert sketch.summary()["p99"] is None
+
+    sketch.add(0.0)
+    sketch.add(0.0)
+    sketch.add(10.0)
+    assert sketch.quantile(0.5) == 0.0
+
+
+def test_stats_break_down_by_persona_and_input() -> None:
+    stats = LatencyStats()
+    stats.record("run_duration_ms", 100.0, persona="novice", input_key="hello")
+    stats.record("run_duration_ms", 300.0, persona="expert", input_key="hello")
+    stats.record("run_duration_ms", None, persona="expert")
+
+    summary = stats.to_dict()["run_duration_ms"]
+
+    assert summary["count"] == 2
+    assert set(summary["by_persona"]) == {"novice", "expert"}
+    assert summary["by_input"]["hello"]["count"] == 2
+    restored = LatencySketch.from_dict(summary["sketch"])
+    assert restored.quantile(1) == 300.0
+
+
+def test_inputs_are_hashed_and_capped() -> None:
+    stats = LatencyStats(max_inputs=2)
+    prompts = ["first prompt", "second prompt", "third prompt", "fourth prompt"]
+    for prompt in prompts:
+        stats.record("run_duration_ms", 10.0, input_key=input_key(prompt))
+    stats.record("run_duration_ms", 20.0, input_key=input_key("first prompt"))
+
+    by_input = stats.to_dict()["run_duration_ms"]["by_input"]
+
+    assert input_key("first prompt") == input_key("first prompt")
+    assert len(input_key("first prompt")) == 12
+    assert input_key("") is None
+    assert set(by_input) == {
+        input_key("first prompt"),
+        input_key("second prompt"),
+        OVERFLOW_INPUT_KEY,
+    }
+    assert by_input[input_key("first prompt")]["count"] == 2
+    assert by_input[OVERFLOW_INPUT_KEY]["count"] == 2
@@ -0,0 +1,34 @@
+from fluxloop_cli.payload_chunks import PayloadChunker, iter_chunks, with_last_flag
+
+
+def test_chunks_respect_item_and_byte_limits() -> None:
+    items = [("runs", {"id": i, "blob": "x" * 100}) for i in range(10)]
+
+    by_count = list(iter_chunks(items, max_items=4))
+    assert [len(chunk["runs"]) for chunk in by_count] == [4, 4, 2]
+
+    by_size = list(iter_chunks(items, max_bytes=250))
+    assert [len(chunk["runs"]) for chunk in by_size] == [2] * 5
+
+
+def test_oversized_item_is_sent_alone() -> None:
+    chunker = PayloadChunker(max_bytes=10)
+
+    assert chunker.add("turns", {"content": "x" * 50}) is None
+    emitted = chunker.add("turns", {"content": "y"})
+    assert emitted == {"turns": [{"content": "x" * 50}]}
+    assert chunker.flush() == {"turns": [{"content": "y"}]}
+
+
+def test_sections_share_a_chunk_and_empty_stream_yields_one_chunk() -> None:
+    chunks = list(iter_chunks([("runs", {"id": 1}), ("turns", {"id": 2})]))
+    assert chunks == [{"runs": [{"id": 1}], "turns": [{"id": 2}]}]
+
+    assert list(iter_chunks([])) == [{}]
+
+
+def test_with_last_flag_marks_final_chunk() -> None:
+    flagged = list(with_last_flag(iter([{"a": []}, {"b": []}, {"c": []}])))
+
+    assert [(index, last) for index, _, last in flagged] == [(0, False), (1, False), (2, True)]
+    assert list(with_last_flag(iter([]))) == []
@@ -0,0 +1,39 @@
+import time
+
+from fluxloop_cli.phase_timer import PhaseTimer, overhead_ms
+
+
+def test_nested_phases_are_charged_self_time_only() -> None:
+    timer = PhaseTimer()
+    run = timer.start_run()
+
+    with timer.phase("turn_recording"):
+        time.sleep(0.01)
+        with timer.phase("turn_streaming"):
+            time.sleep(0.02)
+
+    assert run["turn_streaming"] >= 20
+    assert 10 <= run["turn_recording"] < 20
+    assert timer.calls == {"turn_recording": 1, "turn_streaming": 1}
+
+
+def test_runs_are_tracked_separately_and_totalled() -> None:
+    timer = PhaseTimer()
+    first = timer.start_run()
+    with timer.phase("agent"):
+        pass
+    second = timer.start_run()
+    with timer.phase("buffer_flush"):
+        pass
+    with timer.phase("buffer_flush"):
+        pass
+
+    assert set(first) == {"agent"}
+    assert set(second) == {"buffer_flush"}
+    summary = timer.summary()
+    assert summary["calls"] == {"agent": 1, "buffer_flush": 2}
+    assert summary["overhead_ms"] == round(timer.totals["buffer_flush"], 3)
+
+
+def test_agent_and_supervisor_are_not_overhead() -> None:
+    assert overhead_ms({"agent": 50.0, "supervisor": 20.0, "buffer_flush": 1.5}) == 1.5
@@ -0,0 +1,134 @@
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+
+from fluxloop import reset_config
+from fluxloop.schemas import ExperimentConfig, RunnerConfig
+
+from fluxloop_cli.profiling import ExperimentProfiler, collapse_stack
+from fluxloop_cli.runner import ExperimentRunner
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_collapse_stack_is_root_first() -> None:
+    import sys
+
+    stack = collapse_stack(sys._getframe())
+
+    assert stack.split(";")[-1].startswith("test_collapse_stack_is_root_first (")
+
+
+def test_sampling_profiler_writes_collapsed_stacks(tmp_path: Path) -> None:
+    profiler = ExperimentProfiler("sampling", tmp_path, interval_seconds=0.001)
+
+    session = profiler.start_run()
+    _busy(0.05)
+    path = profiler.finish_run(session, "trace-1")
+    aggregate = profiler.finalize()
+
+    lines = path.read_text().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("_busy (test_profiling.py" in line for line in lines)
+    assert aggregate == tmp_path / "profile.collapsed"
+    assert aggregate.read_text() == path.read_text()
+
+
+def _outer() -> None:
+    _busy(0.02)
+    _inner()
+
+
+def _inner() -> None:
+    _busy(0.01)
+
+
+def test_cprofile_aggregate_includes_collapsed_stacks(tmp_path: Path) -> None:
+    profiler = ExperimentProfiler("cprofile", tmp_path)
+
+    session = profiler.start_run()
+    _outer()
+    profiler.finish_run(session, "trace-1")
+    aggregate = profiler.finalize()
+
+    assert aggregate == tmp_path / "profile.pstats"
+    folded = {}
+    for line in (tmp_path / "profile.collapsed").read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        folded[stack] = int(count)
+    inner_busy = [
+        (stack, count) for stack, count in folded.items()
+        if ";_inner (" in stack and stack.rsplit(";", 1)[1].startswith("_busy (")
+    ]
+    assert len(inner_busy) == 1
+    stack, count = inner_busy[0]
+    assert stack.index("_outer (") < stack.index("_inner (")
+    # Self time of _busy under _inner is about 10ms (reported in microseconds).
+    assert 5_000 < count < 200_000
+
+
+def test_profile_every_nth_run(tmp_path: Path) -> None:
+    profiler = ExperimentProfiler("cprofile", tmp_path, every=2)
+
+    sessions = [profiler.start_run() for _ in range(4)]
+
+    assert [session is not None for session in sessions] == [True, False, True, False]
+    for index, session in enumerate(sessions):
+        if session is not None:
+            profiler.finish_run(session, f"run_{index}")
+    assert profiler.profiled_runs == 2
+
+
+def test_unknown_mode_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        ExperimentProfiler("perf", tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_runner_profiles_sync_agent_in_worker_thread(tmp_path: Path) -> None:
+    (tmp_path / "slow_agent.py").write_text(
+        "import time\n"
+        "def spin(seconds):\n"
+        "    deadline = time.perf_counter() + seconds\n"
+        "    while time.perf_counter() < deadline:\n"
+        "        pass\n"
+        "def run(input: str, **kwargs):\n"
+        "    spin(0.02)\n"
+        "    return input\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "inputs.yaml").write_text('inputs:\n  - input: "hello"\n', encoding="utf-8")
+    config = ExperimentConfig(
+        name="profiled",
+        iterations=2,
+        base_inputs=[],
+        inputs_file="inputs.yaml",
+        runner=RunnerConfig(
+            module_path="slow_agent", function_name="run", python_path=[str(tmp_path)]
+        ),
+        output_directory=str(tmp_path / "outputs"),
+    )
+    config.set_source_dir(tmp_path)
+    config.set_resolved_input_count(1)
+
+    runner = ExperimentRunner(config, no_collector=True, profile="cprofile")
+    try:
+        results = await runner.run_experiment()
+    finally:
+        reset_config()
+
+    assert results["profile"]["runs_profiled"] == 2
+    trace = runner.results["traces"][0]
+    per_run = runner.output_dir / trace["profile_path"]
+    assert per_run.suffix == ".pstats" and trace["trace_id"] in per_run.name
+
+    stats = pstats.Stats(str(runner.output_dir / results["profile"]["path"]))
+    entries = stats.stats  # type: ignore[attr-defined]
+    spin_calls = [value[1] for key, value in entries.items() if key[2] == "spin"]
+    assert spin_calls == [2]
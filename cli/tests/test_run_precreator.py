@@ -0,0 +1,134 @@
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+from fluxloop_cli.run_precreator import RunPrecreator
+
+
+def _runs(count: int) -> List[Dict[str, Any]]:
+    return [{"id": f"run-{i}", "status": "running"} for i in range(count)]
+
+
+def test_first_chunk_is_sent_before_start_returns() -> None:
+    release = threading.Event()
+    sent: List[int] = []
+
+    def post(index: int, chunk: List[Dict[str, Any]]) -> str:
+        if index > 0:
+            release.wait(5)
+        sent.append(index)
+        return "batch-1"
+
+    precreator = RunPrecreator(_runs(25), post_chunk=post, chunk_size=10, backoff_seconds=0)
+
+    assert precreator.start() == "batch-1"
+    assert sent == [0]
+    assert precreator.wait_for("run-3", timeout=0)
+    assert not precreator.wait_for("run-15", timeout=0.05)
+
+    release.set()
+    stats = precreator.close(timeout=5)
+
+    assert sent == [0, 1, 2]
+    assert precreator.wait_for("run-24", timeout=0)
+    assert (stats.registered, stats.failed, stats.chunks) == (25, 0, 3)
+
+
+def test_failed_chunk_is_retried_after_later_chunks() -> None:
+    attempts: List[int] = []
+
+    def post(index: int, chunk: List[Dict[str, Any]]) -> None:
+        attempts.append(index)
+        if index == 1 and attempts.count(1) == 1:
+            raise RuntimeError("boom")
+
+    precreator = RunPrecreator(
+        _runs(30), post_chunk=post, chunk_size=10, backoff_seconds=0, quiet=True
+    )
+    precreator.start()
+    stats = precreator.close(timeout=5)
+
+    assert attempts == [0, 1, 2, 1]
+    assert stats.failed == 0
+
+
+def test_chunk_is_abandoned_after_max_rounds() -> None:
+    def post(index: int, chunk: List[Dict[str, Any]]) -> None:
+        if index == 1:
+            raise RuntimeError("boom")
+
+    precreator = RunPrecreator(
+        _runs(20), post_chunk=post, chunk_size=10, max_rounds=2, backoff_seconds=0, quiet=True
+    )
+    precreator.start()
+    stats = precreator.close(timeout=5)
+
+    assert (stats.registered, stats.failed) == (10, 10)
+    assert precreator.wait_for("run-0", timeout=0)
+    assert not precreator.wait_for("run-12", timeout=0)
+
+
+def test_first_chunk_failure_propagates() -> None:
+    def post(index: int, chunk: List[Dict[str, Any]]) -> None:
+        raise RuntimeError("unreachable")
+
+    with pytest.raises(RuntimeError):
+        RunPrecreator(_runs(3), post_chunk=post, quiet=True).start()
+
+
+@pytest.mark.asyncio
+async def test_runner_waits_for_run_ids_off_the_event_loop(tmp_path) -> None:
+    import asyncio
+    import uuid
+
+    from fluxloop import reset_config
+    from fluxloop.schemas import ExperimentConfig, RunnerConfig
+
+    from fluxloop_cli.runner import ExperimentRunner
+
+    (tmp_path / "precreate_agent.py").write_text(
+        "def run(input: str, **kwargs):\n    return input\n", encoding="utf-8"
+    )
+    (tmp_path / "inputs.yaml").write_text('inputs:\n  - input: "hello"\n', encoding="utf-8")
+    config = ExperimentConfig(
+        name="precreate",
+        iterations=1,
+        base_inputs=[],
+        inputs_file="inputs.yaml",
+        runner=RunnerConfig(
+            module_path="precreate_agent", function_name="run", python_path=[str(tmp_path)]
+        ),
+        output_directory=str(tmp_path / "outputs"),
+    )
+    config.set_source_dir(tmp_path)
+    run_id = str(uuid.uuid4())
+    ticks: List[int] = []
+
+    def provider(variation, persona, iteration):
+        # Stands in for RunPrecreator.wait_for blocking on a pending chunk; the
+        # loop keeps ticking only if the wait happens off the event loop.
+        for _ in range(200):
+            if len(ticks) >= 3:
+                return run_id
+            threading.Event().wait(0.01)
+        return None
+
+    async def ticker() -> None:
+        while len(ticks) < 3:
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    reset_config()
+    try:
+        runner = ExperimentRunner(config, no_collector=True)
+        tick_task = asyncio.ensure_future(ticker())
+        results = await asyncio.wait_for(
+            runner.run_experiment(run_id_provider=provider), timeout=10
+        )
+        await tick_task
+    finally:
+        reset_config()
+
+    assert results["successful"] == 1
+    assert runner.results["traces"][0]["trace_id"] == run_id
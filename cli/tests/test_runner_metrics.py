@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+
+from fluxloop import metrics, reset_config
+from fluxloop.schemas import ExperimentConfig, RunnerConfig
+
+from fluxloop_cli.runner import ExperimentRunner
+
+
+@pytest.mark.asyncio
+async def test_runner_publishes_run_metrics(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "echo_agent.py").write_text(
+        "def run(input: str, **kwargs):\n"
+        "    if input == 'boom':\n"
+        "        raise RuntimeError('boom')\n"
+        "    return input\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "inputs.yaml").write_text(
+        'inputs:\n  - input: "hello"\n  - input: "boom"\n', encoding="utf-8"
+    )
+    config = ExperimentConfig(
+        name="metrics",
+        iterations=1,
+        base_inputs=[],
+        inputs_file="inputs.yaml",
+        runner=RunnerConfig(
+            module_path="echo_agent", function_name="run", python_path=[str(tmp_path)]
+        ),
+        output_directory=str(tmp_path / "outputs"),
+    )
+    config.set_source_dir(tmp_path)
+    monkeypatch.setenv("FLUXLOOP_METRICS_ENABLED", "true")
+    reset_config()
+    metrics.disable_metrics()
+
+    try:
+        runner = ExperimentRunner(config, no_collector=True)
+        await runner.run_experiment()
+        registry = metrics.get_registry()
+        assert registry is not None
+
+        completed = registry.counter("fluxloop_runner_runs_completed")
+        assert completed.value(status="success") == 1
+        assert completed.value(status="failure") == 1
+        assert registry.gauge("fluxloop_runner_runs_in_flight").value() == 0
+        latency = registry.histogram("fluxloop_runner_latency_seconds")
+        assert latency.count(metric="run_duration") == 1
+        assert "fluxloop_runner_runs_completed_total" in registry.render()
+    finally:
+        metrics.disable_metrics()
+        reset_config()
@@ -1,11 +1,12 @@
 """Unit tests covering multi-turn execution in the experiment runner."""
 
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
 from fluxloop import reset_config
+from fluxloop.sinks import InMemorySink
 from fluxloop.schemas import (
     ExperimentConfig,
     MultiTurnConfig,
@@ -13,6 +14,7 @@ from fluxloop.schemas import (
     RunnerConfig,
 )
 
+from fluxloop_cli.latency import input_key
 from fluxloop_cli.runner import ExperimentRunner
 
 
@@ -241,3 +243,144 @@ async def test_run_multi_turn_records_normalized_conversation(tmp_path: Path) ->
     assert len(state_turns) == len(conversation)
     assert state_turns[-1]["content"] == "Appreciate the help."
 
+
+@pytest.mark.asyncio
+async def test_run_single_records_runner_phases(tmp_path: Path) -> None:
+    _write_agent(tmp_path / "phase_agent.py")
+    config = ExperimentConfig(
+        name="runner-phases-test",
+        iterations=1,
+        base_inputs=[{"input": "stub"}],
+        runner=RunnerConfig(
+            module_path="phase_agent",
+            function_name="run",
+            python_path=[str(tmp_path)],
+        ),
+        output_directory=str(tmp_path / "outputs"),
+    )
+    config.set_source_dir(tmp_path)
+    config.set_resolved_input_count(1)
+
+    runner = ExperimentRunner(config, no_collector=True)
+    agent_func = runner._load_agent()
+
+    try:
+        await runner._run_single(
+            agent_func,
+            variation={"input": "hello"},
+            persona=None,
+            iteration=0,
+        )
+    finally:
+        reset_config()
+
+    trace = runner.results["traces"][0]
+    phases = trace["runner_phases_ms"]
+    assert {"agent", "buffer_flush", "load_observations", "summarize_actions"} <= set(phases)
+    assert trace["runner_overhead_ms"] == pytest.approx(
+        sum(value for name, value in phases.items() if name != "agent"), abs=0.01
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_multi_turn_records_latency(tmp_path: Path) -> None:
+    _write_agent(tmp_path / "latency_agent.py")
+    config = ExperimentConfig(
+        name="multi-turn-latency-test",
+        iterations=1,
+        base_inputs=[{"input": "stub"}],
+        runner=RunnerConfig(
+            module_path="latency_agent",
+            function_name="run",
+            python_path=[str(tmp_path)],
+        ),
+        multi_turn=MultiTurnConfig(
+            enabled=True,
+            max_turns=3,
+            auto_approve_tools=True,
+            supervisor=MultiTurnSupervisorConfig(
+                provider="mock",
+                metadata={
+                    "scripted_questions": ["Second turn question"],
+                    "mock_reason": "done",
+                    "mock_closing": "Appreciate the help.",
+                },
+            ),
+        ),
+        output_directory=str(tmp_path / "outputs"),
+    )
+    config.set_source_dir(tmp_path)
+    config.set_resolved_input_count(1)
+    config.set_resolved_persona_count(1)
+
+    runner = ExperimentRunner(config, no_collector=True)
+    agent_func = runner._load_agent()
+
+    try:
+        await runner._run_multi_turn(
+            agent_func,
+            variation={"input": "First", "metadata": {}},
+            persona=None,
+            iteration=0,
+            turn_progress_callback=None,
+        )
+    finally:
+        reset_config()
+
+    latency = runner.latency.to_dict()
+    assert latency["agent_turn_ms"]["count"] == 2
+    assert latency["supervisor_ms"]["count"] == 2
+    assert latency["run_duration_ms"]["count"] == 1
+    assert latency["run_duration_ms"]["by_input"][input_key("First")]["count"] == 1
+    assert latency["agent_turn_ms"]["p95"] is not None
+
+
+@pytest.mark.asyncio
+async def test_run_experiment_reads_observations_from_memory_sink(tmp_path: Path) -> None:
+    (tmp_path / "traced_agent.py").write_text(
+        (
+            "import fluxloop\n"
+            "\n"
+            "@fluxloop.trace(name='agent_final_response')\n"
+            "def respond(text):\n"
+            "    return f'final: {text}'\n"
+            "\n"
+            "def run(input: str, **kwargs):\n"
+            "    respond(input)\n"
+            "    return None\n"
+        ),
+        encoding="utf-8",
+    )
+    (tmp_path / "inputs.yaml").write_text('inputs:\n  - input: "hi"\n', encoding="utf-8")
+    config = ExperimentConfig(
+        name="memory-sink-test",
+        iterations=1,
+        base_inputs=[],
+        inputs_file="inputs.yaml",
+        runner=RunnerConfig(
+            module_path="traced_agent",
+            function_name="run",
+            python_path=[str(tmp_path)],
+        ),
+        output_directory=str(tmp_path / "outputs"),
+    )
+    config.set_source_dir(tmp_path)
+
+    runner = ExperimentRunner(config, no_collector=True)
+    loaded = []
+    original = InMemorySink.pop_observations
+
+    def _spy(sink, trace_id):
+        observations = original(sink, trace_id)
+        loaded.extend(observations)
+        return observations
+
+    try:
+        with patch.object(InMemorySink, "pop_observations", _spy):
+            await runner.run_experiment()
+    finally:
+        reset_config()
+
+    assert [obs["name"] for obs in loaded] == ["agent_final_response"]
+    assert runner.results["traces"][0]["output"] == "final: hi"
+    assert runner._memory_sink is None
@@ -0,0 +1,387 @@
+import gzip
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+from typer.testing import CliRunner
+
+from fluxloop_cli.main import app
+
+
+class SyncStub:
+    """Local sync API + storage server recording every request."""
+
+    def __init__(self, *, accept_encoding: str = "", reject_encoded_upload: bool = False) -> None:
+        self.accept_encoding = accept_encoding
+        self.reject_encoded_upload = reject_encoded_upload
+        self.requests: List[Dict[str, Any]] = []
+        self.bundle: Dict[str, Any] = {}
+        self.etag = ""
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.uploads: List[dict] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _read(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def _json(self, payload: Any, status: int = 200) -> None:
+                raw = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                if stub.accept_encoding:
+                    self.send_header("Accept-Encoding", stub.accept_encoding)
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def do_POST(self) -> None:
+                raw = self._read()
+                encoding = self.headers.get("Content-Encoding")
+                stub.requests.append(
+                    {
+                        "method": "POST",
+                        "path": self.path,
+                        "encoding": encoding,
+                        "if_none_match": self.headers.get("If-None-Match"),
+                    }
+                )
+                if self.path == "/api/sync/pull":
+                    if stub.etag and self.headers.get("If-None-Match") == stub.etag:
+                        self.send_response(304)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    raw_bundle = json.dumps(stub.bundle).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(raw_bundle)))
+                    if stub.etag:
+                        self.send_header("ETag", stub.etag)
+                    self.end_headers()
+                    self.wfile.write(raw_bundle)
+                    return
+                if encoding and stub.reject_encoded_upload and self.path == "/api/sync/upload":
+                    self._json({"detail": "unsupported encoding"}, status=415)
+                    return
+                body = json.loads(gzip.decompress(raw) if encoding == "gzip" else raw)
+                if self.path == "/api/storage/presign/batch":
+                    self._json({"items": [stub.presign(item, self) for item in body["items"]]})
+                elif self.path == "/api/storage/presign":
+                    self._json(stub.presign(body, self))
+                elif self.path == "/api/sync/upload":
+                    stub.uploads.append(body)
+                    self._json({"run_batch_id": "batch-1"})
+                else:
+                    self._json({}, status=404)
+
+            def do_PUT(self) -> None:
+                raw = self._read()
+                encoding = self.headers.get("Content-Encoding")
+                stub.requests.append({"method": "PUT", "path": self.path, "encoding": encoding})
+                stub.objects[self.path] = {"encoding": encoding, "body": raw}
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def presign(self, item: dict, handler: BaseHTTPRequestHandler) -> dict:
+        key = f"{item['run_id']}/{item['artifact_type']}/{item['filename']}"
+        presign = {
+            "upload_url": f"{self.url}/storage/{key}",
+            "storage_url": f"s3://bucket/{key}",
+            "headers": {},
+        }
+        if self.accept_encoding:
+            presign["accept_encoding"] = [self.accept_encoding]
+        return presign
+
+    def __enter__(self) -> "SyncStub":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _write_experiment(root: Path, traces: int = 4) -> Path:
+    (root / "configs").mkdir()
+    (root / "configs" / "scenario.yaml").write_text("name: demo\n")
+    (root / "configs" / "simulation.yaml").write_text(
+        "name: demo\niterations: 1\ninputs_file: inputs/generated.yaml\n"
+        "output_directory: experiments\nrunner:\n  module_path: agent\n  function_name: run\n"
+    )
+    (root / "inputs").mkdir()
+    inputs = [
+        {"input": f"question {i}", "metadata": {"input_item_id": f"item-{i}"}}
+        for i in range(traces)
+    ]
+    (root / "inputs" / "generated.yaml").write_text(yaml.safe_dump({"inputs": inputs}))
+    (root / ".state").mkdir()
+    (root / ".state" / "sync.json").write_text(
+        json.dumps({"bundle_version_id": "bundle-1", "project_id": "project-1"})
+    )
+
+    experiment = root / "experiments" / "exp_20250101_000000"
+    (experiment / "per_trace_analysis").mkdir(parents=True)
+    with (experiment / "trace_summary.jsonl").open("w") as handle:
+        for i in range(traces):
+            trace_id = str(uuid.UUID(int=i + 1))
+            conversation = [{"role": "user", "content": f"question {i} " * 40}]
+            handle.write(
+                json.dumps(
+                    {
+                        "trace_id": trace_id,
+                        "input": f"question {i}",
+                        "success": True,
+                        "duration_ms": 10,
+                        "conversation": conversation,
+                    }
+                )
+                + "\n"
+            )
+            (experiment / "per_trace_analysis" / f"{i:03d}_{trace_id}.md").write_text("# trace\n")
+    (experiment / "summary.json").write_text("{}")
+    (experiment / "observations.jsonl").write_text('{"type": "span", "name": "agent"}\n' * 500)
+    return experiment
+
+
+def _upload(root: Path, stub: SyncStub, monkeypatch, *args: str):
+    monkeypatch.chdir(root)
+    monkeypatch.setenv("FLUXLOOP_SYNC_URL", stub.url)
+    monkeypatch.setenv("FLUXLOOP_SYNC_API_KEY", "key")
+    result = CliRunner().invoke(app, ["sync", "upload", *args])
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def test_upload_compresses_when_server_advertises_gzip(tmp_path: Path, monkeypatch) -> None:
+    experiment = _write_experiment(tmp_path)
+
+    with SyncStub(accept_encoding="gzip") as stub:
+        _upload(tmp_path, stub, monkeypatch)
+
+    observations = next(o for p, o in stub.objects.items() if p.endswith("observations.jsonl"))
+    assert observations["encoding"] == "gzip"
+    assert gzip.decompress(observations["body"]) == (experiment / "observations.jsonl").read_bytes()
+
+    # Small artifacts are not worth compressing.
+    summary = next(o for p, o in stub.objects.items() if p.endswith("summary.json"))
+    assert summary["encoding"] is None
+
+    final = [r for r in stub.requests if r["path"] == "/api/sync/upload"]
+    assert [r["encoding"] for r in final] == ["gzip"]
+    assert len(stub.uploads[0]["runs"]) == 4
+
+
+def test_upload_sends_identity_without_advertised_support(tmp_path: Path, monkeypatch) -> None:
+    _write_experiment(tmp_path)
+
+    with SyncStub() as stub:
+        _upload(tmp_path, stub, monkeypatch)
+
+    assert all(request["encoding"] is None for request in stub.requests)
+    assert len(stub.uploads) == 1
+
+
+def test_upload_falls_back_when_encoded_body_is_rejected(tmp_path: Path, monkeypatch) -> None:
+    _write_experiment(tmp_path)
+
+    with SyncStub(accept_encoding="gzip", reject_encoded_upload=True) as stub:
+        _upload(tmp_path, stub, monkeypatch)
+
+    final = [r["encoding"] for r in stub.requests if r["path"] == "/api/sync/upload"]
+    assert final == ["gzip", None]
+    assert len(stub.uploads) == 1
+
+
+def test_compression_can_be_disabled(tmp_path: Path, monkeypatch) -> None:
+    _write_experiment(tmp_path)
+
+    with SyncStub(accept_encoding="gzip") as stub:
+        _upload(tmp_path, stub, monkeypatch, "--compression", "none")
+
+    assert all(request["encoding"] is None for request in stub.requests)
+
+
+def test_unknown_compression_mode_is_rejected(tmp_path: Path, monkeypatch) -> None:
+    _write_experiment(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FLUXLOOP_SYNC_API_KEY", "key")
+
+    result = CliRunner().invoke(app, ["sync", "upload", "--compression", "brotli"])
+
+    assert result.exit_code != 0
+
+
+def test_large_upload_is_sent_in_chunks(tmp_path: Path, monkeypatch) -> None:
+    from fluxloop_cli.commands import sync
+
+    experiment = _write_experiment(tmp_path, traces=6)
+    with (experiment / "turns.jsonl").open("w") as handle:
+        for i in range(6):
+            handle.write(
+                json.dumps(
+                    {"run_id": str(uuid.UUID(int=i + 1)), "turn_id": f"t{i}", "sequence": 0}
+                )
+                + "\n"
+            )
+    monkeypatch.setattr(sync, "UPLOAD_CHUNK_MAX_ITEMS", 5)
+
+    with SyncStub() as stub:
+        result = _upload(tmp_path, stub, monkeypatch)
+
+    assert len(stub.uploads) > 1
+    sections = ("runs", "run_results", "turns", "turn_summaries")
+    assert all(sum(len(u[key]) for key in sections) <= 5 for u in stub.uploads)
+    assert [u["upload_meta"]["chunk_index"] for u in stub.uploads] == list(range(len(stub.uploads)))
+    assert [u["upload_meta"]["final"] for u in stub.uploads][-1] is True
+    assert {u["run_batch"]["status"] for u in stub.uploads[:-1]} == {"running"}
+    assert stub.uploads[-1]["run_batch"]["status"] == "completed"
+    assert all(not u["artifacts"] for u in stub.uploads[:-1])
+    assert stub.uploads[-1]["artifacts"]
+
+    runs = [run["id"] for upload in stub.uploads for run in upload["runs"]]
+    assert runs == [str(uuid.UUID(int=i + 1)) for i in range(6)]
+    assert sum(len(u["turns"]) for u in stub.uploads) == 6
+    assert sum(len(u["turn_summaries"]) for u in stub.uploads) == 6
+    assert f"{len(stub.uploads)} chunks" in result.output
+
+
+def test_small_upload_keeps_single_request_format(tmp_path: Path, monkeypatch) -> None:
+    _write_experiment(tmp_path)
+
+    with SyncStub() as stub:
+        _upload(tmp_path, stub, monkeypatch)
+
+    assert len(stub.uploads) == 1
+    assert stub.uploads[0]["upload_meta"] == {}
+    assert stub.uploads[0]["turns"] == []
+
+
+def test_input_item_index_prefers_persona_then_falls_back_by_text() -> None:
+    from fluxloop_cli.commands.sync import _InputItemIndex
+
+    index = _InputItemIndex(
+        {
+            ("hello", "bob"): ["bob-1"],
+            ("hello", "alice"): ["alice-1", "alice-2"],
+            ("bye", None): ["bye-1"],
+        }
+    )
+
+    assert index.peek("hello", "bob") == "bob-1"
+    assert index.take("hello", "bob") == "bob-1"
+    # Exhausted persona falls back to the remaining ids for the same text.
+    assert index.take("hello", "bob") == "alice-1"
+    assert index.take("bye", "carol") == "bye-1"
+    assert index.take("bye", None) is None
+    assert index.peek("unknown", None) is None
+
+
+def test_per_trace_markdown_index_matches_trace_ids(tmp_path: Path) -> None:
+    from fluxloop_cli.commands.sync import _find_per_trace_markdown, _index_per_trace_markdown
+
+    (tmp_path / "00_trace-a.md").write_text("a")
+    (tmp_path / "trace-b-analysis.md").write_text("b")
+
+    index = _index_per_trace_markdown(tmp_path)
+
+    assert _find_per_trace_markdown("trace-a", index) == tmp_path / "00_trace-a.md"
+    assert _find_per_trace_markdown("trace-b", index) == tmp_path / "trace-b-analysis.md"
+    assert _find_per_trace_markdown("trace-c", index) is None
+
+
+def _bundle(version: str, criteria: str) -> Dict[str, Any]:
+    return {
+        "bundle_version": {"id": version, "project_id": "project-1"},
+        "personas": [{"id": "p1", "name": "novice"}],
+        "input_items": [
+            {"id": "item-1", "persona_id": "p1", "messages": [{"role": "user", "content": "hi"}]}
+        ],
+        "criteria_pack": [{"name": "tone", "rule": criteria}],
+        "sync_meta": {"pulled_at": f"pulled-{version}"},
+    }
+
+
+def _pull(root: Path, stub: SyncStub, monkeypatch, *args: str):
+    monkeypatch.chdir(root)
+    monkeypatch.setenv("FLUXLOOP_SYNC_URL", stub.url)
+    monkeypatch.setenv("FLUXLOOP_SYNC_API_KEY", "key")
+    result = CliRunner().invoke(app, ["sync", "pull", "--project-id", "project-1", *args])
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def _mtimes(root: Path) -> Dict[str, int]:
+    return {
+        str(path.relative_to(root)): path.stat().st_mtime_ns
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+def test_unchanged_bundle_pull_is_a_no_op(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "configs").mkdir()
+    (tmp_path / "configs" / "scenario.yaml").write_text("name: demo\n")
+
+    with SyncStub() as stub:
+        stub.bundle, stub.etag = _bundle("v1", "polite"), '"v1"'
+        _pull(tmp_path, stub, monkeypatch)
+        before = _mtimes(tmp_path)
+
+        result = _pull(tmp_path, stub, monkeypatch)
+
+    pulls = [r for r in stub.requests if r["path"] == "/api/sync/pull"]
+    assert [r["if_none_match"] for r in pulls] == [None, '"v1"']
+    assert "Bundle unchanged" in result.output
+    assert _mtimes(tmp_path) == before
+
+
+def test_changed_bundle_rewrites_only_changed_files(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "configs").mkdir()
+    (tmp_path / "configs" / "scenario.yaml").write_text("name: demo\n")
+
+    with SyncStub() as stub:
+        stub.bundle, stub.etag = _bundle("v1", "polite"), '"v1"'
+        _pull(tmp_path, stub, monkeypatch)
+        inputs = tmp_path / "inputs" / "generated.yaml"
+        inputs_mtime = inputs.stat().st_mtime_ns
+
+        stub.bundle, stub.etag = _bundle("v2", "formal"), '"v2"'
+        _pull(tmp_path, stub, monkeypatch)
+
+    assert inputs.stat().st_mtime_ns == inputs_mtime
+    criteria = next((tmp_path / ".state" / "criteria").glob("*.yaml"))
+    assert "formal" in criteria.read_text()
+    state = json.loads((tmp_path / ".state" / "sync.json").read_text())
+    assert state["bundle_version_id"] == "v2"
+
+
+def test_pull_restores_deleted_files_from_cache(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "configs").mkdir()
+    (tmp_path / "configs" / "scenario.yaml").write_text("name: demo\n")
+
+    with SyncStub() as stub:
+        stub.bundle, stub.etag = _bundle("v1", "polite"), '"v1"'
+        _pull(tmp_path, stub, monkeypatch)
+        inputs = tmp_path / "inputs" / "generated.yaml"
+        inputs.unlink()
+
+        _pull(tmp_path, stub, monkeypatch)
+        assert inputs.exists()
+
+        _pull(tmp_path, stub, monkeypatch, "--force")
+
+    pulls = [r for r in stub.requests if r["path"] == "/api/sync/pull"]
+    assert [r["if_none_match"] for r in pulls] == [None, '"v1"', None]
@@ -0,0 +1,135 @@
+import json
+from typing import List
+
+import httpx
+
+from fluxloop_cli.turn_streamer import TurnStreamer
+
+BATCH_ENDPOINT = "/api/sync/turns/batch"
+
+
+def _turn(run_id: str, sequence: int) -> dict:
+    return {
+        "run_id": run_id,
+        "turn_id": f"{run_id}-{sequence}",
+        "sequence": sequence,
+        "role": "assistant" if sequence % 2 else "user",
+        "content": f"message {sequence}",
+        "internal": "not streamed",
+    }
+
+
+def _streamer(handler, **kwargs) -> TurnStreamer:
+    options = dict(
+        api_url="http://sync.test",
+        api_key="secret",
+        batch_window_seconds=0.5,
+        backoff_seconds=0.0,
+        quiet=True,
+        transport=httpx.MockTransport(handler),
+    )
+    options.update(kwargs)
+    return TurnStreamer(**options)
+
+
+def test_coalesced_turns_are_posted_per_turn_in_run_order() -> None:
+    turns: List[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/sync/turns"
+        turns.append(json.loads(request.content))
+        return httpx.Response(200, json={"ok": True})
+
+    streamer = _streamer(handler, batch_size=10).start()
+    for turn in [_turn("a", 2), _turn("b", 1), _turn("a", 1), _turn("b", 2), _turn("a", 3)]:
+        assert streamer.submit(turn)
+    stats = streamer.close()
+
+    assert (stats.delivered, stats.dropped) == (5, 0)
+    assert [t["sequence"] for t in turns if t["run_id"] == "a"] == [1, 2, 3]
+    assert [t["sequence"] for t in turns if t["run_id"] == "b"] == [1, 2]
+    assert "internal" not in turns[0]
+    assert turns[0]["warnings"] == []
+
+
+def test_configured_batch_endpoint_receives_ordered_batches() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    streamer = _streamer(handler, batch_size=10, batch_endpoint=BATCH_ENDPOINT).start()
+    for turn in [_turn("a", 2), _turn("b", 1), _turn("a", 1), _turn("b", 2), _turn("a", 3)]:
+        assert streamer.submit(turn)
+    stats = streamer.close()
+
+    assert (stats.delivered, stats.dropped) == (5, 0)
+    assert [request.url.path for request in requests] == [BATCH_ENDPOINT]
+    assert requests[0].headers["Authorization"] == "Bearer secret"
+
+    turns = json.loads(requests[0].content)["turns"]
+    assert [(t["run_id"], t["sequence"]) for t in turns] == [
+        ("a", 1), ("a", 2), ("a", 3), ("b", 1), ("b", 2)
+    ]
+    assert "internal" not in turns[0]
+    assert turns[0]["warnings"] == []
+
+
+def test_falls_back_to_single_turn_posts_without_batch_endpoint() -> None:
+    paths: List[str] = []
+    delivered: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path.endswith("/batch"):
+            return httpx.Response(404)
+        payload = json.loads(request.content)
+        assert request.headers["Idempotency-Key"] == f"{payload['run_id']}:{payload['turn_id']}"
+        delivered.append(payload["turn_id"])
+        return httpx.Response(200)
+
+    streamer = _streamer(handler, batch_size=10, batch_endpoint=BATCH_ENDPOINT).start()
+    for turn in [_turn("a", 3), _turn("a", 1), _turn("a", 2)]:
+        streamer.submit(turn)
+    stats = streamer.close()
+
+    assert stats.delivered == 3
+    assert delivered == ["a-1", "a-2", "a-3"]
+    assert paths.count(BATCH_ENDPOINT) == 1
+
+
+def test_rejected_batch_is_retried_per_run() -> None:
+    paths: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path.endswith("/batch"):
+            return httpx.Response(422)
+        return httpx.Response(200)
+
+    streamer = _streamer(handler, batch_size=10, batch_endpoint=BATCH_ENDPOINT).start()
+    for turn in [_turn("a", 1), _turn("b", 1)]:
+        streamer.submit(turn)
+    stats = streamer.close()
+
+    assert (stats.delivered, stats.dropped) == (2, 0)
+    assert sorted(paths) == ["/api/sync/turns", "/api/sync/turns", BATCH_ENDPOINT]
+    # Only 404/405/501 mark the batch endpoint as unsupported.
+    assert streamer._batch_supported
+
+
+def test_failed_turns_are_reported_as_dropped() -> None:
+    attempts: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.url.path)
+        return httpx.Response(503)
+
+    streamer = _streamer(handler, batch_size=1, max_retries=2).start()
+    streamer.submit(_turn("a", 1))
+    assert not streamer.submit({"run_id": "a"})
+    stats = streamer.close()
+
+    assert (stats.delivered, stats.dropped) == (0, 2)
+    assert attempts == ["/api/sync/turns"] * 3
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from fluxloop_cli.turns import ResultMarkdownWriter, render_result_markdown, summarize_turns
+
+
+def _turn(sequence: int, warnings=None) -> dict:
+    turn = {
+        "run_id": "run",
+        "sequence": sequence,
+        "role": "assistant",
+        "content": f"reply {sequence}",
+    }
+    if warnings:
+        turn["warnings"] = warnings
+    return turn
+
+
+def test_result_writer_appends_turns_and_updates_summary(tmp_path: Path) -> None:
+    path = tmp_path / "result.md"
+    writer = ResultMarkdownWriter(path)
+    writer.start()
+    header_size = path.stat().st_size
+
+    turns = [_turn(1), _turn(2, [{"type": "length", "message": "too long"}]), _turn(3)]
+    sizes = []
+    for turn in turns:
+        writer.append_turn(turn)
+        sizes.append(path.stat().st_size)
+
+    text = path.read_text(encoding="utf-8")
+    assert "- Turns: 3 (1 warning turns)" in text
+    assert "- Warnings: 1" in text
+    assert text.index("### Turn 1") < text.index("### Turn 2") < text.index("### Turn 3")
+    assert "- too long" in text
+
+    # Each turn only adds its own section; the header keeps a fixed size.
+    first_section = sizes[0] - header_size
+    assert sizes[2] - sizes[1] == first_section
+
+    summary = summarize_turns(turns)["run"]
+    final = render_result_markdown(turns, summary, [])
+    stripped = "\n".join(line.rstrip() for line in text.splitlines()) + "\n"
+    assert stripped == final
@@ -0,0 +1,77 @@
+"""
+Compare two benchmark reports (``tracing.py`` or the CLI's ``runner.py``).
+
+Every numeric leaf present in both reports is listed with its relative change.
+Metrics named ``*_per_second`` are throughputs (higher is better); everything
+else is a time (lower is better). ``--threshold`` flags regressions larger than
+the given percentage and makes the script exit non-zero.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json [--threshold 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+# Counters describing the workload rather than its performance.
+SKIPPED_KEYS = {"runs", "failed", "turns", "events", "spans_per_call"}
+
+
+def _numeric_leaves(node: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in SKIPPED_KEYS:
+                continue
+            yield from _numeric_leaves(value, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        yield prefix, float(node)
+
+
+def compare(
+    baseline: Dict[str, Any], candidate: Dict[str, Any], threshold: float
+) -> Dict[str, Any]:
+    before = dict(_numeric_leaves(baseline.get("results", {})))
+    after = dict(_numeric_leaves(candidate.get("results", {})))
+    metrics: Dict[str, Any] = {}
+    regressions = []
+    for name in sorted(before.keys() & after.keys()):
+        old, new = before[name], after[name]
+        change = (new - old) / old * 100 if old else 0.0
+        worse = -change if name.endswith("_per_second") else change
+        metrics[name] = {"baseline": old, "candidate": new, "change_pct": round(change, 2)}
+        if threshold and worse > threshold:
+            regressions.append(name)
+    return {
+        "benchmark": candidate.get("benchmark"),
+        "baseline_commit": baseline.get("commit"),
+        "candidate_commit": candidate.get("commit"),
+        "metrics": metrics,
+        "regressions": regressions,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.0)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    candidate = json.loads(args.candidate.read_text(encoding="utf-8"))
+    if baseline.get("benchmark") != candidate.get("benchmark"):
+        parser.error("reports come from different benchmarks")
+
+    report = compare(baseline, candidate, args.threshold)
+    print(json.dumps(report, indent=2))
+    if report["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
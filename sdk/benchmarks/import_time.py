@@ -0,0 +1,60 @@
+"""
+Cold-start import benchmark for the FluxLoop SDK.
+
+Each sample runs in a fresh interpreter so module caches never carry over.
+
+Usage:
+    python benchmarks/import_time.py [--runs 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+SCENARIOS: Dict[str, str] = {
+    "import": "import fluxloop",
+    "import+get_config": "import fluxloop; fluxloop.get_config()",
+    "import+decorate": (
+        "import fluxloop\n"
+        "@fluxloop.agent()\n"
+        "def run(message):\n"
+        "    return message\n"
+    ),
+    "import+client": "import fluxloop; fluxloop.FluxLoopClient",
+}
+
+
+def _measure(code: str, runs: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = statistics.median(_measure("pass", args.runs))
+    report = {"runs": args.runs, "interpreter_ms": round(baseline, 2), "scenarios": {}}
+    for name, code in SCENARIOS.items():
+        samples = _measure(code, args.runs)
+        report["scenarios"][name] = {
+            "median_ms": round(statistics.median(samples) - baseline, 2),
+            "min_ms": round(min(samples) - baseline, 2),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
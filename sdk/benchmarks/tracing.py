@@ -0,0 +1,248 @@
+"""
+Tracing overhead benchmark for the FluxLoop SDK.
+
+Measures, against a temporary offline store:
+
+- ``span_overhead``: cost per ``@trace`` span for synthetic sync, async and
+  async-generator agents with ``--spans`` nested spans, relative to the same
+  agent undecorated
+- ``flush``: events per second moved from the ``EventBuffer`` to the offline store
+- ``offline_store``: events per second written by ``OfflineStore`` directly
+
+Compare two reports with ``benchmarks/compare.py``.
+
+Usage:
+    python benchmarks/tracing.py [--runs 200] [--spans 5] [--events 5000] [--output report.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import fluxloop
+from fluxloop.buffer import EventBuffer
+from fluxloop.models import ObservationData, ObservationType, TraceData
+from fluxloop.storage import OfflineStore
+
+
+def _nested(depth: int, traced: bool) -> Callable[[str], str]:
+    """Build a sync call chain ``depth`` levels deep."""
+
+    def leaf(text: str) -> str:
+        return text
+
+    func = leaf
+    for level in range(depth):
+
+        def step(text: str, _inner: Callable[[str], str] = func) -> str:
+            return _inner(text)
+
+        func = fluxloop.trace(name=f"span_{level}")(step) if traced else step
+    return func
+
+
+def _nested_async(depth: int, traced: bool) -> Callable[[str], Any]:
+    async def leaf(text: str) -> str:
+        return text
+
+    func: Callable[[str], Any] = leaf
+    for level in range(depth):
+
+        async def step(text: str, _inner: Callable[[str], Any] = func) -> str:
+            return await _inner(text)
+
+        func = fluxloop.trace(name=f"span_{level}")(step) if traced else step
+    return func
+
+
+def _make_agents(depth: int, traced: bool) -> Dict[str, Callable[[], Any]]:
+    """Return a zero-argument driver per agent style."""
+    sync_chain = _nested(depth, traced)
+    async_chain = _nested_async(depth, traced)
+
+    def sync_agent() -> str:
+        return sync_chain("hello")
+
+    async def async_agent() -> str:
+        return await async_chain("hello")
+
+    async def async_gen_agent() -> AsyncIterator[str]:
+        for chunk in ("hel", "lo"):
+            yield await async_chain(chunk)
+
+    async def drain() -> str:
+        return "".join([chunk async for chunk in async_gen_agent()])
+
+    return {"sync": sync_agent, "async": async_agent, "async_gen": drain}
+
+
+def _time_calls(driver: Callable[[], Any], runs: int, traced: bool) -> List[float]:
+    """Microseconds per agent call, each call in its own trace when ``traced``."""
+    loop = asyncio.new_event_loop()
+    samples: List[float] = []
+    try:
+        for _ in range(runs):
+            started = time.perf_counter()
+            if traced:
+                with fluxloop.instrument("benchmark"):
+                    result = driver()
+                    if asyncio.iscoroutine(result):
+                        loop.run_until_complete(result)
+            else:
+                result = driver()
+                if asyncio.iscoroutine(result):
+                    loop.run_until_complete(result)
+            samples.append((time.perf_counter() - started) * 1e6)
+    finally:
+        loop.close()
+    return samples
+
+
+def bench_span_overhead(runs: int, spans: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    plain = _make_agents(spans, traced=False)
+    traced = _make_agents(spans, traced=True)
+    # Async-gen agents open their chain once per chunk.
+    span_counts = {"sync": spans, "async": spans, "async_gen": spans * 2}
+    for style in plain:
+        # Warm up imports, caches and the buffer singleton.
+        _time_calls(traced[style], min(runs, 20), traced=True)
+        base = statistics.median(_time_calls(plain[style], runs, traced=False))
+        samples = _time_calls(traced[style], runs, traced=True)
+        median = statistics.median(samples)
+        results[style] = {
+            "spans_per_call": span_counts[style],
+            "baseline_us": round(base, 3),
+            "median_us": round(median, 3),
+            "p95_us": round(_percentile(samples, 0.95), 3),
+            "per_span_us": round((median - base) / max(1, span_counts[style]), 3),
+        }
+    EventBuffer.get_instance().flush()
+    return results
+
+
+def _synthetic_events(count: int) -> Tuple[List[TraceData], List[Tuple[UUID, ObservationData]]]:
+    now = datetime.now(timezone.utc)
+    traces: List[TraceData] = []
+    observations: List[Tuple[UUID, ObservationData]] = []
+    per_trace = 4
+    for _ in range(max(1, count // (per_trace + 1))):
+        trace = TraceData(id=uuid4(), name="benchmark", start_time=now, end_time=now)
+        traces.append(trace)
+        for index in range(per_trace):
+            observations.append(
+                (
+                    trace.id,
+                    ObservationData(
+                        id=uuid4(),
+                        type=ObservationType.SPAN,
+                        name=f"span_{index}",
+                        start_time=now,
+                        end_time=now,
+                        input={"args": ["hello"]},
+                        output="hello",
+                    ),
+                )
+            )
+    return traces, observations
+
+
+def bench_flush(events: int, runs: int) -> Dict[str, Any]:
+    buffer = EventBuffer.get_instance()
+    rates: List[float] = []
+    total = 0
+    for _ in range(runs):
+        traces, observations = _synthetic_events(events)
+        total = len(traces) + len(observations)
+        with buffer.send_lock:
+            buffer.traces.extend(traces)
+            buffer.observations.extend(observations)
+        started = time.perf_counter()
+        buffer.flush()
+        rates.append(total / (time.perf_counter() - started))
+    return {"events": total, "events_per_second": round(statistics.median(rates), 1)}
+
+
+def bench_offline_store(events: int, runs: int) -> Dict[str, Any]:
+    store = OfflineStore()
+    rates: List[float] = []
+    total = 0
+    for _ in range(runs):
+        traces, observations = _synthetic_events(events)
+        total = len(traces) + len(observations)
+        started = time.perf_counter()
+        store.record_traces(traces)
+        store.record_observations(observations)
+        rates.append(total / (time.perf_counter() - started))
+    return {"events": total, "events_per_second": round(statistics.median(rates), 1)}
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def git_commit(cwd: Optional[Path] = None) -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=cwd or Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--spans", type=int, default=5)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="fluxloop-bench-") as tmp:
+        fluxloop.configure(
+            use_collector=False,
+            offline_store_enabled=True,
+            offline_store_dir=tmp,
+            batch_size=100,
+            max_queue_size=max(args.events * 2, 10000),
+            flush_interval=3600,
+        )
+        write_runs = max(1, args.runs // 40)
+        report = {
+            "benchmark": "sdk_tracing",
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "params": {"runs": args.runs, "spans": args.spans, "events": args.events},
+            "results": {
+                "span_overhead": bench_span_overhead(args.runs, args.spans),
+                "flush": bench_flush(args.events, write_runs),
+                "offline_store": bench_offline_store(args.events, write_runs),
+            },
+        }
+        EventBuffer.get_instance().shutdown()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,81 @@
 FluxLoop SDK - Agent instrumentation and tracing library.
 """
 
+from typing import TYPE_CHECKING, Any
+
+from .config import configure, get_config, load_env, reset_config
 from .context import FluxLoopContext, get_current_context, instrument
 from .decorators import agent, prompt, tool, trace
-from .schemas import (
-    ExperimentConfig,
-    PersonaConfig,
-    RunnerConfig,
-    VariationStrategy,
-    Trace,
-    Observation,
-    ObservationType,
-    ObservationLevel,
-    Score,
-    ScoreDataType,
-    TraceStatus,
-)
-from .client import FluxLoopClient
-from .config import configure, get_config, reset_config, load_env
-from .recording import (
-    disable_recording,
-    enable_recording,
-    record_call_args,
-    set_recording_options,
-)
+
+if TYPE_CHECKING:  # pragma: no cover - imported lazily at runtime
+    from .client import FluxLoopClient
+    from .metrics import disable_metrics, enable_metrics, metrics_snapshot
+    from .otlp import OTLPExporter
+    from .sinks import CallbackSink, InMemorySink, Sink
+    from .recording import (
+        disable_recording,
+        enable_recording,
+        record_call_args,
+        set_recording_options,
+    )
+    from .schemas import (
+        ExperimentConfig,
+        Observation,
+        ObservationLevel,
+        ObservationType,
+        PersonaConfig,
+        RunnerConfig,
+        Score,
+        ScoreDataType,
+        Trace,
+        TraceStatus,
+        VariationStrategy,
+    )
+
+# Attributes resolved on first access: the HTTP client pulls in httpx and the
+# schema package builds many pydantic models, neither of which decorators need.
+_LAZY_ATTRIBUTES = {
+    "FluxLoopClient": "client",
+    "enable_metrics": "metrics",
+    "disable_metrics": "metrics",
+    "metrics_snapshot": "metrics",
+    "OTLPExporter": "otlp",
+    "Sink": "sinks",
+    "InMemorySink": "sinks",
+    "CallbackSink": "sinks",
+    "disable_recording": "recording",
+    "enable_recording": "recording",
+    "record_call_args": "recording",
+    "set_recording_options": "recording",
+    "ExperimentConfig": "schemas",
+    "PersonaConfig": "schemas",
+    "RunnerConfig": "schemas",
+    "VariationStrategy": "schemas",
+    "Trace": "schemas",
+    "Observation": "schemas",
+    "ObservationType": "schemas",
+    "ObservationLevel": "schemas",
+    "Score": "schemas",
+    "ScoreDataType": "schemas",
+    "TraceStatus": "schemas",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
+
 
 __version__ = "0.1.7"
 
@@ -40,6 +92,11 @@ __all__ = [
     "FluxLoopContext",
     # Client
     "FluxLoopClient",
+    "OTLPExporter",
+    # Export sinks
+    "Sink",
+    "InMemorySink",
+    "CallbackSink",
     # Config
     "configure",
     "load_env",
@@ -49,6 +106,10 @@ __all__ = [
     "disable_recording",
     "set_recording_options",
     "record_call_args",
+    # Metrics
+    "enable_metrics",
+    "disable_metrics",
+    "metrics_snapshot",
     # Schemas - configs
     "ExperimentConfig",
     "PersonaConfig",
@@ -5,14 +5,42 @@ Event buffering and batch sending logic.
 import atexit
 import threading
 import time
-from collections import deque
+from collections import OrderedDict, deque
 from typing import Deque, List, Optional, Tuple
 from uuid import UUID
 
+from . import metrics
 from .config import get_config
 from .models import ObservationData, TraceData
+from .sinks import (
+    CollectorSink,
+    OfflineStoreSink,
+    OTLPSink,
+    Sink,
+    SinkWorker,
+)
 from .storage import OfflineStore
 
+QUEUE_DEPTH = "fluxloop_buffer_queue_depth"
+QUEUE_DEPTH_HELP = "Events waiting in the buffer"
+
+# Event ids remembered to de-duplicate offline fallback writes across sinks.
+FALLBACK_ID_MEMORY = 10000
+
+
+def _record_enqueue(
+    registry: metrics.MetricsRegistry, kind: str, depth: int, dropped: bool
+) -> None:
+    registry.gauge(QUEUE_DEPTH, QUEUE_DEPTH_HELP).set(depth, kind=kind)
+    registry.counter("fluxloop_buffer_enqueued_events", "Events added to the buffer").inc(
+        kind=kind
+    )
+    if dropped:
+        registry.counter(
+            "fluxloop_buffer_dropped_events",
+            "Oldest events discarded because the buffer was full",
+        ).inc(kind=kind)
+
 
 class EventBuffer:
     """
@@ -37,6 +65,17 @@ class EventBuffer:
         self.send_lock = threading.Lock()
         self.last_flush = time.time()
 
+        # Offline store, plus the ids of events already written there as a
+        # fallback so several failing sinks store each event once
+        self.offline_store = OfflineStore()
+        self._fallback_ids: "OrderedDict[UUID, None]" = OrderedDict()
+        self._fallback_lock = threading.Lock()
+
+        # Export sinks, each with its own worker queue, batching and retries
+        self.sinks: List[SinkWorker] = []
+        for sink in self._default_sinks():
+            self.add_sink(sink)
+
         # Background thread for periodic flushing
         self.stop_event = threading.Event()
         self.flush_thread = threading.Thread(
@@ -47,8 +86,7 @@ class EventBuffer:
         # Register cleanup on exit
         atexit.register(self.shutdown)
 
-        # Offline store
-        self.offline_store = OfflineStore()
+        metrics.enable_metrics_from_config(self.config)
 
     @classmethod
     def get_instance(cls) -> "EventBuffer":
@@ -59,6 +97,42 @@ class EventBuffer:
                     cls._instance = cls()
         return cls._instance
 
+    def _default_sinks(self) -> List[Sink]:
+        sinks: List[Sink] = []
+        if self.config.use_collector:
+            sinks.append(CollectorSink())
+        else:
+            # Without a collector the offline store is the primary record.
+            sinks.append(OfflineStoreSink(self.offline_store))
+        if self.config.otlp_endpoint:
+            sinks.append(OTLPSink())
+        return sinks
+
+    def add_sink(self, sink: Sink) -> SinkWorker:
+        """
+        Register an export sink; every later flush is also sent to it.
+
+        Args:
+            sink: Sink to register
+        """
+        worker = SinkWorker(
+            sink,
+            batch_size=self.config.batch_size,
+            max_queue_size=self.config.max_queue_size,
+            on_failure=self._handle_sink_failure,
+        )
+        with self.send_lock:
+            self.sinks = self.sinks + [worker]
+        return worker
+
+    def remove_sink(self, sink: Sink, timeout: Optional[float] = None) -> None:
+        """Drain and detach a previously registered sink."""
+        with self.send_lock:
+            workers = [worker for worker in self.sinks if worker.sink is sink]
+            self.sinks = [worker for worker in self.sinks if worker.sink is not sink]
+        for worker in workers:
+            worker.close(timeout)
+
     def add_trace(self, trace: TraceData) -> None:
         """
         Add a trace to the buffer.
@@ -70,7 +144,13 @@ class EventBuffer:
             return
 
         with self.send_lock:
+            dropped = len(self.traces) == self.traces.maxlen
             self.traces.append(trace)
+            depth = len(self.traces)
+
+        registry = metrics.get_registry()
+        if registry is not None:
+            _record_enqueue(registry, "trace", depth, dropped)
 
     def add_observation(self, trace_id: UUID, observation: ObservationData) -> None:
         """
@@ -84,7 +164,13 @@ class EventBuffer:
             return
 
         with self.send_lock:
+            dropped = len(self.observations) == self.observations.maxlen
             self.observations.append((trace_id, observation))
+            depth = len(self.observations)
+
+        registry = metrics.get_registry()
+        if registry is not None:
+            _record_enqueue(registry, "observation", depth, dropped)
 
     def flush_if_needed(self) -> None:
         """Flush the buffer if batch size is reached."""
@@ -97,8 +183,14 @@ class EventBuffer:
         if should_flush:
             self.flush()
 
-    def flush(self) -> None:
-        """Send all buffered events to the collector."""
+    def flush(self, wait: bool = True) -> None:
+        """
+        Send all buffered events to the registered sinks.
+
+        Args:
+            wait: Block until every sink has exported (or given up on) the
+                events, bounded by the configured timeout per sink
+        """
         if not self.config.enabled:
             return
 
@@ -115,61 +207,107 @@ class EventBuffer:
                 observations_to_send.append(self.observations.popleft())
 
             self.last_flush = time.time()
+            sinks = self.sinks
 
-        # Send if there's data
-        if traces_to_send or observations_to_send:
-            self._send_batch(traces_to_send, observations_to_send)
+        registry = metrics.get_registry()
+        if registry is not None and (traces_to_send or observations_to_send):
+            registry.gauge(QUEUE_DEPTH, QUEUE_DEPTH_HELP).set(0, kind="trace")
+            registry.gauge(QUEUE_DEPTH, QUEUE_DEPTH_HELP).set(0, kind="observation")
+        started = time.perf_counter()
 
-    def _send_batch(
-        self, traces: List[TraceData], observations: List[Tuple[UUID, ObservationData]]
+        # Fan out; each sink exports on its own worker
+        if traces_to_send or observations_to_send:
+            for worker in sinks:
+                worker.submit(traces_to_send, observations_to_send)
+
+        if wait:
+            deadline = time.monotonic() + self._flush_timeout()
+            for worker in sinks:
+                worker.wait_idle(max(0.0, deadline - time.monotonic()))
+
+        if registry is not None and (traces_to_send or observations_to_send):
+            registry.histogram(
+                "fluxloop_buffer_flush_duration_seconds",
+                "Time spent sending one flushed batch",
+            ).observe(time.perf_counter() - started)
+
+    def _flush_timeout(self) -> float:
+        # Enough for a full round of retries against a slow endpoint.
+        return self.config.timeout * 3 + 1.0
+
+    def _handle_sink_failure(
+        self,
+        sink: Sink,
+        traces: List[TraceData],
+        observations: List[Tuple[UUID, ObservationData]],
+        error: Exception,
     ) -> None:
-        """
-        Send a batch of events to the collector.
-
-        Args:
-            traces: List of traces to send
-            observations: List of (trace_id, observation) tuples
-        """
-        # Import here to avoid circular dependency
-        send_errors = False
-
-        if self.config.use_collector:
-            from .client import FluxLoopClient
-
-            client = FluxLoopClient()
-
-            for trace in traces:
-                try:
-                    client.send_trace(trace)
-                except Exception as e:
-                    send_errors = True
-                    if self.config.debug:
-                        print(f"Failed to send trace {trace.id}: {e}")
-
-            for trace_id, observation in observations:
-                try:
-                    client.send_observation(trace_id, observation)
-                except Exception as e:
-                    send_errors = True
-                    if self.config.debug:
-                        print(f"Failed to send observation {observation.id}: {e}")
-
-        if send_errors or not self.config.use_collector:
+        """Record a batch a sink gave up on and keep it in the offline store."""
+        if self.config.debug:
+            print(
+                f"Sink '{sink.name}' failed to export {len(traces)} traces and "
+                f"{len(observations)} observations: {error}"
+            )
+        fallback = (
+            sink.offline_fallback
+            and self.config.offline_store_enabled
+            and not self._has_offline_sink()
+        )
+        stored = 0
+        if fallback:
+            traces, observations = self._claim_for_fallback(traces, observations)
             self.offline_store.record_traces(traces)
             self.offline_store.record_observations(observations)
+            stored = len(traces) + len(observations)
+
+        registry = metrics.get_registry()
+        if registry is None:
+            return
+        failures = registry.counter(
+            "fluxloop_buffer_send_failures", "Events a sink failed to export after retries"
+        )
+        if traces:
+            failures.inc(len(traces), kind="trace", sink=sink.name)
+        if observations:
+            failures.inc(len(observations), kind="observation", sink=sink.name)
+        if stored:
+            registry.counter(
+                "fluxloop_buffer_offline_fallbacks",
+                "Events written to the offline store after a send failure",
+            ).inc(stored, sink=sink.name)
+
+    def _has_offline_sink(self) -> bool:
+        # An offline store sink already records every event.
+        return any(isinstance(worker.sink, OfflineStoreSink) for worker in self.sinks)
+
+    def _claim_for_fallback(
+        self,
+        traces: List[TraceData],
+        observations: List[Tuple[UUID, ObservationData]],
+    ) -> Tuple[List[TraceData], List[Tuple[UUID, ObservationData]]]:
+        """Keep only events no other failing sink has written to the offline store."""
+        with self._fallback_lock:
+            seen = self._fallback_ids
+            fresh_traces = [trace for trace in traces if trace.id not in seen]
+            fresh_observations = [item for item in observations if item[1].id not in seen]
+            for event_id in [trace.id for trace in fresh_traces] + [
+                observation.id for _, observation in fresh_observations
+            ]:
+                seen[event_id] = None
+            while len(seen) > FALLBACK_ID_MEMORY:
+                seen.popitem(last=False)
+        return fresh_traces, fresh_observations
 
     def _flush_periodically(self) -> None:
         """Background thread to flush periodically."""
-        while not self.stop_event.is_set():
-            time.sleep(self.config.flush_interval)
-
+        while not self.stop_event.wait(self.config.flush_interval):
             # Check if enough time has passed since last flush
             with self.send_lock:
                 time_since_flush = time.time() - self.last_flush
                 has_data = bool(self.traces or self.observations)
 
             if has_data and time_since_flush >= self.config.flush_interval:
-                self.flush()
+                self.flush(wait=False)
 
     def shutdown(self) -> None:
         """Shutdown the buffer and flush remaining events."""
@@ -182,3 +320,8 @@ class EventBuffer:
         # Wait for thread to stop (with timeout)
         if self.flush_thread.is_alive():
             self.flush_thread.join(timeout=2.0)
+
+        with self.send_lock:
+            workers, self.sinks = self.sinks, []
+        for worker in workers:
+            worker.close(timeout=2.0)
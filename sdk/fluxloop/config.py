@@ -7,13 +7,25 @@ from __future__ import annotations
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Optional
 from urllib.parse import urlparse
 
-from dotenv import load_dotenv
 from pydantic import BaseModel, Field, field_validator
 
-from .recording import disable_recording, enable_recording
+from .models import ObservationType
+
+# Set once the default `.env` lookup has run; deferred until the config is needed.
+_default_env_loaded = False
+
+
+def _load_default_env(*, override: bool = True) -> bool:
+    """Load the `.env` file discovered from the working directory."""
+
+    global _default_env_loaded
+    from dotenv import load_dotenv
+
+    _default_env_loaded = True
+    return load_dotenv(override=override)
 
 
 def load_env(
@@ -35,7 +47,13 @@ def load_env(
     """
 
     if dotenv_path is None:
-        return load_dotenv(override=override)
+        return _load_default_env(override=override)
+
+    from dotenv import load_dotenv
+
+    # Keep the original precedence: the default `.env` first, explicit files on top.
+    if not _default_env_loaded:
+        _load_default_env()
 
     candidate = Path(dotenv_path).expanduser()
     if candidate.is_dir():
@@ -43,7 +61,7 @@ def load_env(
 
     loaded = load_dotenv(dotenv_path=str(candidate), override=override)
 
-    if refresh_config and globals().get("_config") is not None:
+    if refresh_config and _config is not None:
         _refresh_config_from_env()
 
     return loaded
@@ -66,6 +84,8 @@ def _resolve_recording_path(path: Optional[str]) -> Path:
 def _apply_recording_config(config: "SDKConfig") -> None:
     """Enable or disable argument recording based on configuration."""
 
+    from .recording import disable_recording, enable_recording
+
     if config.record_args:
         resolved_path = _resolve_recording_path(config.recording_file)
         enable_recording(str(resolved_path))
@@ -78,8 +98,27 @@ def _apply_recording_config(config: "SDKConfig") -> None:
             print("🎥 Argument recording disabled")
 
 
-# Load environment variables (default behaviour on import)
-load_env()
+def _optional_env(name: str, cast: Callable[[str], Any]) -> Any:
+    value = os.getenv(name)
+    return cast(value) if value else None
+
+
+def _parse_key_values(value: str) -> Dict[str, str]:
+    """Parse ``key=value,key=value`` pairs (e.g. OTEL_EXPORTER_OTLP_HEADERS).
+
+    Items without ``=`` are skipped.
+    """
+    pairs: Dict[str, str] = {}
+    for item in value.split(","):
+        key, sep, item_value = item.partition("=")
+        if sep and key.strip():
+            pairs[key.strip()] = item_value.strip()
+    return pairs
+
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse ``type=rate,type=rate`` (e.g. ``generation=1,span=0.1``)."""
+    return {key: float(rate) for key, rate in _parse_key_values(value).items()}
 
 
 class SDKConfig(BaseModel):
@@ -139,6 +178,59 @@ class SDKConfig(BaseModel):
     sample_rate: float = Field(
         default_factory=lambda: float(os.getenv("FLUXLOOP_SAMPLE_RATE", "1.0"))
     )
+    # "head" decides when a trace starts; "tail" decides in finalize()
+    sampling_mode: str = Field(
+        default_factory=lambda: os.getenv("FLUXLOOP_SAMPLING_MODE", "head").lower()
+    )
+    # Per-ObservationType rates, e.g. {"generation": 1.0, "span": 0.1}
+    observation_sample_rates: Dict[str, float] = Field(
+        default_factory=lambda: _parse_sample_rates(
+            os.getenv("FLUXLOOP_OBSERVATION_SAMPLE_RATES", "")
+        ),
+        validate_default=True,
+    )
+    # Process-wide cap on recorded observations per second
+    max_spans_per_second: Optional[float] = Field(
+        default_factory=lambda: _optional_env("FLUXLOOP_MAX_SPANS_PER_SECOND", float)
+    )
+    tail_keep_errors: bool = Field(
+        default_factory=lambda: os.getenv("FLUXLOOP_TAIL_KEEP_ERRORS", "true").lower()
+        == "true"
+    )
+    tail_latency_threshold_ms: Optional[float] = Field(
+        default_factory=lambda: _optional_env("FLUXLOOP_TAIL_LATENCY_MS", float)
+    )
+    tail_token_threshold: Optional[int] = Field(
+        default_factory=lambda: _optional_env("FLUXLOOP_TAIL_TOKEN_THRESHOLD", int)
+    )
+    tail_max_trace_observations: int = Field(
+        default_factory=lambda: int(os.getenv("FLUXLOOP_TAIL_MAX_TRACE_OBSERVATIONS", "1000"))
+    )
+    tail_max_buffered_observations: int = Field(
+        default_factory=lambda: int(
+            os.getenv("FLUXLOOP_TAIL_MAX_BUFFERED_OBSERVATIONS", "10000")
+        )
+    )
+
+    # OpenTelemetry export (OTLP/HTTP); enabled when an endpoint is set
+    otlp_endpoint: Optional[str] = Field(
+        default_factory=lambda: os.getenv("FLUXLOOP_OTLP_ENDPOINT")
+    )
+    otlp_protocol: str = Field(
+        default_factory=lambda: os.getenv("FLUXLOOP_OTLP_PROTOCOL", "http/protobuf")
+    )
+    otlp_headers: Dict[str, str] = Field(
+        default_factory=lambda: _parse_key_values(os.getenv("FLUXLOOP_OTLP_HEADERS", ""))
+    )
+
+    # Health metrics (opt-in); a port also serves /metrics on localhost
+    metrics_enabled: bool = Field(
+        default_factory=lambda: os.getenv("FLUXLOOP_METRICS_ENABLED", "false").lower()
+        == "true"
+    )
+    metrics_port: Optional[int] = Field(
+        default_factory=lambda: _optional_env("FLUXLOOP_METRICS_PORT", int)
+    )
 
     # Metadata
     service_name: Optional[str] = Field(
@@ -161,6 +253,20 @@ class SDKConfig(BaseModel):
             raise ValueError(f"Invalid collector URL: {e}")
         return value.rstrip("/")  # Remove trailing slash
 
+    @field_validator("otlp_protocol")
+    def validate_otlp_protocol(cls, value: str) -> str:
+        """Ensure the OTLP protocol is supported."""
+        if value not in ("http/protobuf", "http/json"):
+            raise ValueError("otlp_protocol must be 'http/protobuf' or 'http/json'")
+        return value
+
+    @field_validator("sampling_mode")
+    def validate_sampling_mode(cls, value: str) -> str:
+        """Ensure the sampling mode is known."""
+        if value not in ("head", "tail"):
+            raise ValueError("sampling_mode must be 'head' or 'tail'")
+        return value
+
     @field_validator("sample_rate")
     def validate_sample_rate(cls, value: float) -> float:
         """Ensure sample rate is between 0 and 1."""
@@ -168,6 +274,26 @@ class SDKConfig(BaseModel):
             raise ValueError("sample_rate must be between 0 and 1")
         return value
 
+    @field_validator("observation_sample_rates", mode="before")
+    def validate_observation_sample_rates(cls, value: Dict[Any, float]) -> Dict[str, float]:
+        """Normalize observation types and ensure each rate is between 0 and 1."""
+        rates: Dict[str, float] = {}
+        for key, rate in (value or {}).items():
+            name = key.value if isinstance(key, ObservationType) else str(key).lower()
+            if name not in ObservationType._value2member_map_:
+                raise ValueError(f"Unknown observation type in observation_sample_rates: {key}")
+            if not 0 <= float(rate) <= 1:
+                raise ValueError("observation_sample_rates values must be between 0 and 1")
+            rates[name] = float(rate)
+        return rates
+
+    @field_validator("max_spans_per_second")
+    def validate_max_spans_per_second(cls, value: Optional[float]) -> Optional[float]:
+        """Ensure the span rate limit is positive."""
+        if value is not None and value <= 0:
+            raise ValueError("max_spans_per_second must be positive")
+        return value
+
     @field_validator("batch_size")
     def validate_batch_size(cls, value: int) -> int:
         """Ensure batch size is reasonable."""
@@ -178,9 +304,9 @@ class SDKConfig(BaseModel):
         return value
 
 
-# Global configuration instance
-_config = SDKConfig()
-_apply_recording_config(_config)
+# Global configuration instance, built from the environment on first use so that
+# importing the SDK has no side effects (no `.env` reads, no recording files).
+_config: Optional[SDKConfig] = None
 
 
 def _refresh_config_from_env() -> None:
@@ -210,15 +336,17 @@ def configure(**kwargs: Any) -> SDKConfig:
     """
     global _config
 
+    current = get_config()
+
     # Update configuration with provided values
     for key, value in kwargs.items():
-        if hasattr(_config, key):
-            setattr(_config, key, value)
+        if hasattr(current, key):
+            setattr(current, key, value)
         else:
             raise ValueError(f"Unknown configuration parameter: {key}")
 
     # Re-validate the configuration
-    _config = SDKConfig(**_config.model_dump())
+    _config = SDKConfig(**current.model_dump())
 
     _apply_recording_config(_config)
 
@@ -227,12 +355,19 @@ def configure(**kwargs: Any) -> SDKConfig:
 
 def get_config() -> SDKConfig:
     """Get current SDK configuration."""
+    if _config is None:
+        if not _default_env_loaded:
+            _load_default_env()
+        _refresh_config_from_env()
+    assert _config is not None
     return _config
 
 
 def reset_config() -> SDKConfig:
     """Reset configuration to defaults."""
     global _config
+    if not _default_env_loaded:
+        _load_default_env()
     _config = SDKConfig()
     _apply_recording_config(_config)
     return _config
@@ -3,15 +3,24 @@ Context management for tracing.
 """
 
 import contextvars
-import random
 from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterator, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 from uuid import UUID, uuid4
 
 from .buffer import EventBuffer
 from .config import get_config
 from .models import ObservationData, TraceData
+from .sampling import (
+    HEAD,
+    REASON_OVERFLOW,
+    TAIL,
+    head_sample,
+    record_decision,
+    sample_observation,
+    tail_budget,
+    tail_decision,
+)
 
 
 # Context variable for current FluxLoop context
@@ -19,6 +28,15 @@ _context_var: contextvars.ContextVar[Optional["FluxLoopContext"]] = (
     contextvars.ContextVar("fluxloop_context", default=None)
 )
 
+# Observations open in the current task or thread, innermost last, tagged with
+# their owning context. asyncio tasks start from a copy of their creator's
+# stack, so concurrent children (asyncio.gather, parallel tools) push and pop
+# independently while still seeing the span that spawned them as parent.
+_StackEntry = Tuple["FluxLoopContext", ObservationData]
+_stack_var: contextvars.ContextVar[Tuple[_StackEntry, ...]] = contextvars.ContextVar(
+    "fluxloop_observation_stack", default=()
+)
+
 
 class FluxLoopContext:
     """
@@ -61,17 +79,32 @@ class FluxLoopContext:
             tags=tags or [],
         )
 
-        # Observation stack for hierarchy
-        self.observation_stack: List[ObservationData] = []
+        # Observations pushed and not yet popped, across all tasks and threads
+        self._open: Dict[UUID, ObservationData] = {}
         self.observations: List[ObservationData] = []
-
-        # Sampling decision
-        self.is_sampled = random.random() < self.config.sample_rate
+        # Observations on the stack that were not sampled (kept for pairing only)
+        self._unsampled: Set[UUID] = set()
+
+        # Sampling decision; tail sampling records everything and decides in finalize()
+        self.sampling_mode = self.config.sampling_mode
+        self._tail_pending = self.sampling_mode == TAIL
+        self.is_sampled = self._tail_pending or head_sample(self.config, trace_uuid)
+        if not self._tail_pending:
+            record_decision(HEAD, "sampled" if self.is_sampled else None)
+        # Finished observations held until the tail decision
+        self._held: List[ObservationData] = []
+        # Set when an exception escapes the instrumented block
+        self.has_error = False
 
     def is_enabled(self) -> bool:
         """Check if tracing is enabled and sampled."""
         return self.config.enabled and self.is_sampled
 
+    @property
+    def observation_stack(self) -> List[ObservationData]:
+        """Open observations of this context in the current task, innermost last."""
+        return [observation for owner, observation in _stack_var.get() if owner is self]
+
     def push_observation(self, observation: ObservationData) -> None:
         """
         Push a new observation onto the stack.
@@ -85,40 +118,99 @@ class FluxLoopContext:
         # Set trace ID
         observation.trace_id = self.trace.id
 
-        # Set parent if there's an observation on the stack
-        if self.observation_stack:
-            parent = self.observation_stack[-1]
-            observation.parent_observation_id = parent.id
-
-        # Add to stack and list
-        self.observation_stack.append(observation)
+        # Parent is the innermost recorded observation on this task's stack
+        stack = _stack_var.get()
+        for owner, parent in reversed(stack):
+            if owner is self and parent.id not in self._unsampled:
+                observation.parent_observation_id = parent.id
+                break
+
+        # Add to stack, and to the list if this observation type is sampled
+        _stack_var.set(stack + ((self, observation),))
+        self._open[observation.id] = observation
+        if not sample_observation(self.config, self.trace.id, observation):
+            self._unsampled.add(observation.id)
+            return
         self.observations.append(observation)
 
         # Send to buffer if it's complete (has end_time)
         if observation.end_time:
-            self.buffer.add_observation(self.trace.id, observation)
+            self._emit(observation)
 
-    def pop_observation(self) -> Optional[ObservationData]:
+    def pop_observation(
+        self, observation: Optional[ObservationData] = None
+    ) -> Optional[ObservationData]:
         """
-        Pop the current observation from the stack.
+        Pop an observation from the current task's stack.
+
+        Args:
+            observation: The observation to close; defaults to the innermost one
+                this context has open in the current task
 
         Returns:
-            The popped observation, or None if stack is empty
+            The popped observation, or None if there was nothing to pop
         """
-        if not self.is_enabled() or not self.observation_stack:
+        stack = _stack_var.get()
+        for index in range(len(stack) - 1, -1, -1):
+            owner, candidate = stack[index]
+            if owner is self and (observation is None or candidate is observation):
+                _stack_var.set(stack[:index] + stack[index + 1 :])
+                observation = candidate
+                break
+
+        if observation is None or not self.is_enabled():
+            return None
+        # Already closed, e.g. by finalize() while another task held it open
+        if self._open.pop(observation.id, None) is None:
             return None
-
-        observation = self.observation_stack.pop()
 
         # If observation doesn't have end_time, set it now
         if not observation.end_time:
             observation.end_time = datetime.now(timezone.utc)
 
+        if observation.id in self._unsampled:
+            self._unsampled.discard(observation.id)
+            return observation
+
         # Send to buffer
-        self.buffer.add_observation(self.trace.id, observation)
+        self._emit(observation)
 
         return observation
 
+    def _emit(self, observation: ObservationData) -> None:
+        """Send a finished observation to the buffer, or hold it for tail sampling."""
+        if not self._tail_pending:
+            self.buffer.add_observation(self.trace.id, observation)
+            return
+        if len(self._held) < self.config.tail_max_trace_observations and tail_budget.acquire(
+            self.config.tail_max_buffered_observations
+        ):
+            self._held.append(observation)
+            return
+        # Out of room: decide now by sample_rate alone instead of holding more
+        self._decide_early()
+        if self.is_sampled:
+            self.buffer.add_observation(self.trace.id, observation)
+
+    def __del__(self) -> None:
+        # A context dropped without finalize() must still return its budget.
+        tail_budget.release(len(getattr(self, "_held", ())))
+
+    def _release_held(self) -> List[ObservationData]:
+        held, self._held = self._held, []
+        tail_budget.release(len(held))
+        return held
+
+    def _decide_early(self) -> None:
+        self._tail_pending = False
+        held = self._release_held()
+        self.is_sampled = head_sample(self.config, self.trace.id)
+        record_decision(TAIL, REASON_OVERFLOW if self.is_sampled else None)
+        if self.is_sampled:
+            self.trace.metadata["sampling"] = {"mode": TAIL, "reason": REASON_OVERFLOW}
+            for observation in held:
+                self.buffer.add_observation(self.trace.id, observation)
+
     def add_metadata(self, key: str, value: Any) -> None:
         """Add metadata to the current trace."""
         if self.is_enabled():
@@ -147,17 +239,33 @@ class FluxLoopContext:
 
     def finalize(self) -> None:
         """Finalize the trace and send all data."""
+        stack = _stack_var.get()
+        if any(owner is self for owner, _ in stack):
+            _stack_var.set(tuple(entry for entry in stack if entry[0] is not self))
+
         if not self.is_enabled():
             return
 
-        # Pop any remaining observations
-        while self.observation_stack:
-            self.pop_observation()
+        # Close observations still open in this or any other task, innermost first
+        for observation in reversed(list(self._open.values())):
+            self.pop_observation(observation)
 
         # Set trace end time
         if not self.trace.end_time:
             self.trace.end_time = datetime.now(timezone.utc)
 
+        if self._tail_pending:
+            self._tail_pending = False
+            held = self._release_held()
+            reason = tail_decision(self.trace, held, self.config, errored=self.has_error)
+            record_decision(TAIL, reason)
+            if reason is None:
+                self.is_sampled = False
+                return
+            self.trace.metadata["sampling"] = {"mode": TAIL, "reason": reason}
+            for observation in held:
+                self.buffer.add_observation(self.trace.id, observation)
+
         # Send trace to buffer
         self.buffer.add_trace(self.trace)
 
@@ -213,6 +321,9 @@ def instrument(
 
     try:
         yield context
+    except BaseException:
+        context.has_error = True
+        raise
     finally:
         # Finalize and reset context
         context.finalize()
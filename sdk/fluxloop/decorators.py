@@ -86,7 +86,7 @@ def trace(
 
             finally:
                 observation.end_time = datetime.now(timezone.utc)
-                context.pop_observation()
+                context.pop_observation(observation)
 
         @functools.wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
@@ -128,7 +128,7 @@ def trace(
 
             finally:
                 observation.end_time = datetime.now(timezone.utc)
-                context.pop_observation()
+                context.pop_observation(observation)
 
         if inspect.iscoroutinefunction(func):
             return cast(F, async_wrapper)
@@ -209,7 +209,7 @@ def agent(
             finally:
                 # Finalize observation
                 observation.end_time = datetime.now(timezone.utc)
-                context.pop_observation()
+                context.pop_observation(observation)
 
         @functools.wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
@@ -259,7 +259,7 @@ def agent(
             finally:
                 # Finalize observation
                 observation.end_time = datetime.now(timezone.utc)
-                context.pop_observation()
+                context.pop_observation(observation)
 
         # Return appropriate wrapper based on function type
         if inspect.iscoroutinefunction(func):
@@ -345,7 +345,7 @@ def prompt(
             finally:
                 # Finalize observation
                 observation.end_time = datetime.now(timezone.utc)
-                context.pop_observation()
+                context.pop_observation(observation)
 
         @functools.wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
@@ -401,7 +401,7 @@ def prompt(
             finally:
                 # Finalize observation
                 observation.end_time = datetime.now(timezone.utc)
-                context.pop_observation()
+                context.pop_observation(observation)
 
         # Return appropriate wrapper based on function type
         if inspect.iscoroutinefunction(func):
@@ -476,7 +476,7 @@ def tool(
             finally:
                 # Finalize observation
                 observation.end_time = datetime.now(timezone.utc)
-                context.pop_observation()
+                context.pop_observation(observation)
 
         @functools.wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
@@ -523,7 +523,7 @@ def tool(
             finally:
                 # Finalize observation
                 observation.end_time = datetime.now(timezone.utc)
-                context.pop_observation()
+                context.pop_observation(observation)
 
         # Return appropriate wrapper based on function type
         if inspect.iscoroutinefunction(func):
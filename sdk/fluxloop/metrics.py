@@ -0,0 +1,311 @@
+"""
+Opt-in health metrics for the SDK and the experiment runner.
+
+Metrics are disabled by default and cost a single global lookup per event while
+disabled. Enable them with ``fluxloop.enable_metrics()`` or the
+``FLUXLOOP_METRICS_ENABLED`` / ``FLUXLOOP_METRICS_PORT`` environment variables;
+read them with ``fluxloop.metrics_snapshot()`` or scrape the optional local
+``/metrics`` endpoint, which serves the OpenMetrics text format.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Seconds; the Prometheus client defaults.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in key)
+    return "{" + rendered + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """Base class: a named family of samples keyed by label values."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        """``(sample name, labels, value)`` rows for the OpenMetrics exposition."""
+
+    @abstractmethod
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly view of the current values."""
+
+
+class _ScalarMetric(Metric):
+    """One float per label set."""
+
+    sample_suffix = ""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation)
+        self._values: Dict[LabelKey, float] = {}
+
+    def _add(self, amount: float, labels: Dict[str, Any]) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        with self._lock:
+            return [
+                (self.name + self.sample_suffix, key, value)
+                for key, value in self._values.items()
+            ]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "type": self.type,
+                "values": [
+                    {"labels": dict(key), "value": value} for key, value in self._values.items()
+                ],
+            }
+
+
+class Counter(_ScalarMetric):
+    type = "counter"
+    sample_suffix = "_total"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._add(amount, labels)
+
+
+class Gauge(_ScalarMetric):
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self._add(-amount, labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        # Label key -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += 1
+            state[-1] += value
+
+    def count(self, **labels: Any) -> int:
+        state = self._values.get(_label_key(labels))
+        return int(state[-2]) if state else 0
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        rows: List[Tuple[str, LabelKey, float]] = []
+        with self._lock:
+            for key, state in self._values.items():
+                for bound, count in zip(self.buckets, state):
+                    le = (("le", _format_value(bound)),)
+                    rows.append((f"{self.name}_bucket", key + le, count))
+                rows.append((f"{self.name}_bucket", key + (("le", "+Inf"),), state[-2]))
+                rows.append((f"{self.name}_count", key, state[-2]))
+                rows.append((f"{self.name}_sum", key, state[-1]))
+        return rows
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "type": self.type,
+                "values": [
+                    {
+                        "labels": dict(key),
+                        "count": int(state[-2]),
+                        "sum": state[-1],
+                        "buckets": {
+                            _format_value(bound): int(count)
+                            for bound, count in zip(self.buckets, state)
+                        },
+                    }
+                    for key, state in self._values.items()
+                ],
+            }
+
+
+class MetricsRegistry:
+    """Named metrics, rendered as OpenMetrics text or a JSON-friendly snapshot."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, documentation: str, **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.type}")
+            return metric
+
+    def counter(self, name: str, documentation: str = "") -> Counter:
+        return self._get_or_create(Counter, name, documentation)
+
+    def gauge(self, name: str, documentation: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, documentation)
+
+    def histogram(
+        self, name: str, documentation: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, buckets=buckets)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def render(self) -> str:
+        """Render all metrics in the OpenMetrics text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            if metric.documentation:
+                lines.append(f"# HELP {metric.name} {metric.documentation}")
+            for sample_name, key, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(key)} {_format_value(value)}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+_registry: Optional[MetricsRegistry] = None
+_server: Optional[Any] = None
+_state_lock = threading.Lock()
+
+
+def get_registry() -> Optional[MetricsRegistry]:
+    """Return the active registry, or None while metrics are disabled."""
+    return _registry
+
+
+def enable_metrics(port: Optional[int] = None, host: str = "127.0.0.1") -> MetricsRegistry:
+    """Start collecting metrics and, when ``port`` is given, serve ``/metrics``.
+
+    Port 0 picks a free port; see :func:`metrics_address`.
+    """
+    global _registry
+    with _state_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        if port is not None and _server is None:
+            _start_server(_registry, host, port)
+        return _registry
+
+
+def enable_metrics_from_config(config: Any) -> Optional[MetricsRegistry]:
+    """Enable metrics if ``config`` (an ``SDKConfig``) opts in."""
+    if not config.metrics_enabled and config.metrics_port is None:
+        return _registry
+    return enable_metrics(port=config.metrics_port)
+
+
+def disable_metrics() -> None:
+    """Stop the HTTP endpoint and drop all collected metrics."""
+    global _registry, _server
+    with _state_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
+        _registry = None
+
+
+def metrics_snapshot() -> Dict[str, Any]:
+    """Current values of all metrics (empty while metrics are disabled)."""
+    registry = _registry
+    return registry.snapshot() if registry is not None else {}
+
+
+def metrics_address() -> Optional[Tuple[str, int]]:
+    """``(host, port)`` of the running ``/metrics`` endpoint, if any."""
+    if _server is None:
+        return None
+    host, port = _server.server_address[:2]
+    return str(host), int(port)
+
+
+def _start_server(registry: MetricsRegistry, host: str, port: int) -> None:
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="fluxloop-metrics", daemon=True
+    ).start()
+    _server = server
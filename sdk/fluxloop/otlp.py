@@ -0,0 +1,391 @@
+"""
+OpenTelemetry (OTLP/HTTP) export of traces and observations.
+
+Each FluxLoop trace becomes a root span and each observation a child span in
+the same OTLP trace (the 16-byte trace ID is the trace UUID). Generation, tool
+and agent observations carry the OpenTelemetry GenAI semantic-convention
+attributes (``gen_ai.*``); everything else is kept under ``fluxloop.*``.
+
+Spans are sent to ``<endpoint>/v1/traces`` as ``http/protobuf`` (the OTLP
+default) or ``http/json``. The protobuf encoding is written by hand for the
+handful of OTLP messages involved, so no OpenTelemetry packages are required.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from .config import get_config
+from .models import ObservationData, ObservationType, TraceData
+
+PROTOCOLS = ("http/protobuf", "http/json")
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_ERROR = 2
+
+# Longest string attribute exported for inputs and outputs.
+MAX_ATTRIBUTE_LENGTH = 8192
+
+_OPERATION_NAMES = {
+    ObservationType.GENERATION: "chat",
+    ObservationType.TOOL: "execute_tool",
+    ObservationType.AGENT: "invoke_agent",
+}
+
+# llm_parameters keys -> gen_ai.request.* attributes
+_REQUEST_PARAMETERS = {
+    "temperature": "gen_ai.request.temperature",
+    "max_tokens": "gen_ai.request.max_tokens",
+    "top_p": "gen_ai.request.top_p",
+    "top_k": "gen_ai.request.top_k",
+    "frequency_penalty": "gen_ai.request.frequency_penalty",
+    "presence_penalty": "gen_ai.request.presence_penalty",
+    "stop": "gen_ai.request.stop_sequences",
+    "seed": "gen_ai.request.seed",
+}
+
+
+@dataclass
+class Span:
+    """Protocol-neutral OTLP span; attribute values are plain Python values."""
+
+    trace_id: bytes
+    span_id: bytes
+    name: str
+    start_time_unix_nano: int
+    end_time_unix_nano: int
+    parent_span_id: bytes = b""
+    kind: int = SPAN_KIND_INTERNAL
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status_code: int = 0
+    status_message: str = ""
+
+
+def _unix_nanos(value: Optional[datetime]) -> int:
+    if value is None:
+        return 0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1_000_000) * 1000
+
+
+def root_span_id(trace_id: UUID) -> bytes:
+    return trace_id.bytes[8:]
+
+
+def observation_span_id(observation_id: UUID) -> bytes:
+    return observation_id.bytes[8:]
+
+
+def _content_attribute(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return text[:MAX_ATTRIBUTE_LENGTH]
+
+
+def _set(attributes: Dict[str, Any], key: str, value: Any) -> None:
+    if value is None or value == "" or value == []:
+        return
+    if isinstance(value, (list, tuple)):
+        value = [item if isinstance(item, (str, bool, int, float)) else str(item) for item in value]
+    elif not isinstance(value, (str, bool, int, float)):
+        value = json.dumps(value, default=str)
+    attributes[key] = value
+
+
+def trace_to_span(trace: TraceData) -> Span:
+    attributes: Dict[str, Any] = {}
+    _set(attributes, "session.id", str(trace.session_id) if trace.session_id else None)
+    _set(attributes, "user.id", trace.user_id)
+    _set(attributes, "fluxloop.tags", list(trace.tags))
+    _set(attributes, "fluxloop.experiment_id", trace.experiment_id)
+    _set(attributes, "fluxloop.iteration", trace.iteration)
+    _set(attributes, "fluxloop.persona", trace.persona)
+    _set(attributes, "fluxloop.input", _content_attribute(trace.input))
+    _set(attributes, "fluxloop.output", _content_attribute(trace.output))
+    for key, value in trace.metadata.items():
+        _set(attributes, f"fluxloop.metadata.{key}", value)
+    return Span(
+        trace_id=trace.id.bytes,
+        span_id=root_span_id(trace.id),
+        name=trace.name,
+        start_time_unix_nano=_unix_nanos(trace.start_time),
+        end_time_unix_nano=_unix_nanos(trace.end_time or trace.start_time),
+        attributes=attributes,
+    )
+
+
+def observation_to_span(trace_id: UUID, observation: ObservationData) -> Span:
+    attributes: Dict[str, Any] = {"fluxloop.observation.type": observation.type.value}
+    operation = _OPERATION_NAMES.get(observation.type)
+    _set(attributes, "gen_ai.operation.name", operation)
+
+    if observation.type == ObservationType.GENERATION:
+        _set(attributes, "gen_ai.request.model", observation.model)
+        _set(attributes, "gen_ai.provider.name", observation.metadata.get("provider"))
+        _set(attributes, "gen_ai.usage.input_tokens", observation.prompt_tokens)
+        _set(attributes, "gen_ai.usage.output_tokens", observation.completion_tokens)
+        _set(attributes, "fluxloop.usage.total_tokens", observation.total_tokens)
+        for key, value in (observation.llm_parameters or {}).items():
+            _set(attributes, _REQUEST_PARAMETERS.get(key, f"fluxloop.llm.{key}"), value)
+        _set(attributes, "gen_ai.input.messages", _content_attribute(observation.input))
+        _set(attributes, "gen_ai.output.messages", _content_attribute(observation.output))
+    else:
+        if observation.type == ObservationType.TOOL:
+            _set(attributes, "gen_ai.tool.name", observation.name)
+            _set(attributes, "gen_ai.tool.call.arguments", _content_attribute(observation.input))
+            _set(attributes, "gen_ai.tool.call.result", _content_attribute(observation.output))
+        elif observation.type == ObservationType.AGENT:
+            _set(attributes, "gen_ai.agent.name", observation.name)
+        _set(attributes, "fluxloop.input", _content_attribute(observation.input))
+        _set(attributes, "fluxloop.output", _content_attribute(observation.output))
+
+    _set(attributes, "fluxloop.level", observation.level.value)
+    for key, value in observation.metadata.items():
+        if key != "traceback":
+            _set(attributes, f"fluxloop.metadata.{key}", value)
+
+    parent = (
+        observation_span_id(observation.parent_observation_id)
+        if observation.parent_observation_id
+        else root_span_id(trace_id)
+    )
+    is_generation = observation.type == ObservationType.GENERATION
+    span = Span(
+        trace_id=trace_id.bytes,
+        span_id=observation_span_id(observation.id),
+        parent_span_id=parent,
+        name=observation.name,
+        kind=SPAN_KIND_CLIENT if is_generation else SPAN_KIND_INTERNAL,
+        start_time_unix_nano=_unix_nanos(observation.start_time),
+        end_time_unix_nano=_unix_nanos(observation.end_time or observation.start_time),
+        attributes=attributes,
+    )
+    if observation.error:
+        span.status_code = STATUS_CODE_ERROR
+        span.status_message = observation.error
+        _set(span.attributes, "error.type", observation.metadata.get("error_type") or "error")
+    return span
+
+
+def build_spans(
+    traces: Iterable[TraceData], observations: Iterable[Tuple[UUID, ObservationData]]
+) -> List[Span]:
+    spans = [trace_to_span(trace) for trace in traces]
+    spans.extend(observation_to_span(trace_id, obs) for trace_id, obs in observations)
+    return spans
+
+
+def resource_attributes() -> Dict[str, Any]:
+    config = get_config()
+    attributes: Dict[str, Any] = {"service.name": config.service_name or "fluxloop"}
+    _set(attributes, "deployment.environment.name", config.environment)
+    return attributes
+
+
+# ---------------------------------------------------------------------------
+# OTLP/JSON
+
+
+def _json_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, list):
+        return {"arrayValue": {"values": [_json_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _json_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _json_value(value)} for key, value in attributes.items()]
+
+
+def encode_json(spans: List[Span], resource: Dict[str, Any]) -> bytes:
+    """Encode an ``ExportTraceServiceRequest`` in the OTLP/JSON mapping."""
+    from . import __version__
+
+    json_spans = []
+    for span in spans:
+        item: Dict[str, Any] = {
+            "traceId": span.trace_id.hex(),
+            "spanId": span.span_id.hex(),
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(span.start_time_unix_nano),
+            "endTimeUnixNano": str(span.end_time_unix_nano),
+            "attributes": _json_attributes(span.attributes),
+            "status": {},
+        }
+        if span.parent_span_id:
+            item["parentSpanId"] = span.parent_span_id.hex()
+        if span.status_code:
+            item["status"] = {"code": span.status_code, "message": span.status_message}
+        json_spans.append(item)
+    request = {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _json_attributes(resource)},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "fluxloop", "version": __version__},
+                        "spans": json_spans,
+                    }
+                ],
+            }
+        ]
+    }
+    return json.dumps(request).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# OTLP/protobuf (opentelemetry/proto/collector/trace/v1/trace_service.proto)
+
+
+def _varint(value: int) -> bytes:
+    value &= (1 << 64) - 1
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _key(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+
+def _field_varint(number: int, value: int) -> bytes:
+    return _key(number, 0) + _varint(value) if value else b""
+
+
+def _field_fixed64(number: int, value: int) -> bytes:
+    return _key(number, 1) + struct.pack("<Q", value) if value else b""
+
+
+def _field_bytes(number: int, value: bytes) -> bytes:
+    return _key(number, 2) + _varint(len(value)) + value if value else b""
+
+
+def _field_message(number: int, value: bytes) -> bytes:
+    # Embedded messages are written even when empty.
+    return _key(number, 2) + _varint(len(value)) + value
+
+
+def _field_string(number: int, value: str) -> bytes:
+    return _field_bytes(number, value.encode("utf-8"))
+
+
+def _pb_any_value(value: Any) -> bytes:
+    if isinstance(value, bool):
+        return _key(2, 0) + _varint(int(value))
+    if isinstance(value, int):
+        return _key(3, 0) + _varint(value)
+    if isinstance(value, float):
+        return _key(4, 1) + struct.pack("<d", value)
+    if isinstance(value, list):
+        array = b"".join(_field_message(1, _pb_any_value(item)) for item in value)
+        return _field_message(5, array)
+    return _field_message(1, str(value).encode("utf-8"))
+
+
+def _pb_attributes(number: int, attributes: Dict[str, Any]) -> bytes:
+    return b"".join(
+        _field_message(number, _field_string(1, key) + _field_message(2, _pb_any_value(value)))
+        for key, value in attributes.items()
+    )
+
+
+def _pb_span(span: Span) -> bytes:
+    status = _field_string(2, span.status_message) + _field_varint(3, span.status_code)
+    return (
+        _field_bytes(1, span.trace_id)
+        + _field_bytes(2, span.span_id)
+        + _field_bytes(4, span.parent_span_id)
+        + _field_string(5, span.name)
+        + _field_varint(6, span.kind)
+        + _field_fixed64(7, span.start_time_unix_nano)
+        + _field_fixed64(8, span.end_time_unix_nano)
+        + _pb_attributes(9, span.attributes)
+        + _field_message(15, status)
+    )
+
+
+def encode_protobuf(spans: List[Span], resource: Dict[str, Any]) -> bytes:
+    """Encode an ``ExportTraceServiceRequest`` as OTLP protobuf."""
+    from . import __version__
+
+    scope = _field_string(1, "fluxloop") + _field_string(2, __version__)
+    scope_spans = _field_message(1, scope) + b"".join(
+        _field_message(2, _pb_span(span)) for span in spans
+    )
+    resource_spans = _field_message(1, _pb_attributes(1, resource)) + _field_message(
+        2, scope_spans
+    )
+    return _field_message(1, resource_spans)
+
+
+class OTLPExporter:
+    """Posts batches of traces and observations to an OTLP/HTTP endpoint."""
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        *,
+        protocol: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        config = get_config()
+        endpoint = endpoint or config.otlp_endpoint
+        if not endpoint:
+            raise ValueError("An OTLP endpoint is required")
+        self.protocol = protocol or config.otlp_protocol
+        if self.protocol not in PROTOCOLS:
+            raise ValueError(
+                f"Unknown OTLP protocol '{self.protocol}'. Expected one of: {', '.join(PROTOCOLS)}"
+            )
+        endpoint = endpoint.rstrip("/")
+        self.url = endpoint if endpoint.endswith("/v1/traces") else f"{endpoint}/v1/traces"
+        self.headers = dict(config.otlp_headers or {})
+        self.headers.update(headers or {})
+        self.headers["Content-Type"] = (
+            "application/x-protobuf" if self.protocol == "http/protobuf" else "application/json"
+        )
+        self.timeout = timeout if timeout is not None else config.timeout
+
+    def encode(
+        self, traces: Iterable[TraceData], observations: Iterable[Tuple[UUID, ObservationData]]
+    ) -> bytes:
+        spans = build_spans(traces, observations)
+        encoder = encode_protobuf if self.protocol == "http/protobuf" else encode_json
+        return encoder(spans, resource_attributes())
+
+    def export(
+        self, traces: List[TraceData], observations: List[Tuple[UUID, ObservationData]]
+    ) -> None:
+        """Send one batch; raises ``httpx.HTTPError`` when the receiver rejects it."""
+        if not traces and not observations:
+            return
+        import httpx
+
+        response = httpx.post(
+            self.url,
+            content=self.encode(traces, observations),
+            headers=self.headers,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
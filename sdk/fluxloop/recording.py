@@ -176,10 +176,19 @@ class RecordingConfig(BaseModel):
 _recording_config = RecordingConfig()
 
 
+def _ensure_config() -> None:
+    """Build the SDK config if needed so env-driven recording settings apply first."""
+
+    from .config import get_config
+
+    get_config()
+
+
 def enable_recording(output_file: str) -> None:
     """Enable argument recording by configuring the global recorder."""
 
     global _global_recorder
+    _ensure_config()
     resolved_path = Path(output_file).expanduser().resolve()
     _global_recorder = ArgsRecorder(resolved_path)
 
@@ -190,7 +199,9 @@ def record_call_args(
     """Record call arguments if recording is enabled."""
 
     if _global_recorder is None:
-        return
+        _ensure_config()
+        if _global_recorder is None:
+            return
 
     recorded_iteration = iteration
     if iteration is None and not _recording_config.iteration_auto_increment:
@@ -203,6 +214,7 @@ def disable_recording() -> None:
     """Disable argument recording."""
 
     global _global_recorder
+    _ensure_config()
     _global_recorder = None
 
 
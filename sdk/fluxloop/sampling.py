@@ -0,0 +1,221 @@
+"""
+Trace sampling decisions.
+
+Decisions are derived from a hash of the trace id rather than a fresh coin
+flip, so they are reproducible and every service that shares a trace id makes
+the same call. Because a trace with hash ``h`` is kept at any rate above ``h``,
+lower rates select subsets of higher ones. ``observation_sample_rates`` (per
+``ObservationType``) hashes the trace id together with the type, so each type
+is decided independently of the trace and of other types while still keeping
+or dropping all of its observations within a trace together.
+``max_spans_per_second`` additionally caps recorded observations per process.
+
+``head`` sampling (the default) decides when a context is created, so a
+dropped trace costs nothing. ``tail`` sampling records every trace, holds its
+observations until :meth:`FluxLoopContext.finalize` and then keeps the trace if
+it errored, ran longer than ``tail_latency_threshold_ms``, used more than
+``tail_token_threshold`` tokens, or falls within ``sample_rate``.
+
+Held observations are bounded per trace (``tail_max_trace_observations``) and
+across all in-flight traces (``tail_max_buffered_observations``). A trace that
+hits either bound is decided early by ``sample_rate`` alone: if kept, what it holds is
+released and the rest streams through unbuffered; if not, it stops recording.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Any, Iterable, Optional, Union
+from uuid import UUID
+
+from . import metrics
+from .models import ObservationData, ObservationLevel, ObservationType, TraceData
+
+HEAD = "head"
+TAIL = "tail"
+SAMPLING_MODES = (HEAD, TAIL)
+
+# Reasons recorded in trace.metadata["sampling"]["reason"]
+REASON_ERROR = "error"
+REASON_LATENCY = "latency"
+REASON_TOKENS = "tokens"
+REASON_PROBABILISTIC = "probabilistic"
+REASON_OVERFLOW = "overflow"
+
+_HASH_SCALE = float(1 << 64)
+
+
+def trace_fraction(trace_id: Union[UUID, str]) -> float:
+    """Map a trace id to a stable value in [0, 1).
+
+    The first 8 bytes of the BLAKE2b digest of the id's 16 raw bytes, read
+    big-endian, divided by 2**64. Other services reproduce decisions by
+    computing the same value. UUID-shaped strings are parsed first so a UUID
+    and its string form agree; any other string is hashed as UTF-8.
+    """
+    return _fraction(_trace_bytes(trace_id))
+
+
+def observation_fraction(trace_id: Union[UUID, str], observation_type: ObservationType) -> float:
+    """Map a trace id and observation type to a stable value in [0, 1).
+
+    As :func:`trace_fraction`, over the id's bytes followed by ``b":"`` and the
+    type's value, so it is uncorrelated with the trace's own decision.
+    """
+    suffix = b":" + ObservationType(observation_type).value.encode("utf-8")
+    return _fraction(_trace_bytes(trace_id) + suffix)
+
+
+def _trace_bytes(trace_id: Union[UUID, str]) -> bytes:
+    if not isinstance(trace_id, UUID):
+        try:
+            trace_id = UUID(str(trace_id))
+        except ValueError:
+            pass
+    return trace_id.bytes if isinstance(trace_id, UUID) else str(trace_id).encode("utf-8")
+
+
+def _fraction(raw: bytes) -> float:
+    digest = hashlib.blake2b(raw, digest_size=8).digest()
+    return int.from_bytes(digest, "big") / _HASH_SCALE
+
+
+def head_sample(config: Any, trace_id: Union[UUID, str]) -> bool:
+    """Decision made when a context starts; stable for a given trace id."""
+    return trace_fraction(trace_id) < config.sample_rate
+
+
+def observation_rate(config: Any, observation_type: ObservationType) -> float:
+    """Configured rate for ``observation_type`` (1.0 when not configured)."""
+    rates = config.observation_sample_rates
+    if not rates:
+        return 1.0
+    return rates.get(ObservationType(observation_type).value, 1.0)
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` events per second with bursts of up to ``rate``."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def span_limiter(config: Any) -> Optional[RateLimiter]:
+    """The process-wide limiter for ``config.max_spans_per_second``, if set."""
+    global _limiter
+    rate = config.max_spans_per_second
+    if rate is None:
+        return None
+    limiter = _limiter
+    if limiter is None or limiter.rate != rate:
+        with _limiter_lock:
+            if _limiter is None or _limiter.rate != rate:
+                _limiter = RateLimiter(rate)
+            limiter = _limiter
+    return limiter
+
+
+def sample_observation(config: Any, trace_id: UUID, observation: ObservationData) -> bool:
+    """Whether to record ``observation``, by its type's rate and the span rate limit."""
+    rate = observation_rate(config, observation.type)
+    if rate < 1.0 and observation_fraction(trace_id, observation.type) >= rate:
+        _count_dropped_observation(observation, "type_rate")
+        return False
+    limiter = span_limiter(config)
+    if limiter is not None and not limiter.allow():
+        _count_dropped_observation(observation, "rate_limit")
+        return False
+    return True
+
+
+class TailBudget:
+    """Process-wide count of observations held by in-flight tail-sampled traces."""
+
+    def __init__(self) -> None:
+        self.held = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, limit: int) -> bool:
+        with self._lock:
+            if self.held >= limit:
+                return False
+            self.held += 1
+            return True
+
+    def release(self, count: int) -> None:
+        if count:
+            with self._lock:
+                self.held = max(0, self.held - count)
+
+
+tail_budget = TailBudget()
+
+
+def _is_error(observation: ObservationData) -> bool:
+    return bool(observation.error) or observation.level == ObservationLevel.ERROR
+
+
+def _tokens(observation: ObservationData) -> int:
+    if observation.total_tokens is not None:
+        return observation.total_tokens
+    return (observation.prompt_tokens or 0) + (observation.completion_tokens or 0)
+
+
+def tail_decision(
+    trace: TraceData,
+    observations: Iterable[ObservationData],
+    config: Any,
+    *,
+    errored: bool = False,
+) -> Optional[str]:
+    """Return why a finished trace is kept, or None to drop it."""
+    observations = list(observations)
+    if config.tail_keep_errors and (errored or any(_is_error(obs) for obs in observations)):
+        return REASON_ERROR
+    threshold_ms = config.tail_latency_threshold_ms
+    if threshold_ms is not None and trace.end_time is not None:
+        duration_ms = (trace.end_time - trace.start_time).total_seconds() * 1000
+        if duration_ms >= threshold_ms:
+            return REASON_LATENCY
+    token_threshold = config.tail_token_threshold
+    if token_threshold is not None and sum(_tokens(obs) for obs in observations) >= token_threshold:
+        return REASON_TOKENS
+    if head_sample(config, trace.id):
+        return REASON_PROBABILISTIC
+    return None
+
+
+def record_decision(mode: str, reason: Optional[str]) -> None:
+    registry = metrics.get_registry()
+    if registry is not None:
+        registry.counter("fluxloop_sampling_decisions", "Trace sampling decisions").inc(
+            mode=mode, decision=reason or "dropped"
+        )
+
+
+def _count_dropped_observation(observation: ObservationData, reason: str) -> None:
+    registry = metrics.get_registry()
+    if registry is not None:
+        registry.counter(
+            "fluxloop_sampling_dropped_observations",
+            "Observations not recorded inside sampled traces",
+        ).inc(type=ObservationType(observation.type).value, reason=reason)
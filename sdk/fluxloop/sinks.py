@@ -0,0 +1,325 @@
+"""
+Export sinks for buffered traces and observations.
+
+``EventBuffer`` fans every flushed batch out to its sinks. Each sink is driven
+by its own :class:`SinkWorker` with a private queue, batch size and retry
+policy, running on its own thread, so a slow or failing sink never delays the
+others. Remote sinks (collector, OTLP) hand batches they could not deliver to
+the offline store.
+
+Built-in sinks: :class:`CollectorSink`, :class:`OTLPSink`,
+:class:`OfflineStoreSink`, :class:`InMemorySink` and :class:`CallbackSink`.
+Register extra sinks with ``EventBuffer.get_instance().add_sink(sink)``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from . import metrics
+from .models import ObservationData, TraceData
+from .serialization import serialize_observation, serialize_trace
+from .storage import OfflineStore
+
+ObservationItem = Tuple[UUID, ObservationData]
+# Called with (sink, traces, observations, last error) once a batch is given up on.
+FailureHandler = Callable[
+    ["Sink", List[TraceData], List[ObservationItem], Exception], None
+]
+
+
+class Sink(ABC):
+    """Destination for batches of traces and observations.
+
+    Subclasses implement :meth:`export` and raise to signal failure; the worker
+    retries the batch. Class attributes tune the worker per sink.
+    """
+
+    name = "sink"
+    # Events per export call; None uses the SDK ``batch_size``.
+    batch_size: Optional[int] = None
+    max_retries = 2
+    retry_backoff = 0.1
+    # Export on the flushing thread instead of a worker (cheap, in-process sinks).
+    synchronous = False
+    # Write batches that exhausted their retries to the offline store.
+    offline_fallback = False
+
+    @abstractmethod
+    def export(self, traces: List[TraceData], observations: List[ObservationItem]) -> None:
+        """Deliver one batch; raise to have the worker retry it."""
+
+    def close(self) -> None:
+        """Release resources; called once when the sink is removed."""
+
+
+class PartialExportError(Exception):
+    """Raised by a sink that delivered only part of a batch; carries the rest."""
+
+    def __init__(
+        self, message: str, traces: List[TraceData], observations: List[ObservationItem]
+    ) -> None:
+        super().__init__(message)
+        self.traces = traces
+        self.observations = observations
+
+
+class CollectorSink(Sink):
+    """Posts each trace and observation to the FluxLoop collector."""
+
+    name = "collector"
+    offline_fallback = True
+
+    def __init__(self) -> None:
+        self._client: Optional[Any] = None
+
+    def export(self, traces: List[TraceData], observations: List[ObservationItem]) -> None:
+        if self._client is None:
+            from .client import FluxLoopClient
+
+            self._client = FluxLoopClient()
+        failed_traces: List[TraceData] = []
+        failed_observations: List[ObservationItem] = []
+        last_error: Optional[Exception] = None
+        for trace in traces:
+            try:
+                self._client.send_trace(trace)
+            except Exception as error:
+                failed_traces.append(trace)
+                last_error = error
+        for trace_id, observation in observations:
+            try:
+                self._client.send_observation(trace_id, observation)
+            except Exception as error:
+                failed_observations.append((trace_id, observation))
+                last_error = error
+        if failed_traces or failed_observations:
+            raise PartialExportError(str(last_error), failed_traces, failed_observations)
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+
+
+class OTLPSink(Sink):
+    """Exports batches as OTLP spans (see :mod:`fluxloop.otlp`)."""
+
+    name = "otlp"
+    batch_size = 512
+    offline_fallback = True
+
+    def __init__(self, exporter: Optional[Any] = None) -> None:
+        self._exporter = exporter
+
+    def export(self, traces: List[TraceData], observations: List[ObservationItem]) -> None:
+        if self._exporter is None:
+            from .otlp import OTLPExporter
+
+            self._exporter = OTLPExporter()
+        self._exporter.export(traces, observations)
+
+
+class OfflineStoreSink(Sink):
+    """Appends batches to the offline JSONL store."""
+
+    name = "offline_store"
+    batch_size = 1000
+
+    def __init__(self, store: OfflineStore) -> None:
+        self.store = store
+
+    def export(self, traces: List[TraceData], observations: List[ObservationItem]) -> None:
+        self.store.record_traces(traces)
+        self.store.record_observations(observations)
+
+
+class InMemorySink(Sink):
+    """Keeps serialized traces and observations in memory, grouped by trace.
+
+    At most ``max_traces`` traces are retained; the oldest are evicted first.
+    Payloads have the same shape as the offline store's JSONL lines.
+    """
+
+    name = "memory"
+    synchronous = True
+
+    def __init__(self, max_traces: int = 1000) -> None:
+        self.max_traces = max(1, max_traces)
+        self._traces: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._observations: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def export(self, traces: List[TraceData], observations: List[ObservationItem]) -> None:
+        with self._lock:
+            for trace in traces:
+                self._traces[str(trace.id)] = serialize_trace(trace)
+            for trace_id, observation in observations:
+                payload = serialize_observation(observation)
+                payload["trace_id"] = str(trace_id)
+                self._observations.setdefault(str(trace_id), []).append(payload)
+            for entries in (self._traces, self._observations):
+                while len(entries) > self.max_traces:
+                    entries.popitem(last=False)
+
+    def trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._traces.get(str(trace_id))
+
+    def traces(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._traces.values())
+
+    def observations(self, trace_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._observations.get(str(trace_id), []))
+
+    def pop_observations(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Return and forget the observations recorded for ``trace_id``."""
+        with self._lock:
+            return self._observations.pop(str(trace_id), [])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+            self._observations.clear()
+
+
+class CallbackSink(Sink):
+    """Calls ``callback(traces, observations)`` for every batch."""
+
+    def __init__(
+        self,
+        callback: Callable[[List[TraceData], List[ObservationItem]], None],
+        *,
+        name: str = "callback",
+        synchronous: bool = False,
+    ) -> None:
+        self.callback = callback
+        self.name = name
+        self.synchronous = synchronous
+
+    def export(self, traces: List[TraceData], observations: List[ObservationItem]) -> None:
+        self.callback(traces, observations)
+
+
+class SinkWorker:
+    """Queues batches for one sink and exports them with retries."""
+
+    def __init__(
+        self,
+        sink: Sink,
+        *,
+        batch_size: int,
+        max_queue_size: int,
+        on_failure: Optional[FailureHandler] = None,
+    ) -> None:
+        self.sink = sink
+        self.batch_size = max(1, sink.batch_size or batch_size)
+        self.on_failure = on_failure
+        self.dropped = 0
+        self._queue: Deque[Tuple[str, Any]] = deque(maxlen=max(1, max_queue_size))
+        self._condition = threading.Condition()
+        self._busy = False
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        if not sink.synchronous:
+            self._thread = threading.Thread(
+                target=self._run, name=f"fluxloop-sink-{sink.name}", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, traces: List[TraceData], observations: List[ObservationItem]) -> None:
+        if self.sink.synchronous:
+            self._export(list(traces), list(observations))
+            return
+        with self._condition:
+            items = [("trace", trace) for trace in traces]
+            items.extend(("observation", item) for item in observations)
+            overflow = len(self._queue) + len(items) - (self._queue.maxlen or 0)
+            if overflow > 0:
+                self.dropped += overflow
+                _count_dropped(self.sink.name, overflow)
+            self._queue.extend(items)
+            self._condition.notify_all()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._queue) + (1 if self._busy else 0)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything submitted so far has been exported or given up."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._queue and not self._busy, timeout
+            )
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self.wait_idle(timeout)
+        with self._condition:
+            self._stop = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.sink.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._stop)
+                if not self._queue:
+                    return
+                traces: List[TraceData] = []
+                observations: List[ObservationItem] = []
+                while self._queue and len(traces) + len(observations) < self.batch_size:
+                    kind, item = self._queue.popleft()
+                    (traces if kind == "trace" else observations).append(item)
+                self._busy = True
+            try:
+                self._export(traces, observations)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _export(self, traces: List[TraceData], observations: List[ObservationItem]) -> None:
+        registry = metrics.get_registry()
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                self.sink.export(traces, observations)
+                return
+            except PartialExportError as error:
+                traces, observations = error.traces, error.observations
+                failure: Exception = error
+            except Exception as error:  # noqa: BLE001 - isolate sink failures
+                failure = error
+            finally:
+                if registry is not None:
+                    registry.histogram(
+                        "fluxloop_sink_export_duration_seconds", "Time per sink export call"
+                    ).observe(time.perf_counter() - started, sink=self.sink.name)
+            if attempt >= self.sink.max_retries or self._stop:
+                if self.on_failure is not None:
+                    self.on_failure(self.sink, traces, observations, failure)
+                return
+            if registry is not None:
+                registry.counter("fluxloop_sink_retries", "Sink export retries").inc(
+                    sink=self.sink.name
+                )
+            time.sleep(self.sink.retry_backoff * (2**attempt))
+            attempt += 1
+
+
+def _count_dropped(sink_name: str, count: int) -> None:
+    registry = metrics.get_registry()
+    if registry is not None:
+        registry.counter(
+            "fluxloop_sink_dropped_events",
+            "Events discarded because a sink's queue was full",
+        ).inc(count, sink=sink_name)
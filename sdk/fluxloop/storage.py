@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Iterable, Tuple
 from uuid import UUID
@@ -21,6 +22,8 @@ class OfflineStore:
         self.base_dir = Path(self.config.offline_store_dir)
         self.traces_file = self.base_dir / "traces.jsonl"
         self.observations_file = self.base_dir / "observations.jsonl"
+        # Sink workers and offline fallbacks append from different threads.
+        self._lock = threading.Lock()
 
         if self.config.offline_store_enabled:
             self.base_dir.mkdir(parents=True, exist_ok=True)
@@ -29,12 +32,13 @@ class OfflineStore:
         if not self.config.offline_store_enabled:
             return
 
-        if not self.traces_file.exists():
-            self.traces_file.write_text("")
+        lines = [json.dumps(serialize_trace(trace)) + os.linesep for trace in traces]
+        with self._lock:
+            if not self.traces_file.exists():
+                self.traces_file.write_text("")
 
-        with self.traces_file.open("a") as fp:
-            for trace in traces:
-                fp.write(json.dumps(serialize_trace(trace)) + os.linesep)
+            with self.traces_file.open("a") as fp:
+                fp.writelines(lines)
 
     def record_observations(
         self, items: Iterable[Tuple[UUID, ObservationData]]
@@ -42,11 +46,14 @@ class OfflineStore:
         if not self.config.offline_store_enabled:
             return
 
-        if not self.observations_file.exists():
-            self.observations_file.write_text("")
-
-        with self.observations_file.open("a") as fp:
-            for trace_id, observation in items:
-                payload = serialize_observation(observation)
-                payload["trace_id"] = str(trace_id)
-                fp.write(json.dumps(payload) + os.linesep)
+        lines = []
+        for trace_id, observation in items:
+            payload = serialize_observation(observation)
+            payload["trace_id"] = str(trace_id)
+            lines.append(json.dumps(payload) + os.linesep)
+        with self._lock:
+            if not self.observations_file.exists():
+                self.observations_file.write_text("")
+
+            with self.observations_file.open("a") as fp:
+                fp.writelines(lines)
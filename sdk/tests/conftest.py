@@ -0,0 +1,43 @@
+"""Shared fixtures for SDK tests."""
+
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import pytest
+
+import fluxloop
+from fluxloop.buffer import EventBuffer
+from fluxloop.config import reset_config
+
+
+def _discard_buffer() -> None:
+    existing = getattr(EventBuffer, "_instance", None)
+    if existing is not None:
+        # Drop events left by earlier tests so shutdown does not flush them
+        # into the default store under the working directory.
+        with existing.send_lock:
+            existing.traces.clear()
+            existing.observations.clear()
+        existing.shutdown()
+        EventBuffer._instance = None
+
+
+@pytest.fixture
+def create_buffer(tmp_path: Path) -> Iterator[Callable[..., EventBuffer]]:
+    """Return a factory for a fresh ``EventBuffer`` singleton.
+
+    Each call resets the SDK config, replaces the singleton and applies
+    ``config_kwargs`` on top of an offline store in ``tmp_path``. The buffer
+    and config are reset again after the test.
+    """
+
+    def factory(**config_kwargs: Any) -> EventBuffer:
+        reset_config()
+        _discard_buffer()
+        config_kwargs.setdefault("offline_store_dir", str(tmp_path))
+        fluxloop.configure(**config_kwargs)
+        return EventBuffer.get_instance()
+
+    yield factory
+    _discard_buffer()
+    reset_config()
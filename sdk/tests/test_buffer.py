@@ -1,29 +1,15 @@
 """Tests for buffer and offline storage."""
 
 import json
+import time
 from pathlib import Path
 
-import fluxloop
-from fluxloop.buffer import EventBuffer
 from fluxloop.context import FluxLoopContext
 from fluxloop.models import ObservationData, ObservationType
-from fluxloop.config import reset_config
 
 
-def _create_buffer(tmp_dir: Path, **config_kwargs) -> EventBuffer:
-    reset_config()
-    existing = getattr(EventBuffer, "_instance", None)
-    if existing is not None:
-        existing.shutdown()
-        EventBuffer._instance = None
-    config_kwargs.setdefault("offline_store_dir", str(tmp_dir))
-    fluxloop.configure(**config_kwargs)
-    return EventBuffer.get_instance()
-
-
-def test_offline_storage(tmp_path: Path):
-    buffer = _create_buffer(
-        tmp_path,
+def test_offline_storage(tmp_path: Path, create_buffer):
+    buffer = create_buffer(
         enabled=True,
         sample_rate=1.0,
         use_collector=False,
@@ -49,9 +35,8 @@ def test_offline_storage(tmp_path: Path):
     assert entries[0]["name"] == "test-trace"
 
 
-def test_offline_store_on_error(tmp_path: Path):
-    buffer = _create_buffer(
-        tmp_path,
+def test_offline_store_on_error(tmp_path: Path, create_buffer):
+    buffer = create_buffer(
         enabled=True,
         sample_rate=1.0,
         use_collector=True,
@@ -72,3 +57,13 @@ def test_offline_store_on_error(tmp_path: Path):
 
     assert traces_file.exists()
     assert observations_file.exists()
+
+
+def test_shutdown_does_not_wait_for_flush_interval(create_buffer):
+    buffer = create_buffer(enabled=True, use_collector=False, flush_interval=30.0)
+
+    started = time.monotonic()
+    buffer.shutdown()
+
+    assert not buffer.flush_thread.is_alive()
+    assert time.monotonic() - started < 2.0
@@ -1,9 +1,12 @@
 """Tests for context management."""
 
+import asyncio
+
 import pytest
 
 import fluxloop
 from fluxloop.context import FluxLoopContext, get_current_context
+from fluxloop.models import ObservationData, ObservationType
 
 
 class TestFluxLoopContext:
@@ -131,3 +134,60 @@ class TestInstrumentContextManager:
             # Operations should be no-ops
             ctx.add_metadata("key", "value")
             ctx.add_tag("tag")
+
+
+class TestConcurrentObservations:
+    """Span parentage under asyncio concurrency."""
+
+    def test_gathered_tools_get_the_spawning_span_as_parent(self, create_buffer):
+        """Concurrent children do not interleave on a shared stack."""
+        create_buffer(enabled=True, use_collector=False, sample_rate=1.0)
+
+        @fluxloop.tool(name="lookup")
+        async def lookup(delay: float) -> float:
+            await asyncio.sleep(delay)
+            return await parse(delay)
+
+        @fluxloop.trace(name="parse")
+        async def parse(delay: float) -> float:
+            await asyncio.sleep(delay)
+            return delay
+
+        @fluxloop.agent(name="planner")
+        async def planner() -> list:
+            return await asyncio.gather(*(lookup(delay) for delay in (0.03, 0.01, 0.02)))
+
+        with fluxloop.instrument("parallel") as ctx:
+            asyncio.run(planner())
+            assert ctx.observation_stack == []
+
+        by_id = {obs.id: obs for obs in ctx.observations}
+        (root,) = [obs for obs in ctx.observations if obs.name == "planner"]
+        tools = [obs for obs in ctx.observations if obs.name == "lookup"]
+        parses = [obs for obs in ctx.observations if obs.name == "parse"]
+        assert root.parent_observation_id is None
+        assert len(tools) == 3 and len(parses) == 3
+        assert all(tool.parent_observation_id == root.id for tool in tools)
+        # Each parse hangs off the lookup that awaited it.
+        for parse_obs in parses:
+            parent = by_id[parse_obs.parent_observation_id]
+            assert parent.name == "lookup"
+            assert parent.input == parse_obs.input
+        assert all(obs.end_time is not None for obs in ctx.observations)
+
+    def test_finalize_closes_observations_left_open_in_other_tasks(self, create_buffer):
+        """finalize() sees observations opened by tasks it cannot see the stack of."""
+        create_buffer(enabled=True, use_collector=False, sample_rate=1.0)
+        ctx = FluxLoopContext(trace_name="abandoned")
+
+        async def open_span() -> None:
+            ctx.push_observation(ObservationData(type=ObservationType.SPAN, name="left_open"))
+
+        asyncio.run(open_span())
+        assert ctx.observation_stack == []
+
+        ctx.finalize()
+
+        (observation,) = ctx.observations
+        assert observation.end_time is not None
+        assert ctx.pop_observation(observation) is None
@@ -0,0 +1,78 @@
+"""Import-time checks for the SDK package."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+# Modules that decorators and context management do not need at import time.
+LAZY_MODULES = (
+    "httpx",
+    "dotenv",
+    "fluxloop.client",
+    "fluxloop.recording",
+    "fluxloop.schemas",
+)
+
+
+def _importtime(code: str, cwd: Path) -> Dict[str, int]:
+    """Run ``code`` with ``-X importtime`` and return cumulative microseconds per module."""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("FLUXLOOP_")}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=cwd,
+        env=env,
+    )
+    timings: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|", 2)
+        try:
+            timings[module.strip()] = int(cumulative.strip())
+        except ValueError:
+            continue
+    return timings
+
+
+def test_import_does_not_load_heavy_submodules(tmp_path: Path) -> None:
+    timings = _importtime("import fluxloop", tmp_path)
+
+    assert "fluxloop" in timings
+    loaded = sorted(name for name in LAZY_MODULES if name in timings)
+    assert loaded == []
+
+
+def test_import_has_no_env_or_recording_side_effects(tmp_path: Path) -> None:
+    recording_file = tmp_path / "recordings" / "args.jsonl"
+    (tmp_path / ".env").write_text(
+        "FLUXLOOP_RECORD_ARGS=true\n"
+        f"FLUXLOOP_RECORDING_FILE={recording_file}\n"
+        "FLUXLOOP_SERVICE_NAME=from-dotenv\n"
+    )
+
+    code = (
+        "import os, fluxloop\n"
+        "assert 'FLUXLOOP_SERVICE_NAME' not in os.environ\n"
+        "config = fluxloop.get_config()\n"
+        "assert config.service_name == 'from-dotenv'\n"
+        "assert config.record_args is True\n"
+    )
+    _importtime(code, tmp_path)
+
+    assert recording_file.parent.is_dir()
+
+
+def test_lazy_attributes_resolve() -> None:
+    import fluxloop
+    from fluxloop.client import FluxLoopClient
+    from fluxloop.schemas import Trace
+
+    assert fluxloop.FluxLoopClient is FluxLoopClient
+    assert fluxloop.Trace is Trace
+    assert callable(fluxloop.enable_recording)
+    assert set(fluxloop.__all__) <= set(dir(fluxloop))
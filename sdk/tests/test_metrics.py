@@ -0,0 +1,115 @@
+"""Tests for the opt-in metrics registry and buffer health metrics."""
+
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+import fluxloop
+from fluxloop import metrics
+from fluxloop.context import FluxLoopContext
+from fluxloop.models import ObservationData, ObservationType
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.disable_metrics()
+    yield
+    metrics.disable_metrics()
+
+
+def test_render_openmetrics_text() -> None:
+    registry = metrics.MetricsRegistry()
+    registry.counter("jobs", "Jobs seen").inc(2, kind="a")
+    registry.gauge("depth").set(3)
+    registry.histogram("latency_seconds", buckets=(0.1, 1.0)).observe(0.5)
+
+    text = registry.render()
+
+    assert "# TYPE jobs counter\n# HELP jobs Jobs seen\n" in text
+    assert 'jobs_total{kind="a"} 2\n' in text
+    assert "depth 3\n" in text
+    assert 'latency_seconds_bucket{le="0.1"} 0\n' in text
+    assert 'latency_seconds_bucket{le="1"} 1\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 1\n' in text
+    assert "latency_seconds_count 1\n" in text
+    assert text.endswith("# EOF\n")
+
+
+def test_metric_type_conflict_is_rejected() -> None:
+    registry = metrics.MetricsRegistry()
+    registry.counter("events")
+
+    with pytest.raises(ValueError):
+        registry.gauge("events")
+
+
+def test_disabled_metrics_record_nothing(create_buffer) -> None:
+    buffer = create_buffer(use_collector=False, sample_rate=1.0)
+    ctx = FluxLoopContext("trace")
+    buffer.add_trace(ctx.trace)
+    buffer.flush()
+
+    assert metrics.get_registry() is None
+    assert fluxloop.metrics_snapshot() == {}
+
+
+def test_buffer_reports_drops_depth_and_flushes(create_buffer) -> None:
+    buffer = create_buffer(
+        use_collector=False, sample_rate=1.0, metrics_enabled=True, max_queue_size=2
+    )
+    registry = metrics.get_registry()
+    assert registry is not None
+
+    ctx = FluxLoopContext("trace")
+    for index in range(3):
+        buffer.add_observation(
+            ctx.trace.id, ObservationData(type=ObservationType.EVENT, name=f"step-{index}")
+        )
+
+    depth = registry.gauge("fluxloop_buffer_queue_depth")
+    assert depth.value(kind="observation") == 2
+    assert registry.counter("fluxloop_buffer_dropped_events").value(kind="observation") == 1
+
+    buffer.flush()
+
+    assert depth.value(kind="observation") == 0
+    assert registry.histogram("fluxloop_buffer_flush_duration_seconds").count() == 1
+    snapshot = fluxloop.metrics_snapshot()
+    assert snapshot["fluxloop_buffer_dropped_events"]["values"] == [
+        {"labels": {"kind": "observation"}, "value": 1.0}
+    ]
+
+
+def test_send_failures_and_offline_fallback(tmp_path: Path, create_buffer) -> None:
+    buffer = create_buffer(
+        use_collector=True,
+        collector_url="http://invalid-host",
+        timeout=0.5,
+        sample_rate=1.0,
+        metrics_enabled=True,
+    )
+    registry = metrics.get_registry()
+
+    ctx = FluxLoopContext("trace")
+    buffer.add_trace(ctx.trace)
+    buffer.flush()
+
+    failures = registry.counter("fluxloop_buffer_send_failures")
+    assert failures.value(kind="trace", sink="collector") == 1
+    assert registry.counter("fluxloop_sink_retries").value(sink="collector") == 2
+    assert registry.counter("fluxloop_buffer_offline_fallbacks").value(sink="collector") == 1
+    assert (tmp_path / "traces.jsonl").exists()
+
+
+def test_metrics_endpoint_serves_registry() -> None:
+    registry = metrics.enable_metrics(port=0)
+    registry.counter("fluxloop_test_events").inc()
+    host, port = metrics.metrics_address()
+
+    with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+        body = response.read().decode("utf-8")
+        content_type = response.headers["Content-Type"]
+
+    assert "fluxloop_test_events_total 1" in body
+    assert content_type.startswith("application/openmetrics-text")
@@ -0,0 +1,222 @@
+"""Tests for OTLP/HTTP export against an in-process receiver."""
+
+import json
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+from uuid import uuid4
+
+import pytest
+
+import fluxloop
+from fluxloop.models import ObservationData, ObservationType, TraceData
+from fluxloop.otlp import OTLPExporter, root_span_id
+
+
+class _Receiver:
+    """Minimal OTLP/HTTP receiver recording every request to /v1/traces."""
+
+    def __init__(self, status: int = 200) -> None:
+        self.requests: List[Tuple[str, str, bytes]] = []
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                receiver.requests.append((self.path, self.headers["Content-Type"], body))
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args) -> None:  # noqa: A002
+                return
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.endpoint = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def receiver() -> Iterator[_Receiver]:
+    stub = _Receiver()
+    yield stub
+    stub.close()
+
+
+def _batch() -> Tuple[List[TraceData], List[Tuple]]:
+    trace = TraceData(id=uuid4(), name="chat-agent", user_id="user-1", tags=["smoke"])
+    agent = ObservationData(type=ObservationType.AGENT, name="planner", trace_id=trace.id)
+    generation = ObservationData(
+        type=ObservationType.GENERATION,
+        name="llm",
+        model="gpt-4o-mini",
+        prompt_tokens=12,
+        completion_tokens=5,
+        llm_parameters={"temperature": 0.2},
+        input=[{"role": "user", "content": "hi"}],
+        output="hello",
+        parent_observation_id=agent.id,
+        trace_id=trace.id,
+    )
+    tool = ObservationData(
+        type=ObservationType.TOOL, name="search", error="timeout", trace_id=trace.id
+    )
+    return [trace], [(trace.id, agent), (trace.id, generation), (trace.id, tool)]
+
+
+def _attrs(span: Dict) -> Dict:
+    values = {}
+    for item in span["attributes"]:
+        (kind, value), = item["value"].items()
+        values[item["key"]] = int(value) if kind == "intValue" else value
+    return values
+
+
+def test_json_export_maps_genai_attributes(receiver: _Receiver) -> None:
+    traces, observations = _batch()
+    exporter = OTLPExporter(receiver.endpoint, protocol="http/json")
+
+    exporter.export(traces, observations)
+
+    path, content_type, body = receiver.requests[0]
+    assert path == "/v1/traces"
+    assert content_type == "application/json"
+    spans = json.loads(body)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    by_name = {span["name"]: span for span in spans}
+    trace = traces[0]
+
+    root = by_name["chat-agent"]
+    assert root["traceId"] == trace.id.hex
+    assert "parentSpanId" not in root
+    assert _attrs(root)["user.id"] == "user-1"
+
+    agent = by_name["planner"]
+    assert agent["parentSpanId"] == root_span_id(trace.id).hex()
+    assert _attrs(agent)["gen_ai.operation.name"] == "invoke_agent"
+
+    llm = by_name["llm"]
+    assert llm["parentSpanId"] == agent["spanId"]
+    assert llm["kind"] == 3
+    attributes = _attrs(llm)
+    assert attributes["gen_ai.operation.name"] == "chat"
+    assert attributes["gen_ai.request.model"] == "gpt-4o-mini"
+    assert attributes["gen_ai.usage.input_tokens"] == 12
+    assert attributes["gen_ai.usage.output_tokens"] == 5
+    assert attributes["gen_ai.request.temperature"] == 0.2
+
+    tool = by_name["search"]
+    assert tool["status"] == {"code": 2, "message": "timeout"}
+    assert _attrs(tool)["gen_ai.tool.name"] == "search"
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return result, pos
+
+
+def _fields(data: bytes) -> Dict[int, List]:
+    """Decode one protobuf message into ``field number -> [raw values]``."""
+    fields: Dict[int, List] = {}
+    pos = 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = struct.unpack("<Q", data[pos : pos + 8])[0], pos + 8
+        elif wire_type == 2:
+            length, pos = _read_varint(data, pos)
+            value, pos = data[pos : pos + length], pos + length
+        else:  # pragma: no cover - not produced by the encoder
+            raise AssertionError(f"unexpected wire type {wire_type}")
+        fields.setdefault(number, []).append(value)
+    return fields
+
+
+def test_protobuf_export_encodes_spans(receiver: _Receiver) -> None:
+    traces, observations = _batch()
+    exporter = OTLPExporter(receiver.endpoint, protocol="http/protobuf")
+
+    exporter.export(traces, observations)
+
+    _, content_type, body = receiver.requests[0]
+    assert content_type == "application/x-protobuf"
+    resource_spans = _fields(_fields(body)[1][0])
+    resource_attrs = [_fields(kv) for kv in _fields(resource_spans[1][0])[1]]
+    assert any(kv[1][0] == b"service.name" for kv in resource_attrs)
+
+    scope_spans = _fields(resource_spans[2][0])
+    assert _fields(scope_spans[1][0])[1] == [b"fluxloop"]
+    spans = [_fields(raw) for raw in scope_spans[2]]
+    assert [span[5][0] for span in spans] == [b"chat-agent", b"planner", b"llm", b"search"]
+    assert all(span[1][0] == traces[0].id.bytes for span in spans)
+    assert spans[0][7][0] <= spans[0][8][0]
+
+    llm = spans[2]
+    attributes = {}
+    for raw in llm[9]:
+        kv = _fields(raw)
+        attributes[kv[1][0].decode()] = _fields(kv[2][0])
+    assert attributes["gen_ai.request.model"][1] == [b"gpt-4o-mini"]
+    assert attributes["gen_ai.usage.input_tokens"][3] == [12]
+    temperature = struct.pack("<Q", attributes["gen_ai.request.temperature"][4][0])
+    assert struct.unpack("<d", temperature)[0] == 0.2
+
+    status = _fields(spans[3][15][0])
+    assert status == {2: [b"timeout"], 3: [2]}
+
+
+def test_buffer_exports_batches_over_otlp(
+    receiver: _Receiver, tmp_path: Path, create_buffer
+) -> None:
+    buffer = create_buffer(
+        use_collector=False,
+        otlp_endpoint=receiver.endpoint,
+        otlp_protocol="http/json",
+        sample_rate=1.0,
+    )
+    with fluxloop.instrument("otlp-trace"):
+        fluxloop.trace(name="step")(lambda: "ok")()
+    buffer.flush()
+
+    spans = [
+        span
+        for _, _, body in receiver.requests
+        for span in json.loads(body)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    ]
+    assert sorted(span["name"] for span in spans) == ["otlp-trace", "step"]
+    # With the collector disabled the offline store still records everything.
+    assert "otlp-trace" in (tmp_path / "traces.jsonl").read_text()
+
+
+def test_failed_export_falls_back_to_offline_store(tmp_path: Path, create_buffer) -> None:
+    stub = _Receiver(status=503)
+    try:
+        buffer = create_buffer(use_collector=False, otlp_endpoint=stub.endpoint, sample_rate=1.0)
+        buffer.add_trace(TraceData(name="lost"))
+        buffer.flush()
+    finally:
+        stub.close()
+
+    # One attempt plus the sink's retries before falling back
+    assert len(stub.requests) == 3
+    # Stored once by the offline store sink, not again as an OTLP fallback
+    assert (tmp_path / "traces.jsonl").read_text().count('"lost"') == 1
+
+
+def test_unknown_protocol_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        OTLPExporter("http://localhost:4318", protocol="grpc")
@@ -1,6 +1,9 @@
 """Tests for the argument recording utilities."""
 
 import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 from typing import Optional
 
@@ -162,3 +165,30 @@ def test_disable_recording(tmp_path):
 
     lines = output_file.read_text(encoding="utf-8").splitlines()
     assert len(lines) == 1
+
+
+def test_env_recording_applies_without_prior_sdk_call(tmp_path):
+    """`.env` recording settings apply when record_call_args is the first SDK call."""
+
+    recording_file = tmp_path / "recordings" / "args.jsonl"
+    (tmp_path / ".env").write_text(
+        "FLUXLOOP_RECORD_ARGS=true\n"
+        f"FLUXLOOP_RECORDING_FILE={recording_file}\n"
+    )
+    env = {k: v for k, v in os.environ.items() if not k.startswith("FLUXLOOP_")}
+
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import fluxloop\n"
+            "fluxloop.record_call_args(target='tests.sample:handler', x=1)\n",
+        ],
+        check=True,
+        cwd=tmp_path,
+        env=env,
+    )
+
+    record = read_single_record(recording_file)
+    assert record["target"] == "tests.sample:handler"
+    assert record["kwargs"] == {"x": 1}
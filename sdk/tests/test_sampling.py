@@ -0,0 +1,226 @@
+"""Tests for tail-based sampling."""
+
+from datetime import timedelta
+from typing import List
+from uuid import UUID, uuid4
+
+import pytest
+
+import fluxloop
+from fluxloop.buffer import EventBuffer
+from fluxloop.config import SDKConfig
+from fluxloop.context import FluxLoopContext
+from fluxloop.models import ObservationData, ObservationType
+from fluxloop.sampling import (
+    RateLimiter,
+    head_sample,
+    sample_observation,
+    tail_budget,
+    trace_fraction,
+)
+from fluxloop.sinks import InMemorySink
+
+
+@pytest.fixture
+def memory(create_buffer):
+    buffer = create_buffer(use_collector=False, sampling_mode="tail", sample_rate=0.0)
+    sink = InMemorySink()
+    buffer.add_sink(sink)
+    yield sink
+    buffer.remove_sink(sink)
+
+
+def _run(name: str, **observation_fields) -> FluxLoopContext:
+    ctx = FluxLoopContext(name)
+    ctx.push_observation(
+        ObservationData(type=ObservationType.GENERATION, name="llm", **observation_fields)
+    )
+    ctx.pop_observation()
+    assert ctx._held, "observations are held until finalize()"
+    ctx.finalize()
+    EventBuffer.get_instance().flush()
+    return ctx
+
+
+def _names(sink: InMemorySink) -> List[str]:
+    return sorted(trace["name"] for trace in sink.traces())
+
+
+def test_tail_keeps_errored_traces_and_drops_the_rest(memory: InMemorySink) -> None:
+    kept = _run("failing", error="boom")
+    dropped = _run("healthy")
+
+    assert _names(memory) == ["failing"]
+    assert memory.trace(str(kept.trace.id))["metadata"]["sampling"] == {
+        "mode": "tail",
+        "reason": "error",
+    }
+    assert [obs["name"] for obs in memory.observations(str(kept.trace.id))] == ["llm"]
+    assert memory.observations(str(dropped.trace.id)) == []
+    assert not dropped.is_enabled()
+    assert tail_budget.held == 0
+
+
+def test_tail_keeps_slow_and_expensive_traces(memory: InMemorySink) -> None:
+    fluxloop.configure(tail_latency_threshold_ms=500, tail_token_threshold=1000)
+
+    slow = FluxLoopContext("slow")
+    slow.trace.start_time -= timedelta(seconds=1)
+    slow.finalize()
+    _run("expensive", prompt_tokens=900, completion_tokens=200)
+    _run("cheap", total_tokens=10)
+    EventBuffer.get_instance().flush()
+
+    assert _names(memory) == ["expensive", "slow"]
+    assert memory.trace(str(slow.trace.id))["metadata"]["sampling"]["reason"] == "latency"
+
+
+def test_tail_probabilistic_fallback(memory: InMemorySink) -> None:
+    fluxloop.configure(sample_rate=1.0)
+
+    ctx = _run("lucky")
+
+    assert memory.trace(str(ctx.trace.id))["metadata"]["sampling"]["reason"] == "probabilistic"
+
+
+def test_exception_in_instrument_keeps_trace(memory: InMemorySink) -> None:
+    with pytest.raises(RuntimeError):
+        with fluxloop.instrument("crashing"):
+            raise RuntimeError("boom")
+    EventBuffer.get_instance().flush()
+
+    assert _names(memory) == ["crashing"]
+
+
+def test_per_trace_bound_decides_early(memory: InMemorySink) -> None:
+    fluxloop.configure(tail_max_trace_observations=2)
+
+    ctx = FluxLoopContext("chatty")
+    for index in range(3):
+        ctx.push_observation(ObservationData(type=ObservationType.SPAN, name=f"s{index}"))
+        ctx.pop_observation()
+
+    # sample_rate 0: the early decision drops the trace and releases its budget
+    assert not ctx.is_enabled()
+    assert ctx._held == []
+    assert tail_budget.held == 0
+    ctx.finalize()
+    EventBuffer.get_instance().flush()
+    assert memory.traces() == []
+
+
+def test_global_bound_caps_held_observations(memory: InMemorySink) -> None:
+    fluxloop.configure(tail_max_buffered_observations=3, sample_rate=1.0)
+
+    contexts = [FluxLoopContext(f"t{index}") for index in range(2)]
+    for ctx in contexts:
+        for index in range(2):
+            ctx.push_observation(ObservationData(type=ObservationType.SPAN, name=f"s{index}"))
+            ctx.pop_observation()
+
+    assert tail_budget.held == 2
+    # The second trace ran out of room and was kept early, streaming the rest.
+    assert contexts[1].trace.metadata["sampling"]["reason"] == "overflow"
+    for ctx in contexts:
+        ctx.finalize()
+    assert tail_budget.held == 0
+    EventBuffer.get_instance().flush()
+    assert len(memory.observations(str(contexts[1].trace.id))) == 2
+
+
+def test_head_mode_is_unchanged(memory: InMemorySink) -> None:
+    fluxloop.configure(sampling_mode="head", sample_rate=0.0)
+
+    ctx = FluxLoopContext("head")
+
+    assert not ctx.is_sampled
+
+
+def test_head_decision_is_derived_from_trace_id() -> None:
+    config = SDKConfig(sample_rate=0.5)
+    trace_ids = [uuid4() for _ in range(2000)]
+
+    first = [head_sample(config, trace_id) for trace_id in trace_ids]
+    assert first == [head_sample(config, trace_id) for trace_id in trace_ids]
+    assert 0.45 < sum(first) / len(first) < 0.55
+    # Same id as a string or UUID gives the same value.
+    trace_id = UUID("0f8fad5b-d9cb-469f-a165-70867728950e")
+    assert trace_fraction(trace_id) == trace_fraction(str(trace_id))
+    assert trace_fraction(trace_id) == trace_fraction(trace_id.hex.upper())
+    assert 0 <= trace_fraction("not-a-uuid") < 1
+    # Lower rates keep a subset of what higher rates keep.
+    lower = SDKConfig(sample_rate=0.1)
+    assert all(first[i] for i, tid in enumerate(trace_ids) if head_sample(lower, tid))
+
+
+def test_observation_type_rates(memory: InMemorySink) -> None:
+    fluxloop.configure(
+        sampling_mode="head",
+        sample_rate=1.0,
+        observation_sample_rates={ObservationType.GENERATION: 1.0, "span": 0.0},
+    )
+
+    ctx = FluxLoopContext("typed")
+    ctx.push_observation(ObservationData(type=ObservationType.AGENT, name="agent"))
+    ctx.push_observation(ObservationData(type=ObservationType.SPAN, name="step"))
+    ctx.push_observation(ObservationData(type=ObservationType.GENERATION, name="llm"))
+    ctx.pop_observation()
+    ctx.pop_observation()
+    ctx.pop_observation()
+    ctx.finalize()
+    EventBuffer.get_instance().flush()
+
+    recorded = {obs["name"]: obs for obs in memory.observations(str(ctx.trace.id))}
+    assert sorted(recorded) == ["agent", "llm"]
+    # The dropped span's child is re-parented to the nearest recorded ancestor.
+    assert recorded["llm"]["parent_observation_id"] == recorded["agent"]["id"]
+
+
+def test_observation_type_rate_is_independent_of_trace_rate() -> None:
+    config = SDKConfig(
+        sample_rate=0.2,
+        observation_sample_rates={"span": 0.5, "generation": 0.5},
+    )
+    trace_ids = [UUID(int=index) for index in range(5000)]
+    sampled = [tid for tid in trace_ids if head_sample(config, tid)]
+
+    def kept(trace_id: UUID, observation_type: ObservationType) -> bool:
+        observation = ObservationData(type=observation_type, name="step")
+        return sample_observation(config, trace_id, observation)
+
+    spans = [kept(tid, ObservationType.SPAN) for tid in sampled]
+    generations = [kept(tid, ObservationType.GENERATION) for tid in sampled]
+    # Half the spans of sampled traces survive, not all of them.
+    assert 0.45 < sum(spans) / len(spans) < 0.55
+    # Types are decided separately, but consistently within a trace.
+    assert spans != generations
+    assert spans == [kept(tid, ObservationType.SPAN) for tid in sampled]
+
+
+def test_observation_sample_rates_validation(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FLUXLOOP_OBSERVATION_SAMPLE_RATES", "generation=1, SPAN=0.1")
+    assert SDKConfig().observation_sample_rates == {"generation": 1.0, "span": 0.1}
+    with pytest.raises(ValueError):
+        SDKConfig(observation_sample_rates={"bogus": 0.5})
+    with pytest.raises(ValueError):
+        SDKConfig(observation_sample_rates={"span": 2})
+
+
+def test_span_rate_limiter(memory: InMemorySink) -> None:
+    fluxloop.configure(sampling_mode="head", sample_rate=1.0, max_spans_per_second=3)
+
+    ctx = FluxLoopContext("burst")
+    for index in range(10):
+        ctx.push_observation(ObservationData(type=ObservationType.SPAN, name=f"s{index}"))
+        ctx.pop_observation()
+    ctx.finalize()
+    EventBuffer.get_instance().flush()
+
+    assert len(memory.observations(str(ctx.trace.id))) == 3
+
+
+def test_rate_limiter_refills() -> None:
+    limiter = RateLimiter(2)
+    assert [limiter.allow() for _ in range(3)] == [True, True, False]
+    limiter._updated -= 1.0
+    assert limiter.allow()
@@ -0,0 +1,145 @@
+"""Tests for the buffer's multi-sink export pipeline."""
+
+import threading
+from pathlib import Path
+from typing import List
+
+from fluxloop.context import FluxLoopContext
+from fluxloop.models import ObservationData, ObservationType, TraceData
+from fluxloop.sinks import (
+    CallbackSink,
+    InMemorySink,
+    PartialExportError,
+    Sink,
+    SinkWorker,
+)
+
+
+class _FlakySink(Sink):
+    name = "flaky"
+    retry_backoff = 0.0
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.batches: List[int] = []
+
+    def export(self, traces, observations) -> None:
+        self.batches.append(len(traces) + len(observations))
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("unavailable")
+
+
+def test_memory_sink_receives_flushed_events(tmp_path: Path, create_buffer) -> None:
+    buffer = create_buffer(use_collector=False, sample_rate=1.0)
+    memory = InMemorySink()
+    buffer.add_sink(memory)
+
+    ctx = FluxLoopContext("memory-trace")
+    buffer.add_observation(ctx.trace.id, ObservationData(type=ObservationType.EVENT, name="a"))
+    buffer.add_trace(ctx.trace)
+    buffer.flush()
+
+    assert memory.trace(str(ctx.trace.id))["name"] == "memory-trace"
+    assert [obs["name"] for obs in memory.pop_observations(str(ctx.trace.id))] == ["a"]
+    assert memory.observations(str(ctx.trace.id)) == []
+    # The default offline store sink still runs alongside.
+    assert (tmp_path / "traces.jsonl").exists()
+    buffer.remove_sink(memory)
+
+
+def test_slow_sink_does_not_stall_others(create_buffer) -> None:
+    buffer = create_buffer(use_collector=False, sample_rate=1.0)
+    release = threading.Event()
+    slow = CallbackSink(lambda traces, observations: release.wait(5), name="slow")
+    received = threading.Event()
+    fast = CallbackSink(lambda traces, observations: received.set(), name="fast")
+    buffer.add_sink(slow)
+    buffer.add_sink(fast)
+
+    buffer.add_trace(TraceData(name="t"))
+    buffer.flush(wait=False)
+
+    assert received.wait(2)
+    release.set()
+    buffer.remove_sink(slow)
+    buffer.remove_sink(fast)
+
+
+def test_failing_sink_retries_and_is_isolated(create_buffer) -> None:
+    buffer = create_buffer(use_collector=False, sample_rate=1.0)
+    flaky = _FlakySink(failures=1)
+    broken = _FlakySink(failures=10)
+    broken.name = "broken"
+    memory = InMemorySink()
+    for sink in (flaky, broken, memory):
+        buffer.add_sink(sink)
+
+    trace = TraceData(name="t")
+    buffer.add_trace(trace)
+    buffer.flush()
+
+    assert flaky.batches == [1, 1]
+    assert len(broken.batches) == 1 + broken.max_retries
+    assert memory.trace(str(trace.id)) is not None
+    for sink in (flaky, broken, memory):
+        buffer.remove_sink(sink)
+
+
+def test_offline_fallback_is_written_once_per_event(tmp_path: Path, create_buffer) -> None:
+    buffer = create_buffer(
+        use_collector=True, collector_url="http://invalid-host", sample_rate=1.0
+    )
+    for worker in list(buffer.sinks):
+        buffer.remove_sink(worker.sink)
+    failing = [_FlakySink(failures=10) for _ in range(2)]
+    for index, sink in enumerate(failing):
+        sink.name = f"down-{index}"
+        sink.offline_fallback = True
+        buffer.add_sink(sink)
+
+    trace = TraceData(name="twice-failed")
+    buffer.add_trace(trace)
+    buffer.add_observation(trace.id, ObservationData(type=ObservationType.SPAN, name="s"))
+    buffer.flush()
+
+    assert (tmp_path / "traces.jsonl").read_text().count('"twice-failed"') == 1
+    assert len((tmp_path / "observations.jsonl").read_text().splitlines()) == 1
+    for sink in failing:
+        buffer.remove_sink(sink)
+
+
+def test_partial_export_retries_only_the_remainder() -> None:
+    attempts: List[List[str]] = []
+
+    class Partial(Sink):
+        retry_backoff = 0.0
+
+        def export(self, traces, observations) -> None:
+            attempts.append([trace.name for trace in traces])
+            if len(traces) > 1:
+                raise PartialExportError("one failed", traces[1:], observations)
+
+    worker = SinkWorker(Partial(), batch_size=10, max_queue_size=10)
+    worker.submit([TraceData(name="a"), TraceData(name="b")], [])
+    worker.close(timeout=2)
+
+    assert attempts == [["a", "b"], ["b"]]
+
+
+def test_worker_batches_and_bounds_its_queue() -> None:
+    batches: List[int] = []
+    gate = threading.Event()
+
+    def record(traces, observations) -> None:
+        gate.wait(2)
+        batches.append(len(traces))
+
+    worker = SinkWorker(CallbackSink(record), batch_size=2, max_queue_size=3)
+    worker.submit([TraceData(name=str(index)) for index in range(5)], [])
+    gate.set()
+    worker.close(timeout=2)
+
+    assert worker.dropped >= 2
+    assert sum(batches) == 5 - worker.dropped
+    assert max(batches) <= 2